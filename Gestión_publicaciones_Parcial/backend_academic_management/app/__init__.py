@@ -1,12 +1,24 @@
 from .config import Config
 from .extensions import db, migrate, jwt
 from .blueprints import register_blueprints
+from .commands import register_commands
 from .swagger import configure_swagger
+from .models import build_serializers
+from .services.cache_service import response_cache
+from .services.citation_counts import register_citation_count_events
+from .services.stats_service import register_stats_events
+from .services.coauthorship_service import register_coauthorship_events
+from .services.duplicate_service import register_duplicate_events
+from .services.related_service import register_related_events
+from .json_provider import OrjsonProvider
 from flask import Flask
 from flask_cors import CORS
 def create_app():
     app = Flask(__name__)
     app.url_map.strict_slashes = False
+    
+    # Codificación JSON rápida para las respuestas
+    app.json = OrjsonProvider(app)
 
     CORS(app, supports_credentials=True)
 
@@ -20,9 +32,33 @@ def create_app():
     # Inicializar JWT
     jwt.init_app(app)
     
+    # Caché de respuestas de lectura e invalidación al confirmar escrituras
+    response_cache.init_app(app)
+    
+    # citation_count se mantiene con cada cambio en las referencias
+    register_citation_count_events()
+    
+    # Tablas resumen de estadísticas recalculadas en cada commit que las afecta
+    register_stats_events()
+    
+    # Grafo de coautoría mantenido en cada commit que cambia autorías
+    register_coauthorship_events()
+    
+    # Detección de duplicados de las publicaciones nuevas o renombradas
+    register_duplicate_events()
+    
+    # Índice de publicaciones relacionadas de las publicaciones nuevas o modificadas
+    register_related_events()
+    
     # Registrar blueprints
     register_blueprints(app)
     
+    # Registrar comandos de consola
+    register_commands(app)
+    
+    # Precompilar los serializadores de los modelos
+    build_serializers(db.Model)
+    
     # Configurar Swagger
     configure_swagger(app)
     
@@ -1,6 +1,5 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
-from app.extensions import db
+from app.extensions import db, jwt_required
 
 def register_blueprints(app):
     """Registra todos los blueprints en la aplicación Flask"""
@@ -24,6 +23,11 @@ def register_blueprints(app):
     from .publication_authors import bp as publication_authors_bp
     from .orcid import bp as orcid_bp
     from .auth import bp as auth_bp
+    from .batch import bp as batch_bp
+    from .cache import bp as cache_bp
+    from .stats import bp as stats_bp
+    from .citations import bp as citations_bp
+    from .coauthorships import bp as coauthorships_bp
 
     # Lista de todos los blueprints
     all_blueprints = [
@@ -45,7 +49,12 @@ def register_blueprints(app):
         (projects_bp, '/api/projects'),
         (publication_authors_bp, '/api/publication-authors'),
         (orcid_bp, '/api/orcid'),
-        (auth_bp, '/api/auth')
+        (auth_bp, '/api/auth'),
+        (batch_bp, '/api/batch'),
+        (cache_bp, '/api/cache'),
+        (stats_bp, '/api/stats'),
+        (citations_bp, '/api/citations'),
+        (coauthorships_bp, '/api/coauthorships')
     ]
 
     # Registrar cada blueprint
@@ -2,12 +2,11 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import (
     create_access_token, 
     create_refresh_token, 
-    jwt_required, 
     get_jwt_identity
 )
 from werkzeug.security import generate_password_hash, check_password_hash
 from app.models import User, RefreshToken
-from app.extensions import db
+from app.extensions import db, jwt_required
 from datetime import datetime, timedelta
 import uuid
 
@@ -1,12 +1,27 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
-from app.models import Author, PublicationAuthor, Publication
-from app.extensions import db
+from flask import Blueprint, abort, jsonify, request
+from app.models import Author, AuthorMatchCandidate, PublicationAuthor, Publication, unit_of_work
+from app.extensions import db, jwt_required
+from app.services.author_disambiguation import AuthorDisambiguationService
+from app.services.author_profile import AuthorProfileService
+from app.services.cache_service import cached
+from app.services.conditional import conditional_get, count_rows, max_updated_at
+from app.services.fieldsets import parse_fields, parse_include, column_options
+from app.services.multi_get import multi_get_response
+from sqlalchemy.orm import aliased, load_only
 import requests
 import json
+import uuid
 
 bp = Blueprint('authors', __name__)
 
+# Relaciones que se pueden expandir con include= y columnas por defecto de las publicaciones
+AUTHOR_INCLUDES = ('publications',)
+PUBLICATION_FIELDS = {'id', 'title', 'publication_date', 'doi'}
+
+# Límites del perfil de autor
+MAX_PROFILE_PER_PAGE = 100
+MAX_PROFILE_COAUTHORS = 50
+
 @bp.route('/', methods=['POST'])
 @jwt_required()
 def create_author():
@@ -18,6 +33,10 @@ def create_author():
         if field not in data:
             return jsonify({'error': f'Campo {field} es obligatorio'}), 400
     
+    read_only_error = Author.read_only_error(data)
+    if read_only_error:
+        return jsonify(read_only_error), 400
+    
     try:
         author = Author.create(**data)
         return jsonify({
@@ -30,6 +49,10 @@ def create_author():
 @bp.route('/', methods=['GET'])
 @jwt_required()
 def get_authors():
+    # Consulta múltiple: ?ids=a,b,c resuelve varios autores con una sola consulta
+    if request.args.get('ids'):
+        return multi_get_response(Author, 'author')
+    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     
@@ -47,12 +70,11 @@ def get_authors():
     sort_by = request.args.get('sort_by', 'last_name')
     sort_dir = request.args.get('sort_dir', 'asc')
     
-    if hasattr(Author, sort_by):
-        order_column = getattr(Author, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = Author.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = Author.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
@@ -64,32 +86,208 @@ def get_authors():
         'current_page': page
     })
 
+@bp.route('/batch-get', methods=['POST'])
+@jwt_required()
+def batch_get_authors():
+    return multi_get_response(Author, 'author')
+
+def _author_summary(author):
+    return {
+        'id': str(author.id), 'first_name': author.first_name, 'last_name': author.last_name,
+        'email': author.email, 'institution': author.institution, 'orcid_id': author.orcid_id
+    }
+
+@bp.route('/duplicates', methods=['GET'])
+@jwt_required()
+def get_author_match_candidates():
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    status = request.args.get('status', 'pending')
+    
+    first, second = aliased(Author), aliased(Author)
+    query = db.session.query(AuthorMatchCandidate, first, second).join(
+        first, first.id == AuthorMatchCandidate.author_id
+    ).join(
+        second, second.id == AuthorMatchCandidate.duplicate_id
+    ).filter(AuthorMatchCandidate.status == status)
+    if status == 'pending':
+        # Un par deja de estar pendiente si uno de los dos autores se elimina o se fusiona
+        query = query.filter(first.is_active == True, second.is_active == True)
+    paginated_query = query.order_by(
+        AuthorMatchCandidate.score.desc(), AuthorMatchCandidate.author_id, AuthorMatchCandidate.duplicate_id
+    ).paginate(page=page, per_page=per_page)
+    
+    return jsonify({
+        'data': [
+            {
+                'author': _author_summary(author),
+                'duplicate': _author_summary(duplicate),
+                'score': round(candidate.score, 4),
+                'evidence': candidate.evidence.split(',') if candidate.evidence else [],
+                'status': candidate.status,
+                'detected_at': candidate.detected_at.isoformat()
+            }
+            for candidate, author, duplicate in paginated_query.items
+        ],
+        'total': paginated_query.total,
+        'pages': paginated_query.pages,
+        'current_page': page
+    })
+
+@bp.route('/duplicates/dismiss', methods=['POST'])
+@jwt_required()
+def dismiss_author_match_candidate():
+    data = request.get_json() or {}
+    
+    try:
+        first_id, second_id = sorted((uuid.UUID(str(data['author_id'])), uuid.UUID(str(data['duplicate_id']))), key=str)
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Se requieren author_id y duplicate_id válidos'}), 400
+    
+    candidate = db.session.get(AuthorMatchCandidate, (first_id, second_id))
+    if candidate is None:
+        return jsonify({'error': 'El par no está registrado como posible duplicado'}), 404
+    
+    candidate.status = 'dismissed'
+    db.session.commit()
+    return jsonify({'message': 'Par descartado como duplicado', 'data': candidate.to_dict()})
+
+@bp.route('/<uuid:id>/duplicates', methods=['GET'])
+@jwt_required()
+def get_author_duplicates(id):
+    min_score = request.args.get('min_score', type=float)
+    if min_score is not None and not 0 < min_score <= 1:
+        return jsonify({'error': 'min_score debe estar entre 0 y 1'}), 400
+    
+    try:
+        Author.get_by_id(id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+    
+    # Se puntúa el bloque actual del autor: no depende de la última ejecución del proceso
+    matches = AuthorDisambiguationService.candidates_for(id, min_score)
+    authors = Author.get_many([other_id for other_id, _, _ in matches])
+    return jsonify({
+        'data': [
+            {**_author_summary(authors[other_id]), 'score': round(score, 4), 'evidence': evidence}
+            for other_id, score, evidence in matches if other_id in authors
+        ]
+    })
+
+@bp.route('/<uuid:id>/merge', methods=['POST'])
+@jwt_required()
+def merge_author(id):
+    data = request.get_json() or {}
+    
+    try:
+        target_id = uuid.UUID(str(data['into']))
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Se requiere el id del autor que se conserva (into)'}), 400
+    
+    try:
+        with unit_of_work():
+            changes = AuthorDisambiguationService.merge(id, target_id)
+        
+        return jsonify({
+            'message': 'Autores fusionados exitosamente',
+            'data': Author.get_by_id(target_id).to_dict(),
+            'changes': changes
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 404
+
 @bp.route('/<uuid:id>', methods=['GET'])
 @jwt_required()
+@cached('author', tags=lambda id: (f'authors:{id}', 'authors:*', 'publications'))
 def get_author(id):
     try:
-        author = Author.get_by_id(id)
-        author_data = author.to_dict()
-        
-        # Agregar publicaciones del autor
-        publications = []
-        author_publications = PublicationAuthor.query.filter_by(author_id=id).all()
-        
-        for pub_author in author_publications:
-            publication = Publication.query.filter_by(id=pub_author.publication_id, is_active=True).first()
-            if publication:
-                publications.append({
-                    'id': str(publication.id),
-                    'title': publication.title,
-                    'publication_date': publication.publication_date.isoformat() if publication.publication_date else None,
-                    'doi': publication.doi,
-                    'is_corresponding': pub_author.is_corresponding,
-                    'author_order': pub_author.author_order
-                })
+        author_fields = parse_fields(request.args, 'author', Author)
+        publication_fields = parse_fields(request.args, 'publication', Publication, default=PUBLICATION_FIELDS)
+        include = parse_include(request.args, AUTHOR_INCLUDES, default=AUTHOR_INCLUDES)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def build():
+        author = Author.query.options(*column_options(Author, author_fields)).filter_by(
+            id=id, is_active=True
+        ).first_or_404()
+        author_data = author.to_dict(fields=author_fields)
         
-        author_data['publications'] = publications
+        # Agregar publicaciones del autor con una sola consulta
+        if 'publications' in include:
+            rows = db.session.query(PublicationAuthor, Publication).join(
+                Publication, Publication.id == PublicationAuthor.publication_id
+            ).filter(
+                PublicationAuthor.author_id == id,
+                PublicationAuthor.is_active == True,
+                Publication.is_active == True
+            ).options(
+                load_only(PublicationAuthor.is_corresponding, PublicationAuthor.author_order),
+                *column_options(Publication, publication_fields)
+            )
+            
+            publications = []
+            for pub_author, publication in rows:
+                publication_data = publication.to_dict(fields=publication_fields)
+                publication_data['is_corresponding'] = pub_author.is_corresponding
+                publication_data['author_order'] = pub_author.author_order
+                publications.append(publication_data)
+            
+            author_data['publications'] = publications
         
         return jsonify(author_data)
+    
+    try:
+        # Una consulta indexada decide si hace falta cargar y serializar el autor
+        version = db.session.execute(db.select(
+            Author.updated_at,
+            max_updated_at(PublicationAuthor, PublicationAuthor.author_id == id),
+            count_rows(PublicationAuthor, PublicationAuthor.author_id == id),
+            max_updated_at(
+                Publication,
+                Publication.id == PublicationAuthor.publication_id,
+                PublicationAuthor.author_id == id
+            )
+        ).where(Author.id == id, Author.is_active == True)).first()
+        if version is None:
+            abort(404)
+        return conditional_get(version, build)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+
+@bp.route('/<uuid:id>/profile', methods=['GET'])
+@jwt_required()
+@cached('author_profile', tags=lambda id: (
+    f'authors:{id}', 'authors', 'publications', 'publication_authors'
+))
+def get_author_profile(id):
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), MAX_PROFILE_PER_PAGE)
+    top_coauthors = min(request.args.get('coauthors', 10, type=int), MAX_PROFILE_COAUTHORS)
+    sort_by = request.args.get('sort_by', 'publication_date')
+    sort_dir = request.args.get('sort_dir', 'desc')
+    
+    sort_error = Publication.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    try:
+        publication_fields = parse_fields(request.args, 'publication', Publication, default=PUBLICATION_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        author = Author.get_by_id(id)
+        return jsonify({
+            'author': author.to_dict(),
+            'metrics': AuthorProfileService.metrics(id, top_coauthors=top_coauthors),
+            'publications': AuthorProfileService.publications_page(
+                id, page, per_page, sort_by, sort_dir, fields=publication_fields
+            )
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -98,6 +296,10 @@ def get_author(id):
 def update_author(id):
     data = request.get_json()
     
+    read_only_error = Author.read_only_error(data)
+    if read_only_error:
+        return jsonify(read_only_error), 400
+    
     try:
         author = Author.update(id, **data)
         return jsonify({
@@ -1,7 +1,6 @@
 from flask import request, jsonify
 from flask_restx import Resource, Namespace
-from flask_jwt_extended import jwt_required
-from app.extensions import db, api
+from app.extensions import db, api, jwt_required
 from app.models import Author
 from app.swagger import author_model
 
@@ -0,0 +1,117 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, current_app, g, jsonify, request
+from app.extensions import JWT_VERIFIED_ENVIRON_KEY, jwt_required
+from werkzeug.http import HTTP_STATUS_CODES
+
+bp = Blueprint('batch', __name__)
+
+# Pool compartido y acotado para las lecturas concurrentes de todos los lotes
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config['BATCH_MAX_WORKERS'],
+                thread_name_prefix='api-batch'
+            )
+        return _executor
+
+
+def _parse_sub_requests(data):
+    """Valida la lista de sub-peticiones: [{id?, method, path, body?}]"""
+    items = data.get('requests') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        raise ValueError('Se requiere una lista de peticiones')
+
+    limit = current_app.config['BATCH_MAX_REQUESTS']
+    if len(items) > limit:
+        raise ValueError(f'Un lote admite como máximo {limit} peticiones')
+
+    sub_requests = []
+    for idx, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise ValueError(f'La petición {idx} debe indicar path')
+
+        path = item['path']
+        if not path.startswith('/api/') or path.split('?')[0].rstrip('/') == '/api/batch':
+            raise ValueError(f'Ruta no permitida en la petición {idx}: {path}')
+
+        sub_requests.append({
+            'id': item.get('id', idx),
+            'method': item.get('method', 'GET').upper(),
+            'path': path,
+            'body': item.get('body')
+        })
+    return sub_requests
+
+
+def _dispatch(app, sub_request, headers, jwt_state):
+    """Ejecuta una sub-petición con el despacho completo de Flask (hooks y manejadores de error)"""
+    # Token ya verificado para todo el lote: jwt_required (app.extensions) no lo decodifica
+    # de nuevo y get_jwt_identity() devuelve la identidad del estado copiado en g
+    kwargs = {
+        'method': sub_request['method'],
+        'headers': headers,
+        'environ_overrides': {JWT_VERIFIED_ENVIRON_KEY: True}
+    }
+    if sub_request['body'] is not None:
+        kwargs['json'] = sub_request['body']
+
+    with app.test_request_context(sub_request['path'], **kwargs):
+        for name, value in jwt_state.items():
+            setattr(g, name, value)
+
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            # Excepción sin manejador registrado: full_dispatch_request la vuelve a lanzar
+            app.logger.exception('Error en la sub-petición %s %s', sub_request['method'], sub_request['path'])
+            return {'id': sub_request['id'], 'status': 500, 'body': {'error': str(e)}}
+
+        if response.is_json:
+            body = response.get_json(silent=True)
+        elif response.status_code >= 400:
+            # Páginas de error HTML de Werkzeug: se resumen en el formato de error de la API
+            body = {'error': HTTP_STATUS_CODES.get(response.status_code, 'Error')}
+        else:
+            body = response.get_data(as_text=True)
+        return {'id': sub_request['id'], 'status': response.status_code, 'body': body}
+
+
+@bp.route('/', methods=['POST'])
+@jwt_required()
+def batch():
+    try:
+        sub_requests = _parse_sub_requests(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    app = current_app._get_current_object()
+    headers = {'Authorization': request.headers.get('Authorization', '')}
+    jwt_state = {name: getattr(g, name) for name in dir(g) if name.startswith('_jwt_extended')}
+    executor = _get_executor()
+
+    responses = [None] * len(sub_requests)
+    pending = []
+
+    def flush_reads():
+        # Las lecturas consecutivas son independientes entre sí y se ejecutan en paralelo
+        for position, future in pending:
+            responses[position] = future.result()
+        pending.clear()
+
+    for position, sub_request in enumerate(sub_requests):
+        if sub_request['method'] == 'GET':
+            pending.append((position, executor.submit(_dispatch, app, sub_request, headers, jwt_state)))
+        else:
+            # Una escritura hace de barrera: se ejecuta en orden, tras las lecturas anteriores
+            flush_reads()
+            responses[position] = _dispatch(app, sub_request, headers, jwt_state)
+    flush_reads()
+
+    return jsonify({'responses': responses})
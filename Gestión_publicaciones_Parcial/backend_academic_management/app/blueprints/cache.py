@@ -0,0 +1,10 @@
+from flask import Blueprint, current_app, jsonify
+from app.extensions import jwt_required
+
+bp = Blueprint('cache', __name__)
+
+@bp.route('/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    cache = current_app.extensions['response_cache']
+    return jsonify(cache.stats())
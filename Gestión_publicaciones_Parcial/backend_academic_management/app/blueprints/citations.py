@@ -0,0 +1,121 @@
+from flask import Blueprint, jsonify, request
+from app.extensions import jwt_required
+from app.services.citation_graph import GraphUnavailable, citation_graph
+
+bp = Blueprint('citations', __name__)
+
+# Límites de las consultas sobre el grafo
+MAX_HOPS = 3
+MAX_NEIGHBORHOOD = 1000
+MAX_SCORES = 100
+DIRECTIONS = ('out', 'in', 'both')
+
+
+def _graph():
+    try:
+        return citation_graph(), None
+    except GraphUnavailable as e:
+        return None, (jsonify({'error': str(e)}), 503)
+
+
+def _limit(default, maximum):
+    limit = request.args.get('limit', default, type=int)
+    if limit is None or not 1 <= limit <= maximum:
+        return None, (jsonify({'error': f'limit debe estar entre 1 y {maximum}'}), 400)
+    return limit, None
+
+
+def _scored(pairs, score_name):
+    return [{'id': str(publication_id), score_name: score} for publication_id, score in pairs]
+
+
+@bp.route('/stats', methods=['GET'])
+@jwt_required()
+def get_graph_stats():
+    graph, error = _graph()
+    if error:
+        return error
+    return jsonify(graph.summary())
+
+@bp.route('/pagerank', methods=['GET'])
+@jwt_required()
+def get_top_pagerank():
+    graph, error = _graph()
+    if error:
+        return error
+    
+    limit, error = _limit(20, MAX_SCORES)
+    if error:
+        return error
+    return jsonify({'data': _scored(graph.top_pagerank(limit), 'pagerank')})
+
+@bp.route('/<uuid:id>', methods=['GET'])
+@jwt_required()
+def get_citation_node(id):
+    graph, error = _graph()
+    if error:
+        return error
+    
+    try:
+        return jsonify(graph.node(id))
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+
+@bp.route('/<uuid:id>/neighborhood', methods=['GET'])
+@jwt_required()
+def get_citation_neighborhood(id):
+    graph, error = _graph()
+    if error:
+        return error
+    
+    hops = request.args.get('k', 1, type=int)
+    direction = request.args.get('direction', 'out')
+    
+    if hops is None or not 1 <= hops <= MAX_HOPS:
+        return jsonify({'error': f'k debe estar entre 1 y {MAX_HOPS}'}), 400
+    if direction not in DIRECTIONS:
+        return jsonify({'error': f"direction debe ser uno de: {', '.join(DIRECTIONS)}"}), 400
+    limit, error = _limit(200, MAX_NEIGHBORHOOD)
+    if error:
+        return error
+    
+    try:
+        nodes, total = graph.neighborhood(id, hops, direction, limit)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    return jsonify({
+        'data': [{'id': str(publication_id), 'distance': distance} for publication_id, distance in nodes],
+        'total': total,
+        'truncated': total > len(nodes)
+    })
+
+@bp.route('/<uuid:id>/co-citation', methods=['GET'])
+@jwt_required()
+def get_co_citation(id):
+    graph, error = _graph()
+    if error:
+        return error
+    
+    limit, error = _limit(20, MAX_SCORES)
+    if error:
+        return error
+    try:
+        return jsonify({'data': _scored(graph.co_citation(id, limit), 'co_citations')})
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+
+@bp.route('/<uuid:id>/coupling', methods=['GET'])
+@jwt_required()
+def get_bibliographic_coupling(id):
+    graph, error = _graph()
+    if error:
+        return error
+    
+    limit, error = _limit(20, MAX_SCORES)
+    if error:
+        return error
+    try:
+        return jsonify({'data': _scored(graph.coupling(id, limit), 'shared_references')})
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
@@ -0,0 +1,121 @@
+from flask import Blueprint, jsonify, request
+from app.models import Author, AuthorCommunity
+from app.extensions import db, jwt_required
+from app.services.coauthorship_service import CoauthorshipService
+import uuid
+
+bp = Blueprint('coauthorships', __name__)
+
+# Límites de las consultas sobre el grafo de coautoría
+MAX_COLLABORATORS = 100
+MAX_PATH_DEPTH = 12
+
+
+def _author_data(author):
+    return {'id': str(author.id), 'first_name': author.first_name, 'last_name': author.last_name}
+
+
+@bp.route('/authors/<uuid:id>/collaborators', methods=['GET'])
+@jwt_required()
+def get_top_collaborators(id):
+    limit = min(request.args.get('limit', 20, type=int), MAX_COLLABORATORS)
+
+    try:
+        Author.get_by_id(id)
+        return jsonify({'data': CoauthorshipService.top_collaborators(id, limit)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+
+@bp.route('/path', methods=['GET'])
+@jwt_required()
+def get_collaboration_path():
+    source = request.args.get('from', type=uuid.UUID)
+    target = request.args.get('to', type=uuid.UUID)
+    max_depth = request.args.get('max_depth', 6, type=int)
+
+    if source is None or target is None:
+        return jsonify({'error': 'Se requieren los parámetros from y to (ids de autor)'}), 400
+    if not 1 <= max_depth <= MAX_PATH_DEPTH:
+        return jsonify({'error': f'max_depth debe estar entre 1 y {MAX_PATH_DEPTH}'}), 400
+
+    try:
+        Author.get_by_id(source)
+        Author.get_by_id(target)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+
+    path = CoauthorshipService.shortest_path(source, target, max_depth)
+    if path is None:
+        return jsonify({'error': f'No hay un camino de colaboración de como máximo {max_depth} pasos'}), 404
+
+    authors = Author.get_many(path)
+    return jsonify({
+        'data': [_author_data(authors[author_id]) if author_id in authors else {'id': str(author_id)} for author_id in path],
+        'length': len(path) - 1
+    })
+
+@bp.route('/communities', methods=['GET'])
+@jwt_required()
+def get_communities():
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    min_size = request.args.get('min_size', 2, type=int)
+
+    size = db.func.count().label('size')
+    query = db.session.query(AuthorCommunity.community_id, size).group_by(
+        AuthorCommunity.community_id
+    ).having(size >= min_size).order_by(size.desc(), AuthorCommunity.community_id)
+    paginated_query = query.paginate(page=page, per_page=per_page)
+
+    return jsonify({
+        'data': [{'community_id': str(row.community_id), 'size': row.size} for row in paginated_query.items],
+        'total': paginated_query.total,
+        'pages': paginated_query.pages,
+        'current_page': page
+    })
+
+@bp.route('/communities/<uuid:community_id>', methods=['GET'])
+@jwt_required()
+def get_community_members(community_id):
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 50, type=int), 100)
+
+    query = db.session.query(Author).join(
+        AuthorCommunity, AuthorCommunity.author_id == Author.id
+    ).filter(
+        AuthorCommunity.community_id == community_id, Author.is_active == True
+    ).order_by(Author.last_name, Author.id)
+    paginated_query = query.paginate(page=page, per_page=per_page)
+
+    if not paginated_query.total:
+        return jsonify({'error': 'La comunidad no existe'}), 404
+
+    return jsonify({
+        'community_id': str(community_id),
+        'data': [_author_data(author) for author in paginated_query.items],
+        'total': paginated_query.total,
+        'pages': paginated_query.pages,
+        'current_page': page
+    })
+
+@bp.route('/authors/<uuid:id>/community', methods=['GET'])
+@jwt_required()
+def get_author_community(id):
+    try:
+        Author.get_by_id(id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+
+    membership = db.session.get(AuthorCommunity, id)
+    if membership is None:
+        return jsonify({'error': 'El autor no pertenece a ninguna comunidad (sin coautores en la última detección)'}), 404
+
+    size = db.session.scalar(
+        db.select(db.func.count()).where(AuthorCommunity.community_id == membership.community_id)
+    )
+    return jsonify({
+        'author_id': str(id),
+        'community_id': str(membership.community_id),
+        'size': size,
+        'computed_at': membership.computed_at.isoformat()
+    })
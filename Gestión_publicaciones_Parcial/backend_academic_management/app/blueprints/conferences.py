@@ -1,7 +1,6 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
 from app.models import Conference, Country
-from app.extensions import db
+from app.extensions import db, jwt_required
 import uuid
 
 bp = Blueprint('conferences', __name__)
@@ -59,12 +58,11 @@ def get_conferences():
     sort_by = request.args.get('sort_by', 'year')
     sort_dir = request.args.get('sort_dir', 'desc')
     
-    if hasattr(Conference, sort_by):
-        order_column = getattr(Conference, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = Conference.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = Conference.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
 from app.models import Country
-from app.extensions import db
+from app.extensions import db, jwt_required
+from app.services.cache_service import cached
 
 bp = Blueprint('countries', __name__)
 
@@ -27,6 +27,7 @@ def create_country():
 
 @bp.route('/', methods=['GET'])
 @jwt_required()
+@cached('countries', tags=('countries',))
 def get_countries():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 50, type=int)
@@ -42,12 +43,11 @@ def get_countries():
     sort_by = request.args.get('sort_by', 'name')
     sort_dir = request.args.get('sort_dir', 'asc')
     
-    if hasattr(Country, sort_by):
-        order_column = getattr(Country, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = Country.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = Country.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
 from app.models import Deliverable, Milestone, ProjectMember
-from app.extensions import db
+from app.extensions import db, jwt_required
 import uuid
 from datetime import datetime
 
@@ -87,12 +87,11 @@ def get_deliverables():
         sort_by = request.args.get('sort_by', 'created_at')
         sort_dir = request.args.get('sort_dir', 'desc')
         
-        if hasattr(Deliverable, sort_by):
-            order_column = getattr(Deliverable, sort_by)
-            if sort_dir.lower() == 'desc':
-                query = query.order_by(order_column.desc())
-            else:
-                query = query.order_by(order_column.asc())
+        sort_error = Deliverable.sort_key_error(sort_by)
+        if sort_error:
+            return jsonify(sort_error), 400
+        
+        query = Deliverable.apply_sort(query, sort_by, sort_dir)
         
         # Paginar
         page = request.args.get('page', 1, type=int)
@@ -1,7 +1,9 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, abort, jsonify, request
 from app.models import Journal
-from app.extensions import db
+from app.extensions import db, jwt_required
+from app.services.cache_service import cached
+from app.services.conditional import conditional_get
+from app.services.multi_get import multi_get_response
 
 bp = Blueprint('journals', __name__)
 
@@ -27,7 +29,12 @@ def create_journal():
 
 @bp.route('/', methods=['GET'])
 @jwt_required()
+@cached('journals', tags=('journals',))
 def get_journals():
+    # Consulta múltiple: ?ids=a,b,c resuelve varias revistas con una sola consulta
+    if request.args.get('ids'):
+        return multi_get_response(Journal, 'journal')
+    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     
@@ -45,12 +52,11 @@ def get_journals():
     sort_by = request.args.get('sort_by', 'name')
     sort_dir = request.args.get('sort_dir', 'asc')
     
-    if hasattr(Journal, sort_by):
-        order_column = getattr(Journal, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = Journal.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = Journal.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
@@ -62,12 +68,24 @@ def get_journals():
         'current_page': page
     })
 
+@bp.route('/batch-get', methods=['POST'])
+@jwt_required()
+def batch_get_journals():
+    return multi_get_response(Journal, 'journal')
+
 @bp.route('/<uuid:id>', methods=['GET'])
 @jwt_required()
+@cached('journal', tags=lambda id: (f'journals:{id}', 'journals:*'))
 def get_journal(id):
     try:
-        journal = Journal.get_by_id(id)
-        return jsonify(journal.to_dict())
+        # La revista no tiene relaciones en su representación: basta su updated_at, y la
+        # fila completa solo se carga cuando ha cambiado
+        version = db.session.execute(
+            db.select(Journal.updated_at).where(Journal.id == id, Journal.is_active == True)
+        ).first()
+        if version is None:
+            abort(404)
+        return conditional_get(version, lambda: jsonify(Journal.get_by_id(id).to_dict()))
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
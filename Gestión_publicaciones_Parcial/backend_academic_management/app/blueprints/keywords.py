@@ -1,7 +1,8 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, abort, jsonify, request
 from app.models import Keyword, PublicationKeyword, Publication
-from app.extensions import db
+from app.extensions import db, jwt_required
+from app.services.conditional import conditional_get, count_rows, max_updated_at
+from app.services.multi_get import multi_get_response
 
 bp = Blueprint('keywords', __name__)
 
@@ -34,6 +35,10 @@ def create_keyword():
 @bp.route('/', methods=['GET'])
 @jwt_required()
 def get_keywords():
+    # Consulta múltiple: ?ids=a,b,c resuelve varias palabras clave con una sola consulta
+    if request.args.get('ids'):
+        return multi_get_response(Keyword, 'keyword')
+    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 50, type=int)
     
@@ -48,12 +53,11 @@ def get_keywords():
     sort_by = request.args.get('sort_by', 'name')
     sort_dir = request.args.get('sort_dir', 'asc')
     
-    if hasattr(Keyword, sort_by):
-        order_column = getattr(Keyword, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = Keyword.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = Keyword.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
@@ -65,10 +69,15 @@ def get_keywords():
         'current_page': page
     })
 
+@bp.route('/batch-get', methods=['POST'])
+@jwt_required()
+def batch_get_keywords():
+    return multi_get_response(Keyword, 'keyword')
+
 @bp.route('/<uuid:id>', methods=['GET'])
 @jwt_required()
 def get_keyword(id):
-    try:
+    def build():
         keyword = Keyword.get_by_id(id)
         keyword_data = keyword.to_dict()
         
@@ -89,6 +98,22 @@ def get_keyword(id):
         keyword_data['publications'] = publications
         
         return jsonify(keyword_data)
+    
+    try:
+        # Una consulta indexada decide si hace falta cargar y serializar la palabra clave
+        version = db.session.execute(db.select(
+            Keyword.updated_at,
+            max_updated_at(PublicationKeyword, PublicationKeyword.keyword_id == id),
+            count_rows(PublicationKeyword, PublicationKeyword.keyword_id == id),
+            max_updated_at(
+                Publication,
+                Publication.id == PublicationKeyword.publication_id,
+                PublicationKeyword.keyword_id == id
+            )
+        ).where(Keyword.id == id, Keyword.is_active == True)).first()
+        if version is None:
+            abort(404)
+        return conditional_get(version, build)
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
+from app.extensions import jwt_required
 from app.services.orcid_service import OrcidService
 
 bp = Blueprint('orcid', __name__)
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
 from app.models import ProjectMember, Project, User
-from app.extensions import db
+from app.extensions import db, jwt_required
 import uuid
 
 bp = Blueprint('project_members', __name__)
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Project, ProjectMember, User
-from app.extensions import db
+from flask_jwt_extended import get_jwt_identity
+from app.models import Project, ProjectMember, User, unit_of_work
+from app.extensions import db, jwt_required
 import uuid
 
 bp = Blueprint('projects', __name__)
@@ -19,30 +19,32 @@ def create_project():
             return jsonify({'error': f'Campo {field} es obligatorio'}), 400
     
     try:
-        # Crear proyecto
-        project = Project.create(**{
-            k: v for k, v in data.items() 
-            if k not in ['members']
-        })
+        # Proyecto y miembros se confirman juntos en una sola transacción
+        with unit_of_work():
+            # Crear proyecto
+            project = Project.create(**{
+                k: v for k, v in data.items() 
+                if k not in ['members']
+            })
         
-        # Agregar al usuario actual como miembro del proyecto (líder)
-        ProjectMember.create(
-            project_id=project.id,
-            user_id=uuid.UUID(current_user_id),
-            role='leader',
-            is_active=True
-        )
+            # Agregar al usuario actual como miembro del proyecto (líder)
+            ProjectMember.create(
+                project_id=project.id,
+                user_id=uuid.UUID(current_user_id),
+                role='leader',
+                is_active=True
+            )
         
-        # Agregar miembros adicionales si se proporcionan
-        if 'members' in data and isinstance(data['members'], list):
-            for member_data in data['members']:
-                if isinstance(member_data, dict) and 'user_id' in member_data:
-                    ProjectMember.create(
-                        project_id=project.id,
-                        user_id=uuid.UUID(member_data['user_id']),
-                        role=member_data.get('role', 'member'),
-                        is_active=True
-                    )
+            # Agregar miembros adicionales si se proporcionan
+            if 'members' in data and isinstance(data['members'], list):
+                for member_data in data['members']:
+                    if isinstance(member_data, dict) and 'user_id' in member_data:
+                        ProjectMember.create(
+                            project_id=project.id,
+                            user_id=uuid.UUID(member_data['user_id']),
+                            role=member_data.get('role', 'member'),
+                            is_active=True
+                        )
         
         return jsonify({
             'message': 'Proyecto creado exitosamente',
@@ -86,12 +88,11 @@ def get_projects():
     sort_by = request.args.get('sort_by', 'created_at')
     sort_dir = request.args.get('sort_dir', 'desc')
     
-    if hasattr(Project, sort_by):
-        order_column = getattr(Project, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = Project.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = Project.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
@@ -176,32 +177,31 @@ def update_project(id):
             if k not in ['members']
         }
         
-        project = Project.update(id, **project_fields)
+        with unit_of_work():
+            project = Project.update(id, **project_fields)
         
-        # Actualizar miembros si se proporcionan
-        if 'members' in data and isinstance(data['members'], list):
-            for member_data in data['members']:
-                if isinstance(member_data, dict) and 'user_id' in member_data:
-                    user_id = uuid.UUID(member_data['user_id'])
-                    existing_member = ProjectMember.query.filter_by(
-                        project_id=id,
-                        user_id=user_id
-                    ).first()
-                    
-                    if existing_member:
-                        # Actualizar miembro existente
-                        existing_member.role = member_data.get('role', existing_member.role)
-                        existing_member.is_active = member_data.get('is_active', existing_member.is_active)
-                    else:
-                        # Crear nuevo miembro
-                        ProjectMember.create(
+            # Actualizar miembros si se proporcionan
+            if 'members' in data and isinstance(data['members'], list):
+                for member_data in data['members']:
+                    if isinstance(member_data, dict) and 'user_id' in member_data:
+                        user_id = uuid.UUID(member_data['user_id'])
+                        existing_member = ProjectMember.query.filter_by(
                             project_id=id,
-                            user_id=user_id,
-                            role=member_data.get('role', 'member'),
-                            is_active=True
-                        )
-        
-        db.session.commit()
+                            user_id=user_id
+                        ).first()
+                    
+                        if existing_member:
+                            # Actualizar miembro existente
+                            existing_member.role = member_data.get('role', existing_member.role)
+                            existing_member.is_active = member_data.get('is_active', existing_member.is_active)
+                        else:
+                            # Crear nuevo miembro
+                            ProjectMember.create(
+                                project_id=id,
+                                user_id=user_id,
+                                role=member_data.get('role', 'member'),
+                                is_active=True
+                            )
         
         return jsonify({
             'message': 'Proyecto actualizado exitosamente',
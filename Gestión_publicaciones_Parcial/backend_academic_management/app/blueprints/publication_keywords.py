@@ -1,7 +1,8 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Publication, PublicationKeyword, Keyword
-from app.extensions import db
+from flask_jwt_extended import get_jwt_identity
+from app.models import Publication, PublicationKeyword, Keyword, unit_of_work
+from app.extensions import db, jwt_required
+from app.services.publication_service import PublicationService
 import uuid
 
 bp = Blueprint('publication_keywords', __name__)
@@ -47,49 +48,29 @@ def add_publication_keyword(publication_id):
         # Verificar que el usuario actual tiene permisos para editar la publicación
         # (esto dependerá de tu lógica de negocio)
         
-        keyword_id = None
-        
-        # Si se proporciona un ID de palabra clave existente
-        if data.get('keyword_id'):
-            keyword_id = uuid.UUID(data['keyword_id'])
-            keyword = Keyword.get_by_id(keyword_id)
-        # Si se proporciona texto para crear una nueva palabra clave
-        elif data.get('keyword_text'):
-            # Buscar si ya existe una palabra clave con ese texto
-            existing_keyword = Keyword.query.filter_by(
-                text=data['keyword_text'], 
-                is_active=True
-            ).first()
-            
-            if existing_keyword:
-                keyword = existing_keyword
-                keyword_id = existing_keyword.id
+        with unit_of_work():
+            # Si se proporciona un ID de palabra clave existente
+            if data.get('keyword_id'):
+                keyword_id = uuid.UUID(data['keyword_id'])
+                Keyword.get_by_id(keyword_id)
+            # Si se proporciona texto, se reutiliza la palabra clave con ese nombre o se crea
             else:
-                # Crear nueva palabra clave
-                keyword = Keyword.create(text=data['keyword_text'])
-                keyword_id = keyword.id
-        
-        # Verificar si ya existe la relación
-        existing = PublicationKeyword.query.filter_by(
-            publication_id=publication_id,
-            keyword_id=keyword_id,
-            is_active=True
-        ).first()
+                keyword_text = data['keyword_text'].strip()
+                keyword_id = PublicationService.upsert_keywords([keyword_text])[keyword_text]
+            
+            # La relación se crea (o se reactiva) con un único INSERT ... ON CONFLICT
+            added = PublicationService.attach_keywords(publication_id, [keyword_id])
         
-        if existing:
+        if not added:
             return jsonify({'error': 'Esta palabra clave ya está asociada a la publicación'}), 400
         
-        # Crear la relación
-        pub_keyword = PublicationKeyword.create(
-            publication_id=publication_id,
-            keyword_id=keyword_id
-        )
+        keyword = db.session.get(Keyword, keyword_id)
         
         return jsonify({
             'message': 'Palabra clave agregada a la publicación exitosamente',
             'data': {
-                'publication_id': str(pub_keyword.publication_id),
-                'keyword_id': str(pub_keyword.keyword_id),
+                'publication_id': str(publication_id),
+                'keyword_id': str(keyword_id),
                 'keyword': keyword.to_dict()
             }
         }), 201
@@ -146,53 +127,41 @@ def batch_add_publication_keywords(publication_id):
         # Verificar que el usuario actual tiene permisos para editar la publicación
         # (esto dependerá de tu lógica de negocio)
         
-        results = []
-        
+        # Se separan los elementos por id y por texto (los que no tienen ninguno se omiten)
+        keyword_ids = set()
+        keyword_texts = set()
         for keyword_data in data:
-            keyword_id = None
-            
-            # Si se proporciona un ID de palabra clave existente
             if keyword_data.get('keyword_id'):
-                keyword_id = uuid.UUID(keyword_data['keyword_id'])
-                keyword = Keyword.get_by_id(keyword_id)
-            # Si se proporciona texto para crear una nueva palabra clave
-            elif keyword_data.get('keyword_text'):
-                # Buscar si ya existe una palabra clave con ese texto
-                existing_keyword = Keyword.query.filter_by(
-                    text=keyword_data['keyword_text'], 
-                    is_active=True
-                ).first()
-                
-                if existing_keyword:
-                    keyword = existing_keyword
-                    keyword_id = existing_keyword.id
-                else:
-                    # Crear nueva palabra clave
-                    keyword = Keyword.create(text=keyword_data['keyword_text'])
-                    keyword_id = keyword.id
-            else:
-                # Si no hay ID ni texto, omitir este elemento
-                continue
-            
-            # Verificar si ya existe la relación
-            existing = PublicationKeyword.query.filter_by(
-                publication_id=publication_id,
-                keyword_id=keyword_id,
-                is_active=True
-            ).first()
-            
-            if not existing:
-                # Crear la relación
-                pub_keyword = PublicationKeyword.create(
-                    publication_id=publication_id,
-                    keyword_id=keyword_id
-                )
-                
-                results.append({
-                    'publication_id': str(pub_keyword.publication_id),
-                    'keyword_id': str(pub_keyword.keyword_id),
-                    'keyword': keyword.to_dict()
-                })
+                keyword_ids.add(uuid.UUID(keyword_data['keyword_id']))
+            elif keyword_data.get('keyword_text') and keyword_data['keyword_text'].strip():
+                keyword_texts.add(keyword_data['keyword_text'].strip())
+        
+        # Las palabras clave indicadas por id se validan todas con una sola consulta
+        if keyword_ids:
+            found = set(db.session.scalars(
+                db.select(Keyword.id).where(Keyword.id.in_(keyword_ids), Keyword.is_active == True)
+            ))
+            missing = keyword_ids - found
+            if missing:
+                return jsonify({
+                    'error': 'Palabras clave no encontradas',
+                    'missing_ids': sorted(str(keyword_id) for keyword_id in missing)
+                }), 404
+        
+        with unit_of_work():
+            # Un INSERT ... ON CONFLICT (name) para las nuevas y otro para todos los vínculos
+            keyword_ids |= set(PublicationService.upsert_keywords(keyword_texts).values())
+            added = PublicationService.attach_keywords(publication_id, keyword_ids)
+        
+        keywords = Keyword.query.filter(Keyword.id.in_(added)).all() if added else []
+        results = [
+            {
+                'publication_id': str(publication_id),
+                'keyword_id': str(keyword.id),
+                'keyword': keyword.to_dict()
+            }
+            for keyword in keywords
+        ]
         
         return jsonify({
             'message': f'{len(results)} palabras clave agregadas a la publicación exitosamente',
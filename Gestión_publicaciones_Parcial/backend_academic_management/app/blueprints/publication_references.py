@@ -1,11 +1,26 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
 from app.models import Publication, PublicationReference
-from app.extensions import db
+from app.extensions import db, jwt_required
+from app.services.reference_resolver import ReferenceResolver
 import uuid
 
 bp = Blueprint('publication_references', __name__)
 
+def _reference_data(pub_ref):
+    return {
+        'id': str(pub_ref.id),
+        'citing_publication_id': str(pub_ref.citing_publication_id),
+        'referenced_publication_id': str(pub_ref.referenced_publication_id) if pub_ref.referenced_publication_id else None,
+        'reference_text': pub_ref.reference_text,
+        'created_at': pub_ref.created_at.isoformat() if pub_ref.created_at else None
+    }
+
+def _referenced_id(data):
+    """Id de la publicación citada (se acepta también el nombre antiguo reference_publication_id)"""
+    raw = data.get('referenced_publication_id', data.get('reference_publication_id'))
+    return uuid.UUID(str(raw)) if raw else None
+
 @bp.route('/<uuid:publication_id>/references', methods=['GET'])
 @jwt_required()
 def get_publication_references(publication_id):
@@ -13,28 +28,22 @@ def get_publication_references(publication_id):
         # Verificar que la publicación existe
         Publication.get_by_id(publication_id)
         
-        # Obtener referencias de la publicación
-        references = []
-        for pub_ref in PublicationReference.query.filter_by(
-            publication_id=publication_id, 
+        pub_refs = PublicationReference.query.filter_by(
+            citing_publication_id=publication_id,
             is_active=True
-        ).order_by(PublicationReference.order).all():
-            reference_data = {
-                'id': str(pub_ref.id),
-                'publication_id': str(pub_ref.publication_id),
-                'reference_text': pub_ref.reference_text,
-                'order': pub_ref.order,
-                'doi': pub_ref.doi,
-                'url': pub_ref.url,
-                'created_at': pub_ref.created_at.isoformat() if pub_ref.created_at else None
-            }
-            
-            # Si hay una publicación referenciada, agregar sus datos
-            if pub_ref.reference_publication_id:
-                ref_publication = Publication.query.get(pub_ref.reference_publication_id)
-                if ref_publication:
-                    reference_data['reference_publication'] = ref_publication.to_dict()
-            
+        ).order_by(PublicationReference.created_at, PublicationReference.id).all()
+        
+        # Publicaciones referenciadas con una sola consulta
+        referenced = Publication.get_many({
+            pub_ref.referenced_publication_id for pub_ref in pub_refs if pub_ref.referenced_publication_id
+        })
+        
+        references = []
+        for pub_ref in pub_refs:
+            reference_data = _reference_data(pub_ref)
+            ref_publication = referenced.get(pub_ref.referenced_publication_id)
+            if ref_publication:
+                reference_data['referenced_publication'] = ref_publication.to_dict()
             references.append(reference_data)
         
         return jsonify({
@@ -51,8 +60,8 @@ def add_publication_reference(publication_id):
     current_user_id = get_jwt_identity()
     
     # Verificar campos obligatorios
-    if not data.get('reference_text') and not data.get('reference_publication_id'):
-        return jsonify({'error': 'Se requiere reference_text o reference_publication_id'}), 400
+    if not _referenced_id(data) and not data.get('reference_text'):
+        return jsonify({'error': 'Se requiere referenced_publication_id o reference_text'}), 400
     
     try:
         # Verificar que la publicación existe
@@ -61,54 +70,30 @@ def add_publication_reference(publication_id):
         # Verificar que el usuario actual tiene permisos para editar la publicación
         # (esto dependerá de tu lógica de negocio)
         
-        # Calcular orden si no se proporciona
-        if 'order' not in data:
-            max_order = db.session.query(db.func.max(PublicationReference.order)).filter_by(
-                publication_id=publication_id,
-                is_active=True
-            ).scalar() or 0
-            data['order'] = max_order + 1
-        
-        # Si se proporciona un ID de publicación como referencia
-        if data.get('reference_publication_id'):
-            reference_publication_id = uuid.UUID(data['reference_publication_id'])
-            # Verificar que la publicación referenciada existe
-            reference_publication = Publication.get_by_id(reference_publication_id)
-            
+        referenced_publication_id = _referenced_id(data)
+        if referenced_publication_id:
             # Evitar auto-referencia
-            if reference_publication_id == publication_id:
+            if referenced_publication_id == publication_id:
                 return jsonify({'error': 'Una publicación no puede referenciarse a sí misma'}), 400
             
-            # Crear referencia
-            pub_ref = PublicationReference.create(
-                publication_id=publication_id,
-                reference_publication_id=reference_publication_id,
-                reference_text=data.get('reference_text', f"{reference_publication.title} ({reference_publication.year})"),
-                order=data.get('order', 1),
-                doi=data.get('doi', reference_publication.doi),
-                url=data.get('url', reference_publication.url)
-            )
-        # Si solo se proporciona texto de referencia
+            # Verificar que la publicación referenciada existe
+            referenced_publication = Publication.get_by_id(referenced_publication_id)
+            reference_text = data.get('reference_text', f"{referenced_publication.title} ({referenced_publication.year})")
         else:
-            pub_ref = PublicationReference.create(
-                publication_id=publication_id,
-                reference_text=data['reference_text'],
-                order=data.get('order', 1),
-                doi=data.get('doi'),
-                url=data.get('url')
-            )
+            # Solo texto: se intenta enlazar ya por DOI o título; si no, lo hará resolve-references
+            reference_text = data['reference_text']
+            match = ReferenceResolver.match([(None, publication_id, reference_text)]).get(None)
+            referenced_publication_id = match[0] if match else None
+        
+        pub_ref = PublicationReference.create(
+            citing_publication_id=publication_id,
+            referenced_publication_id=referenced_publication_id,
+            reference_text=reference_text
+        )
         
         return jsonify({
             'message': 'Referencia agregada a la publicación exitosamente',
-            'data': {
-                'id': str(pub_ref.id),
-                'publication_id': str(pub_ref.publication_id),
-                'reference_publication_id': str(pub_ref.reference_publication_id) if pub_ref.reference_publication_id else None,
-                'reference_text': pub_ref.reference_text,
-                'order': pub_ref.order,
-                'doi': pub_ref.doi,
-                'url': pub_ref.url
-            }
+            'data': _reference_data(pub_ref)
         }), 201
     except Exception as e:
         db.session.rollback()
@@ -130,7 +115,7 @@ def update_publication_reference(publication_id, reference_id):
         # Buscar la referencia existente
         pub_ref = PublicationReference.query.filter_by(
             id=reference_id,
-            publication_id=publication_id,
+            citing_publication_id=publication_id,
             is_active=True
         ).first()
         
@@ -140,39 +125,21 @@ def update_publication_reference(publication_id, reference_id):
         # Actualizar campos
         if 'reference_text' in data:
             pub_ref.reference_text = data['reference_text']
-        if 'order' in data:
-            pub_ref.order = data['order']
-        if 'doi' in data:
-            pub_ref.doi = data['doi']
-        if 'url' in data:
-            pub_ref.url = data['url']
-        if 'reference_publication_id' in data:
-            if data['reference_publication_id']:
-                reference_publication_id = uuid.UUID(data['reference_publication_id'])
-                # Verificar que la publicación referenciada existe
-                reference_publication = Publication.get_by_id(reference_publication_id)
-                
-                # Evitar auto-referencia
-                if reference_publication_id == publication_id:
-                    return jsonify({'error': 'Una publicación no puede referenciarse a sí misma'}), 400
-                
-                pub_ref.reference_publication_id = reference_publication_id
-            else:
-                pub_ref.reference_publication_id = None
+        if _referenced_id(data):
+            referenced_publication_id = _referenced_id(data)
+            # Evitar auto-referencia
+            if referenced_publication_id == publication_id:
+                return jsonify({'error': 'Una publicación no puede referenciarse a sí misma'}), 400
+            
+            # Verificar que la publicación referenciada existe
+            Publication.get_by_id(referenced_publication_id)
+            pub_ref.referenced_publication_id = referenced_publication_id
         
         db.session.commit()
         
         return jsonify({
             'message': 'Referencia actualizada exitosamente',
-            'data': {
-                'id': str(pub_ref.id),
-                'publication_id': str(pub_ref.publication_id),
-                'reference_publication_id': str(pub_ref.reference_publication_id) if pub_ref.reference_publication_id else None,
-                'reference_text': pub_ref.reference_text,
-                'order': pub_ref.order,
-                'doi': pub_ref.doi,
-                'url': pub_ref.url
-            }
+            'data': _reference_data(pub_ref)
         })
     except Exception as e:
         db.session.rollback()
@@ -193,7 +160,7 @@ def remove_publication_reference(publication_id, reference_id):
         # Buscar la referencia existente
         pub_ref = PublicationReference.query.filter_by(
             id=reference_id,
-            publication_id=publication_id,
+            citing_publication_id=publication_id,
             is_active=True
         ).first()
         
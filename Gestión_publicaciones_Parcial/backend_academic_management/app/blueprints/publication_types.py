@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
 from app.models import PublicationType
-from app.extensions import db
+from app.extensions import db, jwt_required
+from app.services.cache_service import cached
 
 bp = Blueprint('publication_types', __name__)
 
@@ -27,6 +27,7 @@ def create_publication_type():
 
 @bp.route('/', methods=['GET'])
 @jwt_required()
+@cached('publication_types', tags=('publication_types',))
 def get_publication_types():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
@@ -42,12 +43,11 @@ def get_publication_types():
     sort_by = request.args.get('sort_by', 'name')
     sort_dir = request.args.get('sort_dir', 'asc')
     
-    if hasattr(PublicationType, sort_by):
-        order_column = getattr(PublicationType, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = PublicationType.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = PublicationType.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
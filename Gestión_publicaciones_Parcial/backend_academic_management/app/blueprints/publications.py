@@ -1,11 +1,37 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
-from app.models import Publication, PublicationAuthor, PublicationKeyword, Author, Keyword
-from app.extensions import db
+from flask import Blueprint, Response, abort, current_app, jsonify, request, stream_with_context
+from app.models import (
+    Publication, PublicationAuthor, PublicationKeyword, Author, Keyword,
+    PublicationType, Journal, Project, DuplicateCandidate, unit_of_work
+)
+from app.extensions import db, jwt_required
+from app.services.cache_service import TTLCache, cached
+from app.services.citation_traversal import CitationTraversal, DIRECTIONS
+from app.services.duplicate_service import DuplicateService
+from app.services.conditional import conditional_get, count_rows, max_updated_at
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
+from app.services.publication_service import PublicationService
+from app.services.related_service import RelatedPublicationsService
+from app.services.fieldsets import parse_fields, parse_include, column_options
+from app.services.multi_get import multi_get_response
+from sqlalchemy.orm import aliased, load_only
+import io
 import uuid
 
 bp = Blueprint('publications', __name__)
 
+# Relaciones que se pueden expandir con include= y las que se incluyen por defecto
+PUBLICATION_INCLUDES = ('authors', 'keywords', 'journal')
+DEFAULT_PUBLICATION_INCLUDE = ('authors', 'keywords')
+
+# Columnas por defecto de las relaciones embebidas
+LIST_AUTHOR_FIELDS = {'id', 'first_name', 'last_name'}
+DETAIL_AUTHOR_FIELDS = LIST_AUTHOR_FIELDS | {'email', 'institution', 'orcid_id'}
+KEYWORD_FIELDS = {'id', 'name'}
+
+# Caché de conteos de facetas, indexada por el conjunto de filtros
+_facets_cache = TTLCache(max_entries=512)
+
 @bp.route('/', methods=['POST'])
 @jwt_required()
 def create_publication():
@@ -17,32 +43,38 @@ def create_publication():
         if field not in data:
             return jsonify({'error': f'Campo {field} es obligatorio'}), 400
     
+    read_only_error = Publication.read_only_error(data)
+    if read_only_error:
+        return jsonify(read_only_error), 400
+    
     try:
-        # Crear la publicación, incluyendo el campo external_id si se proporciona
-        publication = Publication.create(**{
-            k: v for k, v in data.items() 
-            if k not in ['authors', 'keywords']
-        })
+        # Publicación, autores y keywords se confirman juntos en una sola transacción
+        with unit_of_work():
+            # Crear la publicación, incluyendo el campo external_id si se proporciona
+            publication = Publication.create(**{
+                k: v for k, v in data.items() 
+                if k not in ['authors', 'keywords']
+            })
+        
+            # Procesar autores si se proporcionan
+            if 'authors' in data and isinstance(data['authors'], list):
+                for idx, author_data in enumerate(data['authors']):
+                    if isinstance(author_data, dict) and 'author_id' in author_data:
+                        PublicationAuthor.create(
+                            publication_id=publication.id,
+                            author_id=uuid.UUID(author_data['author_id']),
+                            is_corresponding=author_data.get('is_corresponding', False),
+                            author_order=author_data.get('author_order', idx + 1)
+                        )
         
-        # Procesar autores si se proporcionan
-        if 'authors' in data and isinstance(data['authors'], list):
-            for idx, author_data in enumerate(data['authors']):
-                if isinstance(author_data, dict) and 'author_id' in author_data:
-                    PublicationAuthor.create(
+            # Procesar keywords si se proporcionan
+            if 'keywords' in data and isinstance(data['keywords'], list):
+                for keyword_id in dict.fromkeys(data['keywords']):
+                    PublicationKeyword.create(
                         publication_id=publication.id,
-                        author_id=uuid.UUID(author_data['author_id']),
-                        is_corresponding=author_data.get('is_corresponding', False),
-                        author_order=author_data.get('author_order', idx + 1)
+                        keyword_id=uuid.UUID(keyword_id)
                     )
         
-        # Procesar keywords si se proporcionan
-        if 'keywords' in data and isinstance(data['keywords'], list):
-            for keyword_id in data['keywords']:
-                PublicationKeyword.create(
-                    publication_id=publication.id,
-                    keyword_id=uuid.UUID(keyword_id)
-                )
-        
         return jsonify({
             'message': 'Publicación creada exitosamente',
             'data': publication.to_dict()
@@ -51,12 +83,8 @@ def create_publication():
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
-@bp.route('/', methods=['GET'])
-@jwt_required()
-def get_publications():
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    
+def _build_publication_query():
+    """Construye la consulta de publicaciones a partir de los filtros de la petición"""
     # Filtros opcionales
     filters = {}
     
@@ -76,113 +104,551 @@ def get_publications():
     if request.args.get('project_id'):
         filters['project_id'] = uuid.UUID(request.args.get('project_id'))
     
+    # Filtrar por año (un valor no numérico no debe convertirse en year IS NULL)
+    if request.args.get('year'):
+        year = request.args.get('year', type=int)
+        if year is None:
+            raise ValueError('year debe ser un número entero')
+        filters['year'] = year
+    
     # Aplicar filtros
     query = Publication.query.filter_by(is_active=True, **filters)
     
+    # Filtrar por palabra clave
+    if request.args.get('keyword_id'):
+        query = query.filter(Publication.keywords.any(
+            db.and_(
+                PublicationKeyword.keyword_id == uuid.UUID(request.args.get('keyword_id')),
+                PublicationKeyword.is_active == True
+            )
+        ))
+    
     # Buscar por título
     if request.args.get('search'):
         search_term = f"%{request.args.get('search')}%"
         query = query.filter(Publication.title.ilike(search_term))
     
+    return query
+
+def _publication_filter_key():
+    """Clave de caché con el conjunto de filtros de la petición (sin paginación ni orden)"""
+    filter_params = ['publication_type_id', 'journal_id', 'conference_id',
+                     'project_id', 'year', 'keyword_id', 'search']
+    return TTLCache.make_key('publication_facets', **{
+        name: request.args.get(name) for name in filter_params
+    })
+
+def _parse_publication_fieldsets(detailed=False):
+    """Lee fields[publication|author|keyword|journal] de la petición"""
+    return {
+        'publication': parse_fields(request.args, 'publication', Publication),
+        'author': parse_fields(
+            request.args, 'author', Author,
+            default=DETAIL_AUTHOR_FIELDS if detailed else LIST_AUTHOR_FIELDS
+        ),
+        'keyword': parse_fields(request.args, 'keyword', Keyword, default=KEYWORD_FIELDS),
+        'journal': parse_fields(request.args, 'journal', Journal)
+    }
+
+def _publication_options(fieldsets, include):
+    """Opciones de carga para consultar solo las columnas de publicación solicitadas"""
+    required = ['journal_id'] if 'journal' in include else []
+    return column_options(Publication, fieldsets['publication'], required=required)
+
+def _load_authors_by_publication(publication_ids, fields):
+    """Carga en una sola consulta los autores de varias publicaciones"""
+    rows = db.session.query(PublicationAuthor, Author).join(
+        Author, Author.id == PublicationAuthor.author_id
+    ).filter(
+        PublicationAuthor.publication_id.in_(publication_ids),
+        PublicationAuthor.is_active == True
+    ).options(
+        load_only(PublicationAuthor.publication_id, PublicationAuthor.is_corresponding, PublicationAuthor.author_order),
+        *column_options(Author, fields)
+    ).order_by(PublicationAuthor.publication_id, PublicationAuthor.author_order)
+    
+    authors = {}
+    for pub_author, author in rows:
+        author_data = author.to_dict(fields=fields)
+        author_data['is_corresponding'] = pub_author.is_corresponding
+        author_data['author_order'] = pub_author.author_order
+        authors.setdefault(pub_author.publication_id, []).append(author_data)
+    return authors
+
+def _load_keywords_by_publication(publication_ids, fields):
+    """Carga en una sola consulta las keywords de varias publicaciones"""
+    rows = db.session.query(PublicationKeyword.publication_id, Keyword).join(
+        Keyword, Keyword.id == PublicationKeyword.keyword_id
+    ).filter(
+        PublicationKeyword.publication_id.in_(publication_ids),
+        PublicationKeyword.is_active == True
+    ).options(*column_options(Keyword, fields))
+    
+    keywords = {}
+    for publication_id, keyword in rows:
+        keywords.setdefault(publication_id, []).append(keyword.to_dict(fields=fields))
+    return keywords
+
+def _load_journals(journal_ids, fields):
+    """Carga en una sola consulta las revistas indicadas"""
+    if not journal_ids:
+        return {}
+    journals = Journal.query.options(*column_options(Journal, fields)).filter(Journal.id.in_(journal_ids))
+    return {journal.id: journal.to_dict(fields=fields) for journal in journals}
+
+def _serialize_publications(items, fieldsets, include):
+    """Serializa publicaciones cargando sus relaciones en lote (una consulta por relación)"""
+    publication_ids = [item.id for item in items]
+    result = [item.to_dict(fields=fieldsets['publication']) for item in items]
+    
+    if not publication_ids:
+        return result
+    
+    if 'authors' in include:
+        authors = _load_authors_by_publication(publication_ids, fieldsets['author'])
+        for item, data in zip(items, result):
+            data['authors'] = authors.get(item.id, [])
+    
+    if 'keywords' in include:
+        keywords = _load_keywords_by_publication(publication_ids, fieldsets['keyword'])
+        for item, data in zip(items, result):
+            data['keywords'] = keywords.get(item.id, [])
+    
+    if 'journal' in include:
+        journals = _load_journals({item.journal_id for item in items if item.journal_id}, fieldsets['journal'])
+        for item, data in zip(items, result):
+            data['journal'] = journals.get(item.journal_id)
+    
+    return result
+
+def _publication_version(publication_id):
+    """Marcas de versión de la publicación y de sus autores, keywords y revista"""
+    return db.session.execute(db.select(
+        Publication.updated_at,
+        max_updated_at(PublicationAuthor, PublicationAuthor.publication_id == publication_id),
+        count_rows(PublicationAuthor, PublicationAuthor.publication_id == publication_id),
+        max_updated_at(
+            Author,
+            Author.id == PublicationAuthor.author_id,
+            PublicationAuthor.publication_id == publication_id
+        ),
+        max_updated_at(PublicationKeyword, PublicationKeyword.publication_id == publication_id),
+        count_rows(PublicationKeyword, PublicationKeyword.publication_id == publication_id),
+        max_updated_at(
+            Keyword,
+            Keyword.id == PublicationKeyword.keyword_id,
+            PublicationKeyword.publication_id == publication_id
+        ),
+        max_updated_at(Journal, Journal.id == Publication.journal_id)
+    ).where(Publication.id == publication_id, Publication.is_active == True)).first()
+
+def _multi_get_publications():
+    """Consulta múltiple de publicaciones con los mismos fieldsets e include= que el listado"""
+    try:
+        fieldsets = _parse_publication_fieldsets()
+        include = parse_include(request.args, PUBLICATION_INCLUDES, default=DEFAULT_PUBLICATION_INCLUDE)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return multi_get_response(
+        Publication,
+        'publication',
+        options=_publication_options(fieldsets, include),
+        serialize_many=lambda items: _serialize_publications(items, fieldsets, include)
+    )
+
+def _compute_publication_facets(query):
+    """Calcula los conteos por año, tipo, revista, proyecto y keyword en una sola consulta"""
+    # CTE con las publicaciones filtradas, recorrida una única vez por cada faceta
+    filtered = query.order_by(None).with_entities(
+        Publication.id.label('id'),
+        Publication.year.label('year'),
+        Publication.publication_type_id.label('publication_type_id'),
+        Publication.journal_id.label('journal_id'),
+        Publication.project_id.label('project_id')
+    ).cte('filtered_publications')
+    
+    count = db.func.count(filtered.c.id).label('count')
+    
+    year_facet = db.select(
+        db.literal('year').label('facet'),
+        db.cast(filtered.c.year, db.String).label('value'),
+        db.cast(filtered.c.year, db.String).label('label'),
+        count
+    ).where(filtered.c.year.isnot(None)).group_by(filtered.c.year)
+    
+    type_facet = db.select(
+        db.literal('publication_type').label('facet'),
+        db.cast(PublicationType.id, db.String).label('value'),
+        PublicationType.name.label('label'),
+        count
+    ).join(PublicationType, PublicationType.id == filtered.c.publication_type_id).group_by(
+        PublicationType.id, PublicationType.name
+    )
+    
+    journal_facet = db.select(
+        db.literal('journal').label('facet'),
+        db.cast(Journal.id, db.String).label('value'),
+        Journal.name.label('label'),
+        count
+    ).join(Journal, Journal.id == filtered.c.journal_id).group_by(Journal.id, Journal.name)
+    
+    project_facet = db.select(
+        db.literal('project').label('facet'),
+        db.cast(Project.id, db.String).label('value'),
+        Project.name.label('label'),
+        count
+    ).join(Project, Project.id == filtered.c.project_id).group_by(Project.id, Project.name)
+    
+    keyword_facet = db.select(
+        db.literal('keyword').label('facet'),
+        db.cast(Keyword.id, db.String).label('value'),
+        Keyword.name.label('label'),
+        db.func.count(db.distinct(filtered.c.id)).label('count')
+    ).select_from(filtered).join(
+        PublicationKeyword, db.and_(
+            PublicationKeyword.publication_id == filtered.c.id,
+            PublicationKeyword.is_active == True
+        )
+    ).join(Keyword, Keyword.id == PublicationKeyword.keyword_id).group_by(Keyword.id, Keyword.name)
+    
+    statement = db.union_all(year_facet, type_facet, journal_facet, project_facet, keyword_facet)
+    
+    facets = {name: [] for name in ['year', 'publication_type', 'journal', 'project', 'keyword']}
+    for row in db.session.execute(statement):
+        facets[row.facet].append({
+            'value': row.value,
+            'label': row.label,
+            'count': row.count
+        })
+    
+    # Ordenar cada faceta por conteo y limitar el número de valores
+    limit = current_app.config['PUBLICATION_FACETS_LIMIT']
+    for name, values in facets.items():
+        values.sort(key=lambda v: (-v['count'], v['label'] or ''))
+        facets[name] = values[:limit]
+    
+    return facets
+
+@bp.route('/', methods=['GET'])
+@jwt_required()
+def get_publications():
+    # Consulta múltiple: ?ids=a,b,c resuelve varias publicaciones con una sola consulta
+    if request.args.get('ids'):
+        return _multi_get_publications()
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    
+    try:
+        fieldsets = _parse_publication_fieldsets()
+        include = parse_include(request.args, PUBLICATION_INCLUDES, default=DEFAULT_PUBLICATION_INCLUDE)
+        query = _build_publication_query().options(*_publication_options(fieldsets, include))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     # Ordenar
     sort_by = request.args.get('sort_by', 'created_at')
     sort_dir = request.args.get('sort_dir', 'desc')
     
-    if hasattr(Publication, sort_by):
-        order_column = getattr(Publication, sort_by)
-        if sort_dir.lower() == 'desc':
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    sort_error = Publication.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    query = Publication.apply_sort(query, sort_by, sort_dir)
     
     # Paginar
     paginated_query = query.paginate(page=page, per_page=per_page)
     
-    # Preparar respuesta
-    result = {
-        'data': [],
+    return jsonify({
+        'data': _serialize_publications(paginated_query.items, fieldsets, include),
         'total': paginated_query.total,
         'pages': paginated_query.pages,
         'current_page': page
-    }
+    })
+
+@bp.route('/batch-get', methods=['POST'])
+@jwt_required()
+def batch_get_publications():
+    return _multi_get_publications()
+
+@bp.route('/facets', methods=['GET'])
+@jwt_required()
+def get_publication_facets():
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
     
-    # Agregar datos básicos de publicaciones
-    for item in paginated_query.items:
-        publication_data = item.to_dict()
-        
-        # Agregar autores
-        authors = []
-        for pub_author in PublicationAuthor.query.filter_by(publication_id=item.id).all():
-            author = Author.query.get(pub_author.author_id)
-            if author:
-                authors.append({
-                    'id': str(author.id),
-                    'first_name': author.first_name,
-                    'last_name': author.last_name,
-                    'is_corresponding': pub_author.is_corresponding,
-                    'author_order': pub_author.author_order
-                })
-        publication_data['authors'] = authors
-        
-        # Agregar keywords
-        keywords = []
-        for pub_keyword in PublicationKeyword.query.filter_by(publication_id=item.id).all():
-            keyword = Keyword.query.get(pub_keyword.keyword_id)
-            if keyword:
-                keywords.append({
-                    'id': str(keyword.id),
-                    'name': keyword.name
-                })
-        publication_data['keywords'] = keywords
-        
-        result['data'].append(publication_data)
+    try:
+        query = _build_publication_query()
+        fieldsets = _parse_publication_fieldsets()
+        include = parse_include(request.args, PUBLICATION_INCLUDES, default=DEFAULT_PUBLICATION_INCLUDE)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Los conteos dependen solo de los filtros, así que se cachean por ese conjunto
+    cache_key = _publication_filter_key()
+    facets = _facets_cache.get(cache_key)
+    if facets is None:
+        facets = _compute_publication_facets(query)
+        _facets_cache.set(cache_key, facets, ttl=current_app.config['PUBLICATION_FACETS_CACHE_TTL'])
     
-    return jsonify(result)
+    paginated_query = Publication.apply_sort(
+        query.options(*_publication_options(fieldsets, include)), 'created_at', 'desc'
+    ).paginate(page=page, per_page=per_page)
+    
+    return jsonify({
+        'data': _serialize_publications(paginated_query.items, fieldsets, include),
+        'total': paginated_query.total,
+        'pages': paginated_query.pages,
+        'current_page': page,
+        'facets': facets
+    })
+
+@bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_publications():
+    export_format = request.args.get('format', 'ndjson').lower()
+    compress = request.args.get('gzip', 'false').lower() in ('true', '1', 't')
+    
+    if export_format not in ExportService.FORMATS:
+        return jsonify({
+            'error': f'Formato de exportación no soportado: {export_format}',
+            'allowed_formats': list(ExportService.FORMATS)
+        }), 400
+    
+    try:
+        query = _build_publication_query()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    mimetype, extension = ExportService.FORMATS[export_format]
+    filename = f'publications.{extension}'
+    if compress:
+        mimetype, filename = 'application/gzip', f'{filename}.gz'
+    
+    # El cuerpo se genera por lotes mientras se envía; nunca se materializa completo
+    return Response(
+        stream_with_context(ExportService.stream(query, export_format, compress=compress)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_publications():
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'error': 'Se requiere un fichero en el campo file'}), 400
+    
+    try:
+        import_format = ImportService.detect_format(upload.filename, request.args.get('format'))
+        # El fichero se lee como flujo de texto: los parsers no lo cargan completo en memoria
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        result = ImportService.import_stream(stream, import_format)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    
+    status = 201 if result['summary']['created'] else 200
+    return jsonify({
+        'message': f"Importación completada: {result['summary']['created']} publicaciones creadas",
+        **result
+    }), status
 
 @bp.route('/<uuid:id>', methods=['GET'])
 @jwt_required()
+@cached('publication', tags=lambda id: (
+    f'publications:{id}', 'publications:*', 'authors', 'keywords', 'journals'
+))
 def get_publication(id):
     try:
-        publication = Publication.get_by_id(id)
-        publication_data = publication.to_dict()
-        
-        # Añadir autores
-        authors = []
-        for pub_author in PublicationAuthor.query.filter_by(publication_id=id).all():
-            author = Author.query.get(pub_author.author_id)
-            if author:
-                authors.append({
-                    'id': str(author.id),
-                    'first_name': author.first_name,
-                    'last_name': author.last_name,
-                    'email': author.email,
-                    'institution': author.institution,
-                    'orcid_id': author.orcid_id,
-                    'is_corresponding': pub_author.is_corresponding,
-                    'author_order': pub_author.author_order
-                })
-        publication_data['authors'] = authors
+        fieldsets = _parse_publication_fieldsets(detailed=True)
+        include = parse_include(request.args, PUBLICATION_INCLUDES, default=DEFAULT_PUBLICATION_INCLUDE)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def build():
+        publication = Publication.query.options(
+            *_publication_options(fieldsets, include)
+        ).filter_by(id=id, is_active=True).first_or_404()
         
-        # Añadir keywords
-        keywords = []
-        for pub_keyword in PublicationKeyword.query.filter_by(publication_id=id).all():
-            keyword = Keyword.query.get(pub_keyword.keyword_id)
-            if keyword:
-                keywords.append({
-                    'id': str(keyword.id),
-                    'name': keyword.name
-                })
-        publication_data['keywords'] = keywords
+        return jsonify(_serialize_publications([publication], fieldsets, include)[0])
+    
+    try:
+        # Una consulta indexada decide si hace falta cargar y serializar la publicación
+        version = _publication_version(id)
+        if version is None:
+            abort(404)
+        return conditional_get(version, build)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+
+@bp.route('/<uuid:id>/citations', methods=['GET'])
+@jwt_required()
+def get_publication_citations(id):
+    direction = request.args.get('direction', 'in')
+    depth = request.args.get('depth', 2, type=int)
+    limit = request.args.get('limit', 500, type=int)
+    max_depth = current_app.config['CITATION_TRAVERSAL_MAX_DEPTH']
+    max_limit = current_app.config['CITATION_TRAVERSAL_MAX_LIMIT']
+    
+    if direction not in DIRECTIONS:
+        return jsonify({'error': f"direction debe ser uno de: {', '.join(DIRECTIONS)}"}), 400
+    if depth is None or not 1 <= depth <= max_depth:
+        return jsonify({'error': f'depth debe estar entre 1 y {max_depth}'}), 400
+    if limit is None or not 1 <= limit <= max_limit:
+        return jsonify({'error': f'limit debe estar entre 1 y {max_limit}'}), 400
+    
+    Publication.get_by_id(id)
+    
+    # Nodos y aristas se envían a medida que se leen de la CTE recursiva
+    return Response(
+        stream_with_context(CitationTraversal.stream_json(id, direction, depth, limit)),
+        mimetype='application/json'
+    )
+
+@bp.route('/duplicates', methods=['GET'])
+@jwt_required()
+def get_duplicate_candidates():
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    status = request.args.get('status', 'pending')
+    
+    first, second = aliased(Publication), aliased(Publication)
+    query = db.session.query(DuplicateCandidate, first, second).join(
+        first, first.id == DuplicateCandidate.publication_id
+    ).join(
+        second, second.id == DuplicateCandidate.duplicate_id
+    ).filter(DuplicateCandidate.status == status)
+    if status == 'pending':
+        # Un par deja de estar pendiente si una de las dos publicaciones se elimina o se fusiona
+        query = query.filter(first.is_active == True, second.is_active == True)
+    paginated_query = query.order_by(
+        DuplicateCandidate.similarity.desc(), DuplicateCandidate.publication_id, DuplicateCandidate.duplicate_id
+    ).paginate(page=page, per_page=per_page)
+    
+    def summary(publication):
+        return {'id': str(publication.id), 'title': publication.title, 'year': publication.year, 'doi': publication.doi}
+    
+    return jsonify({
+        'data': [
+            {
+                'publication': summary(publication),
+                'duplicate': summary(duplicate),
+                'similarity': round(candidate.similarity, 4),
+                'status': candidate.status,
+                'detected_at': candidate.detected_at.isoformat()
+            }
+            for candidate, publication, duplicate in paginated_query.items
+        ],
+        'total': paginated_query.total,
+        'pages': paginated_query.pages,
+        'current_page': page
+    })
+
+@bp.route('/duplicates/dismiss', methods=['POST'])
+@jwt_required()
+def dismiss_duplicate_candidate():
+    data = request.get_json() or {}
+    
+    try:
+        first_id, second_id = sorted((uuid.UUID(str(data['publication_id'])), uuid.UUID(str(data['duplicate_id']))), key=str)
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Se requieren publication_id y duplicate_id válidos'}), 400
+    
+    candidate = db.session.get(DuplicateCandidate, (first_id, second_id))
+    if candidate is None:
+        return jsonify({'error': 'El par no está registrado como posible duplicado'}), 404
+    
+    candidate.status = 'dismissed'
+    db.session.commit()
+    return jsonify({'message': 'Par descartado como duplicado', 'data': candidate.to_dict()})
+
+@bp.route('/<uuid:id>/duplicates', methods=['GET'])
+@jwt_required()
+def get_publication_duplicates(id):
+    min_similarity = request.args.get('min_similarity', type=float)
+    if min_similarity is not None and not 0 < min_similarity <= 1:
+        return jsonify({'error': 'min_similarity debe estar entre 0 y 1'}), 400
+    
+    try:
+        Publication.get_by_id(id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+    
+    # Búsqueda en el índice LSH con el título actual: no depende de la última detección
+    candidates = DuplicateService.candidates_for(id, min_similarity)
+    publications = Publication.get_many([other_id for other_id, _ in candidates])
+    return jsonify({
+        'data': [
+            {
+                'id': str(other_id),
+                'title': publications[other_id].title,
+                'year': publications[other_id].year,
+                'doi': publications[other_id].doi,
+                'similarity': round(similarity, 4)
+            }
+            for other_id, similarity in candidates if other_id in publications
+        ]
+    })
+
+@bp.route('/<uuid:id>/merge', methods=['POST'])
+@jwt_required()
+def merge_publication(id):
+    data = request.get_json() or {}
+    
+    try:
+        target_id = uuid.UUID(str(data['into']))
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Se requiere el id de la publicación que se conserva (into)'}), 400
+    
+    try:
+        with unit_of_work():
+            changes = DuplicateService.merge(id, target_id)
         
-        return jsonify(publication_data)
+        return jsonify({
+            'message': 'Publicaciones fusionadas exitosamente',
+            'data': Publication.get_by_id(target_id).to_dict(),
+            'changes': changes
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 404
+
+@bp.route('/<uuid:id>/related', methods=['GET'])
+@jwt_required()
+@cached('related_publications', tags=lambda id: (
+    'related_publications', f'related_publications:{id}', f'publications:{id}', 'publications:*'
+))
+def get_related_publications(id):
+    max_limit = current_app.config['RELATED_PUBLICATIONS_K']
+    limit = request.args.get('limit', 10, type=int)
+    if limit is None or not 1 <= limit <= max_limit:
+        return jsonify({'error': f'limit debe estar entre 1 y {max_limit}'}), 400
+    
+    try:
+        Publication.get_by_id(id)
     except Exception as e:
         return jsonify({'error': str(e)}), 404
+    
+    # Lista precalculada: una lectura por el índice (publication_id, score)
+    return jsonify({
+        'data': [
+            {'id': row.id, 'title': row.title, 'year': row.year, 'doi': row.doi, 'score': round(row.score, 4)}
+            for row in RelatedPublicationsService.related(id, limit)
+        ]
+    })
 
 @bp.route('/<uuid:id>', methods=['PUT'])
 @jwt_required()
 def update_publication(id):
     data = request.get_json()
     
+    read_only_error = Publication.read_only_error(data)
+    if read_only_error:
+        return jsonify(read_only_error), 400
+    
     try:
         # Actualizar campos de publicación
         publication_fields = {
@@ -190,40 +656,23 @@ def update_publication(id):
             if k not in ['authors', 'keywords']
         }
         
-        publication = Publication.update(id, **publication_fields)
+        changes = {}
+        with unit_of_work():
+            publication = Publication.update(id, **publication_fields)
         
-        # Actualizar autores si se proporcionan
-        if 'authors' in data and isinstance(data['authors'], list):
-            # Eliminar autores existentes
-            PublicationAuthor.query.filter_by(publication_id=id).delete()
-            
-            # Agregar nuevos autores
-            for idx, author_data in enumerate(data['authors']):
-                if isinstance(author_data, dict) and 'author_id' in author_data:
-                    PublicationAuthor.create(
-                        publication_id=publication.id,
-                        author_id=uuid.UUID(author_data['author_id']),
-                        is_corresponding=author_data.get('is_corresponding', False),
-                        author_order=author_data.get('author_order', idx + 1)
-                    )
-        
-        # Actualizar keywords si se proporcionan
-        if 'keywords' in data and isinstance(data['keywords'], list):
-            # Eliminar keywords existentes
-            PublicationKeyword.query.filter_by(publication_id=id).delete()
-            
-            # Agregar nuevas keywords
-            for keyword_id in data['keywords']:
-                PublicationKeyword.create(
-                    publication_id=publication.id,
-                    keyword_id=uuid.UUID(keyword_id)
+            # Solo se insertan, actualizan o eliminan los vínculos que cambian
+            if 'authors' in data and isinstance(data['authors'], list):
+                changes['authors'] = PublicationService.sync_authors(
+                    publication.id, PublicationService.parse_authors(data['authors'])
                 )
         
-        db.session.commit()
+            if 'keywords' in data and isinstance(data['keywords'], list):
+                changes['keywords'] = PublicationService.sync_keywords(publication.id, data['keywords'])
         
         return jsonify({
             'message': 'Publicación actualizada exitosamente',
-            'data': publication.to_dict()
+            'data': publication.to_dict(),
+            'changes': changes
         })
     except Exception as e:
         db.session.rollback()
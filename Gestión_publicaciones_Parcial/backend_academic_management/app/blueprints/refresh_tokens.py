@@ -1,10 +1,10 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import (
     create_access_token, create_refresh_token, 
-    get_jwt_identity, jwt_required
+    get_jwt_identity
 )
 from app.models import RefreshToken, User
-from app.extensions import db
+from app.extensions import db, jwt_required
 import datetime
 import uuid
 
@@ -0,0 +1,72 @@
+from flask import Blueprint, jsonify, request
+from app.models import AuthorStats, JournalStats, KeywordStats, ProjectStats
+from app.models import Author, Journal, Keyword, Project
+from app.extensions import db, jwt_required
+
+bp = Blueprint('stats', __name__)
+
+# tipo -> (tabla resumen, columna de la entidad, modelo de la entidad)
+STATS = {
+    'authors': (AuthorStats, 'author_id', Author),
+    'journals': (JournalStats, 'journal_id', Journal),
+    'keywords': (KeywordStats, 'keyword_id', Keyword),
+    'projects': (ProjectStats, 'project_id', Project)
+}
+
+# Valores de una entidad sin publicaciones activas (no tiene fila en la tabla resumen)
+EMPTY_STATS = {
+    'publication_count': 0,
+    'total_citations': 0,
+    'h_index': 0,
+    'first_year': None,
+    'last_year': None,
+    'refreshed_at': None
+}
+
+@bp.route('/<kind>', methods=['GET'])
+@jwt_required()
+def get_stats_ranking(kind):
+    if kind not in STATS:
+        return jsonify({'error': f'Estadísticas no disponibles para {kind}'}), 404
+    model, key, entity = STATS[kind]
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    sort_by = request.args.get('sort_by', 'publication_count')
+    sort_dir = request.args.get('sort_dir', 'desc')
+    
+    sort_error = model.sort_key_error(sort_by)
+    if sort_error:
+        return jsonify(sort_error), 400
+    
+    # El ranking se lee de la tabla resumen por su índice, sin agregar publicaciones
+    order_column = getattr(model, sort_by)
+    entity_column = getattr(model, key)
+    order = order_column.desc() if sort_dir.lower() == 'desc' else order_column.asc()
+    query = db.session.query(model).join(entity, entity.id == entity_column).filter(
+        entity.is_active == True
+    ).order_by(order, entity_column)
+    
+    paginated_query = query.paginate(page=page, per_page=per_page)
+    
+    return jsonify({
+        'data': [item.to_dict() for item in paginated_query.items],
+        'total': paginated_query.total,
+        'pages': paginated_query.pages,
+        'current_page': page
+    })
+
+@bp.route('/<kind>/<uuid:id>', methods=['GET'])
+@jwt_required()
+def get_entity_stats(kind, id):
+    if kind not in STATS:
+        return jsonify({'error': f'Estadísticas no disponibles para {kind}'}), 404
+    model, key, entity = STATS[kind]
+    
+    try:
+        entity.get_by_id(id)
+        stats = db.session.get(model, id)
+        data = stats.to_dict() if stats is not None else {key: str(id), **EMPTY_STATS}
+        return jsonify(data)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
@@ -1,14 +1,22 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
 from app.models import User
-from app.extensions import db
+from app.extensions import db, jwt_required
+from app.services.multi_get import multi_get_response
 from werkzeug.security import generate_password_hash
 
 bp = Blueprint('users', __name__)
 
+# Columnas que nunca se devuelven en las consultas múltiples
+USER_PRIVATE_FIELDS = ('password_hash',)
+
 @bp.route('/', methods=['GET'])
 @jwt_required()
 def get_users():
+    # Consulta múltiple: ?ids=a,b,c resuelve varios usuarios con una sola consulta
+    if request.args.get('ids'):
+        return multi_get_response(User, 'user', exclude=USER_PRIVATE_FIELDS)
+    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     
@@ -21,6 +29,11 @@ def get_users():
         'current_page': page
     })
 
+@bp.route('/batch-get', methods=['POST'])
+@jwt_required()
+def batch_get_users():
+    return multi_get_response(User, 'user', exclude=USER_PRIVATE_FIELDS)
+
 @bp.route('/<uuid:id>', methods=['GET'])
 @jwt_required()
 def get_user(id):
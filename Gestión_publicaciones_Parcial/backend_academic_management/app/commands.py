@@ -0,0 +1,181 @@
+import json
+import time
+import click
+from app.extensions import db
+from app.services.author_disambiguation import AuthorDisambiguationService, MAX_BLOCK_SIZE
+from app.services.citation_counts import CitationCountService
+from app.services.citation_graph import GraphUnavailable
+from app.services.coauthorship_service import CoauthorshipService
+from app.services.duplicate_service import DuplicateService
+from app.services.import_service import ImportService
+from app.services.reference_resolver import ReferenceResolver
+from app.services.related_service import RelatedPublicationsService
+from app.services.stats_service import StatsService
+
+
+def register_commands(app):
+    """Registra los comandos de consola de la aplicación (flask <comando>)"""
+
+    @app.cli.command('import-publications')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'import_format', default=None, help='bibtex, ris o csv (por defecto según la extensión)')
+    @click.option('--report', type=click.Path(dir_okay=False), default=None, help='Fichero JSON para el informe por fila')
+    def import_publications(path, import_format, report):
+        """Importa publicaciones desde un fichero BibTeX, RIS o CSV"""
+        import_format = ImportService.detect_format(path, import_format)
+        start = time.perf_counter()
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            result = ImportService.import_stream(stream, import_format)
+        elapsed = time.perf_counter() - start
+
+        summary = result['summary']
+        click.echo(
+            f"{summary['total']} registros en {elapsed:.2f} s: {summary['created']} creados, "
+            f"{summary['skipped']} omitidos, {summary['errors']} con errores"
+        )
+        for row in result['rows']:
+            if row['status'] != 'created':
+                click.echo(f"  fila {row['row']}: {row['status']} - {row['error']}")
+
+        if report:
+            with open(report, 'w', encoding='utf-8') as output:
+                json.dump(result, output, ensure_ascii=False, indent=2)
+
+    @app.cli.command('refresh-stats')
+    @click.option('--kind', type=click.Choice(list(StatsService.KINDS)), default=None, help='Solo un tipo de estadística')
+    def refresh_stats(kind):
+        """Recalcula por completo las tablas resumen de estadísticas"""
+        start = time.perf_counter()
+        if kind:
+            StatsService.refresh(kind)
+        else:
+            StatsService.refresh_all()
+        db.session.commit()
+        click.echo(f"Estadísticas recalculadas en {time.perf_counter() - start:.2f} s")
+
+    @app.cli.command('recompute-citation-counts')
+    @click.option('--batch-size', default=5000, show_default=True, help='Publicaciones por lote (un UPDATE por lote)')
+    def recompute_citation_counts(batch_size):
+        """Recalcula citation_count de todas las publicaciones a partir de las referencias activas"""
+        start = time.perf_counter()
+        updated = CitationCountService.recompute(batch_size=batch_size)
+        click.echo(f"{updated} publicaciones corregidas en {time.perf_counter() - start:.2f} s")
+
+    @app.cli.command('resolve-references')
+    @click.option('--batch-size', default=1000, show_default=True, help='Referencias por lote (una consulta de búsqueda por lote)')
+    def resolve_references(batch_size):
+        """Enlaza las referencias sin resolver con publicaciones del catálogo por DOI o título"""
+        def report(progress):
+            click.echo(
+                f"lote {progress['batches']}: {progress['batch_resolved']}/{progress['batch_processed']} resueltas "
+                f"({progress['batch_rate']:.0f} ref/s); acumulado {progress['resolved']}/{progress['processed']}"
+            )
+
+        totals = ReferenceResolver.resolve_pending(batch_size=batch_size, progress=report)
+        click.echo(
+            f"{totals['resolved']} de {totals['processed']} referencias resueltas "
+            f"({totals['doi']} por DOI, {totals['title']} por título) en {totals['elapsed']:.2f} s "
+            f"({totals['rate']:.0f} ref/s)"
+        )
+
+    @app.cli.command('rebuild-coauthorships')
+    def rebuild_coauthorships():
+        """Recalcula por completo la tabla de coautoría a partir de los vínculos activos"""
+        start = time.perf_counter()
+        CoauthorshipService.refresh()
+        db.session.commit()
+        click.echo(f"Tabla de coautoría recalculada en {time.perf_counter() - start:.2f} s")
+
+    @app.cli.command('detect-communities')
+    @click.option('--max-iterations', default=50, show_default=True, help='Iteraciones máximas de la propagación de etiquetas')
+    def detect_communities(max_iterations):
+        """Detecta las comunidades de colaboración y las guarda en author_communities"""
+        start = time.perf_counter()
+        try:
+            result = CoauthorshipService.detect_communities(max_iterations=max_iterations)
+        except GraphUnavailable as e:
+            raise click.ClickException(str(e))
+        db.session.commit()
+        click.echo(
+            f"{result['communities']} comunidades entre {result['authors']} autores "
+            f"({result['iterations']} iteraciones) en {time.perf_counter() - start:.2f} s"
+        )
+
+    @app.cli.command('detect-duplicates')
+    @click.option('--batch-size', default=1000, show_default=True, help='Publicaciones por lote (una consulta de cubetas por lote)')
+    @click.option('--reindex', is_flag=True, help='Recalcula las firmas de todas las publicaciones, no solo las nuevas')
+    def detect_duplicates(batch_size, reindex):
+        """Indexa las firmas MinHash de las publicaciones y registra los pares casi duplicados"""
+        def report(progress):
+            click.echo(
+                f"lote {progress['batches']}: {progress['processed']} publicaciones "
+                f"({progress['batch_rate']:.0f} pub/s), {progress['pairs']} pares"
+            )
+
+        totals = DuplicateService.detect_all(batch_size=batch_size, reindex=reindex, progress=report)
+        click.echo(
+            f"{totals['pairs']} posibles duplicados entre {totals['processed']} publicaciones "
+            f"en {totals['elapsed']:.2f} s ({totals['rate']:.0f} pub/s)"
+        )
+
+    @app.cli.command('merge-publications')
+    @click.argument('source', type=click.UUID)
+    @click.argument('target', type=click.UUID)
+    def merge_publications(source, target):
+        """Fusiona SOURCE en TARGET (SOURCE queda inactiva y apunta a TARGET)"""
+        try:
+            changes = DuplicateService.merge(source, target)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        db.session.commit()
+        click.echo(
+            f"Fusionada: {changes['authors']} autores, {changes['keywords']} keywords, "
+            f"{changes['references']} referencias y {changes['citations']} citas trasladadas"
+        )
+
+    @app.cli.command('disambiguate-authors')
+    @click.option('--batch-size', default=5000, show_default=True, help='Autores por lote (una consulta de coautores por lote)')
+    @click.option('--min-score', type=float, default=None, help='Puntuación mínima (por defecto AUTHOR_MATCH_THRESHOLD)')
+    def disambiguate_authors(batch_size, min_score):
+        """Compara los autores por bloques de apellido e inicial y registra los pares probables"""
+        def report(progress):
+            click.echo(
+                f"lote {progress['batches']}: {progress['authors']} autores ({progress['batch_rate']:.0f} autores/s), "
+                f"{progress['comparisons']} comparaciones, {progress['pairs']} pares"
+            )
+
+        totals = AuthorDisambiguationService.detect_all(batch_size=batch_size, min_score=min_score, progress=report)
+        click.echo(
+            f"{totals['pairs']} posibles duplicados entre {totals['authors']} autores "
+            f"en {totals['elapsed']:.2f} s ({totals['rate']:.0f} autores/s)"
+        )
+        if totals['skipped']:
+            click.echo(f"{totals['skipped']} autores sin comparar (bloques de más de {MAX_BLOCK_SIZE} con el mismo nombre)")
+
+    @app.cli.command('merge-authors')
+    @click.argument('source', type=click.UUID)
+    @click.argument('target', type=click.UUID)
+    def merge_authors(source, target):
+        """Fusiona el autor SOURCE en TARGET (SOURCE queda inactivo y apunta a TARGET)"""
+        try:
+            changes = AuthorDisambiguationService.merge(source, target)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        db.session.commit()
+        fields = ', '.join(changes['fields']) or 'ninguno'
+        click.echo(f"Fusionado: {changes['publications']} autorías trasladadas; campos completados: {fields}")
+
+    @app.cli.command('build-related')
+    @click.option('--batch-size', default=5000, show_default=True, help='Publicaciones leídas por lote al vectorizar')
+    def build_related(batch_size):
+        """Reconstruye el índice TF-IDF y los vecinos precalculados de todas las publicaciones"""
+        try:
+            result = RelatedPublicationsService.rebuild(batch_size=batch_size)
+        except GraphUnavailable as e:
+            raise click.ClickException(str(e))
+        db.session.commit()
+        click.echo(
+            f"{result['publications']} publicaciones, {result['terms']} términos, {result['postings']} entradas "
+            f"y {result['pairs']} vecinos ({result['backend']}) en {result['elapsed']:.2f} s "
+            f"({result['rate']:.0f} pub/s)"
+        )
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from datetime import timedelta
 
@@ -17,4 +18,62 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() in ('true', '1', 't')
\ No newline at end of file
+    FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() in ('true', '1', 't')
+
+    # Búsqueda facetada de publicaciones
+    PUBLICATION_FACETS_CACHE_TTL = int(os.getenv('PUBLICATION_FACETS_CACHE_TTL', '30'))
+    PUBLICATION_FACETS_LIMIT = int(os.getenv('PUBLICATION_FACETS_LIMIT', '20'))
+    # Exportación masiva en streaming (filas por lote del cursor del servidor)
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+
+    # Importación masiva (registros por lote dentro de la única transacción)
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '1000'))
+
+    # Máximo de ids por consulta múltiple (?ids= y /batch-get)
+    MULTI_GET_MAX_IDS = int(os.getenv('MULTI_GET_MAX_IDS', '100'))
+
+    # Endpoint de lotes /api/batch
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '25'))
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '8'))
+
+    # Grafo de citas en memoria (segundos entre sincronizaciones incrementales y reconstrucciones)
+    CITATION_GRAPH_SYNC_INTERVAL = int(os.getenv('CITATION_GRAPH_SYNC_INTERVAL', '5'))
+    CITATION_GRAPH_SYNC_OVERLAP = int(os.getenv('CITATION_GRAPH_SYNC_OVERLAP', '60'))
+    CITATION_GRAPH_REBUILD_INTERVAL = int(os.getenv('CITATION_GRAPH_REBUILD_INTERVAL', '3600'))
+    CITATION_GRAPH_PAGERANK_TTL = int(os.getenv('CITATION_GRAPH_PAGERANK_TTL', '60'))
+    CITATION_GRAPH_DAMPING = float(os.getenv('CITATION_GRAPH_DAMPING', '0.85'))
+
+    # Recorrido de citas con CTE recursiva (/api/publications/<id>/citations)
+    CITATION_TRAVERSAL_MAX_DEPTH = int(os.getenv('CITATION_TRAVERSAL_MAX_DEPTH', '5'))
+    CITATION_TRAVERSAL_MAX_LIMIT = int(os.getenv('CITATION_TRAVERSAL_MAX_LIMIT', '5000'))
+
+    # Similitud de Jaccard mínima entre títulos para proponer dos publicaciones como duplicadas
+    DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv('DUPLICATE_SIMILARITY_THRESHOLD', '0.8'))
+
+    # Puntuación mínima (0-1) para proponer dos autores del mismo bloque como la misma persona
+    AUTHOR_MATCH_THRESHOLD = float(os.getenv('AUTHOR_MATCH_THRESHOLD', '0.5'))
+
+    # Vecinos precalculados por publicación (/api/publications/<id>/related)
+    RELATED_PUBLICATIONS_K = int(os.getenv('RELATED_PUBLICATIONS_K', '20'))
+
+    # Caché de respuestas de lectura: sqlite (fichero compartido por los workers de la máquina),
+    # lru (memoria de un solo proceso: las invalidaciones no llegan a los demás workers, úsese
+    # solo con el servidor de desarrollo o un único worker) o none (desactivada). Con varias
+    # máquinas una escritura solo invalida el fichero de la que la atiende: use none o TTLs cortos
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'sqlite')
+    RESPONSE_CACHE_PATH = os.getenv(
+        'RESPONSE_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'academic_response_cache.sqlite3')
+    )
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '2048'))
+    RESPONSE_CACHE_DEFAULT_TTL = int(os.getenv('RESPONSE_CACHE_DEFAULT_TTL', '60'))
+    # TTL en segundos por endpoint; las escrituras invalidan antes de que expiren
+    RESPONSE_CACHE_TTLS = {
+        'countries': 3600,
+        'publication_types': 3600,
+        'journals': 600,
+        'journal': 600,
+        'publication': 300,
+        'author': 300,
+        'author_profile': 300,
+        'related_publications': 300
+    }
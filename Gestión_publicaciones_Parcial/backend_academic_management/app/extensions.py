@@ -1,12 +1,38 @@
+from functools import wraps
+from flask import current_app, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, jwt_required as _jwt_required
 from flask_restx import Api
 
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 
+# Clave del entorno WSGI con la que un lote marca sus sub-peticiones (no se puede enviar como cabecera)
+JWT_VERIFIED_ENVIRON_KEY = 'academic_management.jwt_verified'
+
+
+def jwt_required(optional=False, fresh=False, refresh=False, **options):
+    """jwt_required de flask_jwt_extended que acepta el token ya verificado por un lote.
+
+    El lote (ver blueprints/batch.py) verifica el token una vez, copia el estado decodificado
+    en g y marca el entorno de cada sub-petición con JWT_VERIFIED_ENVIRON_KEY. Las vistas que
+    exigen un token fresh o refresh lo verifican siempre.
+    """
+    def decorator(view):
+        protected = _jwt_required(optional=optional, fresh=fresh, refresh=refresh, **options)(view)
+        if fresh or refresh:
+            return protected
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.environ.get(JWT_VERIFIED_ENVIRON_KEY):
+                return current_app.ensure_sync(view)(*args, **kwargs)
+            return protected(*args, **kwargs)
+        return wrapper
+    return decorator
+
 # Configuración de Swagger
 authorizations = {
     'Bearer': {
@@ -0,0 +1,55 @@
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa el módulo json estándar
+    orjson = None
+
+
+def _orjson_default(value):
+    """Tipos que orjson no serializa de forma nativa"""
+    if isinstance(value, Decimal):
+        return str(value)
+    return DefaultJSONProvider.default(value)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Proveedor JSON basado en orjson (UUID, date y datetime nativos; Decimal como texto)"""
+
+    # El orden de las claves sigue el de las columnas del modelo; ordenarlas solo añade coste
+    sort_keys = False
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """Serializa a texto JSON; con argumentos propios de json.dumps delega en la implementación estándar"""
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_orjson_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserializa texto o bytes JSON"""
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Genera la respuesta directamente en bytes, sin pasar por str"""
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(
+            obj,
+            default=_orjson_default,
+            option=self._options(indent) | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
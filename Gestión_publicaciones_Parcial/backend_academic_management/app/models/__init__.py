@@ -1,5 +1,7 @@
 from .models import (
     BaseMixin,
+    unit_of_work,
+    in_unit_of_work,
     Country,
     User,
     RefreshToken,
@@ -16,11 +18,27 @@ from .models import (
     ProjectMember,
     Milestone,
     Deliverable,
-    Acquisition
+    Acquisition,
+    AuthorStats,
+    JournalStats,
+    KeywordStats,
+    ProjectStats,
+    Coauthorship,
+    AuthorCommunity,
+    PublicationSignature,
+    PublicationLSHBucket,
+    DuplicateCandidate,
+    AuthorMatchCandidate,
+    RelatedTerm,
+    PublicationTerm,
+    RelatedPublication
 )
+from .serializers import ModelSerializer, get_serializer, build_serializers
 
 __all__ = [
     'BaseMixin',
+    'unit_of_work',
+    'in_unit_of_work',
     'Country',
     'User',
     'RefreshToken',
@@ -37,5 +55,21 @@ __all__ = [
     'ProjectMember',
     'Milestone',
     'Deliverable',
-    'Acquisition'
+    'Acquisition',
+    'AuthorStats',
+    'JournalStats',
+    'KeywordStats',
+    'ProjectStats',
+    'Coauthorship',
+    'AuthorCommunity',
+    'PublicationSignature',
+    'PublicationLSHBucket',
+    'DuplicateCandidate',
+    'AuthorMatchCandidate',
+    'RelatedTerm',
+    'PublicationTerm',
+    'RelatedPublication',
+    'ModelSerializer',
+    'get_serializer',
+    'build_serializers'
 ]
\ No newline at end of file
@@ -1,28 +1,168 @@
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import UUID
 from app.extensions import db
+from app.services.cache_service import mark_stale
+from app.services.normalization import author_block_key, normalize_title
+from .serializers import get_serializer
 
 
-class BaseMixin:
+def sort_indexes(tablename, sort_keys, scope=()):
+    """Genera un índice compuesto (scope..., is_active, clave, id) por cada clave de ordenamiento"""
+    prefix = ''.join(f'{column}_' for column in scope)
+    return tuple(
+        db.Index(f'ix_{tablename}_{prefix}active_{key}_id', *scope, 'is_active', key, 'id')
+        for key in sort_keys
+    )
+
+
+@contextmanager
+def unit_of_work():
+    """Agrupa varias operaciones create/update/delete en una sola transacción.
+
+    Dentro del bloque los métodos de BaseMixin no confirman: los cambios se envían
+    en un único flush y se confirman una sola vez al salir. Los bloques anidados se
+    integran en el más externo; ante una excepción se revierte todo.
+    """
+    depth = db.session.info.get('unit_of_work_depth', 0)
+    db.session.info['unit_of_work_depth'] = depth + 1
+    try:
+        yield db.session
+        if depth == 0:
+            db.session.commit()
+    except Exception:
+        if depth == 0:
+            db.session.rollback()
+        raise
+    finally:
+        db.session.info['unit_of_work_depth'] = depth
+
+
+def in_unit_of_work():
+    """Indica si hay una unidad de trabajo abierta en la sesión actual"""
+    return db.session.info.get('unit_of_work_depth', 0) > 0
+
+
+def _commit():
+    """Confirma la transacción salvo que la controle una unidad de trabajo"""
+    if not in_unit_of_work():
+        db.session.commit()
+
+
+class SortableMixin:
+    """Claves de ordenamiento permitidas en los listados de un modelo"""
+
+    # Claves por las que se permite ordenar los listados; cada una tiene su índice
+    SORT_KEYS = ()
+
+    @classmethod
+    def is_sortable(cls, sort_by):
+        """Indica si la clave de ordenamiento está registrada para el modelo"""
+        return sort_by in cls.SORT_KEYS
+
+    @classmethod
+    def sort_key_error(cls, sort_by):
+        """Cuerpo de la respuesta 400 para una clave no registrada; None si la clave es válida"""
+        if cls.is_sortable(sort_by):
+            return None
+        return {
+            'error': f'No se puede ordenar por {sort_by}',
+            'allowed_sort_keys': list(cls.SORT_KEYS)
+        }
+
+
+class SerializableMixin:
+    """to_dict() con el serializador precompilado del modelo (ver serializers.py)"""
+
+    def to_dict(self, fields=None, exclude=None):
+        """Convierte el modelo a un diccionario, opcionalmente limitado a ciertos campos"""
+        return get_serializer(type(self)).serialize(self, fields=fields, exclude=exclude)
+
+
+class BaseMixin(SortableMixin, SerializableMixin):
     """Mixin que proporciona funcionalidad com�n para todos los modelos"""
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
 
+    # Columnas que apuntan a otros recursos cuyas respuestas en caché cambian con la fila
+    CACHE_PARENTS = {}
+
+    # Columnas internas (normalización, fusiones) que no se incluyen en las respuestas de la API
+    PRIVATE_COLUMNS = ()
+
+    # Columnas que mantiene la aplicación (contadores); se devuelven pero no se aceptan en la entrada
+    READ_ONLY_COLUMNS = ()
+
+    @classmethod
+    def read_only_error(cls, data):
+        """Cuerpo de la respuesta 400 si data intenta escribir columnas internas; None si no"""
+        rejected = sorted(set(data) & set(cls.READ_ONLY_COLUMNS + cls.PRIVATE_COLUMNS))
+        if not rejected:
+            return None
+        return {'error': f"No se pueden modificar los campos: {', '.join(rejected)}"}
+
+    @classmethod
+    def cache_tags_for(cls, values):
+        """Etiquetas de caché afectadas por una fila; si no se conoce el id o un padre se usa un comodín"""
+        table = cls.__tablename__
+        tags = [table, f"{table}:{values['id']}" if values.get('id') is not None else f'{table}:*']
+        for column, parent in cls.CACHE_PARENTS.items():
+            if column not in values:
+                tags.append(f'{parent}:*')
+            elif values[column] is not None:
+                tags.append(f'{parent}:{values[column]}')
+        return tags
+
+    def cache_tags(self):
+        """Etiquetas de caché afectadas por un cambio en esta instancia"""
+        values = {column: getattr(self, column) for column in ('id', *self.CACHE_PARENTS)}
+        tags = self.cache_tags_for(values)
+        # Si cambia un padre (p. ej. la revista) también se ve afectado el anterior
+        state = db.inspect(self)
+        for column, parent in self.CACHE_PARENTS.items():
+            tags.extend(f'{parent}:{previous}' for previous in state.attrs[column].history.deleted if previous is not None)
+        return tags
+
+    @classmethod
+    def apply_sort(cls, query, sort_by, sort_dir='asc'):
+        """Ordena la consulta por una clave registrada, desempatando por id"""
+        if not cls.is_sortable(sort_by):
+            raise ValueError(f'No se puede ordenar {cls.__tablename__} por {sort_by}')
+
+        order_column = getattr(cls, sort_by)
+        if sort_dir.lower() == 'desc':
+            return query.order_by(order_column.desc(), cls.id.desc())
+        return query.order_by(order_column.asc(), cls.id.asc())
+
     @classmethod
     def get_by_id(cls, id):
         """Obtiene un registro por su ID"""
         instance = cls.query.filter_by(id=id, is_active=True).first_or_404()
         return instance
 
+    @classmethod
+    def get_many(cls, ids, options=()):
+        """Obtiene varios registros activos con una sola consulta IN; devuelve {id: instancia}"""
+        if not ids:
+            return {}
+        query = cls.query.filter(cls.id.in_(ids), cls.is_active == True)
+        if options:
+            query = query.options(*options)
+        return {instance.id: instance for instance in query}
+
     @classmethod
     def create(cls, **kwargs):
         """Crea un nuevo registro"""
         instance = cls(**kwargs)
+        # El id se asigna ya para poder enlazar registros sin esperar al flush
+        if instance.id is None:
+            instance.id = uuid.uuid4()
         db.session.add(instance)
-        db.session.commit()
+        mark_stale(*instance.cache_tags())
+        _commit()
         return instance
 
     @classmethod
@@ -33,7 +173,8 @@ class BaseMixin:
             if hasattr(instance, key):
                 setattr(instance, key, value)
         instance.updated_at = datetime.utcnow()
-        db.session.commit()
+        mark_stale(*instance.cache_tags())
+        _commit()
         return instance
 
     @classmethod
@@ -42,27 +183,18 @@ class BaseMixin:
         instance = cls.get_by_id(id)
         instance.is_active = False
         instance.updated_at = datetime.utcnow()
-        db.session.commit()
+        mark_stale(*instance.cache_tags())
+        _commit()
         return True
 
-    def to_dict(self):
-        """Convierte el modelo a un diccionario"""
-        data = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
-            # Manejar tipos especiales
-            if isinstance(value, uuid.UUID):
-                value = str(value)
-            elif isinstance(value, datetime):
-                value = value.isoformat()
-            data[column.name] = value
-        return data
-
 
 # 1. Modelo de pa�s
 class Country(BaseMixin, db.Model):
     __tablename__ = 'countries'
     
+    SORT_KEYS = ('name', 'code')
+    __table_args__ = sort_indexes('countries', SORT_KEYS)
+    
     name = db.Column(db.String(100), nullable=False)
     code = db.Column(db.String(2), nullable=False, unique=True)
     
@@ -95,26 +227,55 @@ class RefreshToken(BaseMixin, db.Model):
     token = db.Column(db.String(255), nullable=False)
     expires_at = db.Column(db.DateTime, nullable=False)
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_refresh_tokens_user_id', 'user_id'),
+        db.Index('ix_refresh_tokens_active_user_id', 'user_id', postgresql_where=db.text('is_active')),
+    )
 
 
 # 4. Modelo de autor (puede ser diferente de usuario)
 class Author(BaseMixin, db.Model):
     __tablename__ = 'authors'
     
+    SORT_KEYS = ('last_name', 'first_name', 'created_at')
+    __table_args__ = sort_indexes('authors', SORT_KEYS) + (
+        # Desambiguación: los autores se recorren y comparan por bloques
+        db.Index('ix_authors_block_key_id', 'block_key', 'id'),
+    )
+    PRIVATE_COLUMNS = ('block_key', 'merged_into_id')
+    
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
     email = db.Column(db.String(100), unique=True)
     institution = db.Column(db.String(100))
     orcid_id = db.Column(db.String(19), unique=True)
+    block_key = db.Column(db.String(60))  # Se mantiene al asignar el nombre (ver author_block_key)
+    # Autor que lo sustituye tras fusionar duplicados (el fusionado queda inactivo)
+    merged_into_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id'))
     
     # Relaciones
     publication_authors = db.relationship('PublicationAuthor', backref='author', lazy=True, cascade='all, delete-orphan')
 
+    @db.validates('first_name', 'last_name')
+    def _sync_block_key(self, key, value):
+        names = {'first_name': self.first_name, 'last_name': self.last_name, key: value}
+        self.block_key = author_block_key(names['first_name'], names['last_name'])
+        return value
+
 
 # 5. Modelo de tipo de publicaci�n
 class PublicationType(BaseMixin, db.Model):
     __tablename__ = 'publication_types'
     
+    SORT_KEYS = ('name',)
+    __table_args__ = sort_indexes('publication_types', SORT_KEYS)
+    
+    # Nombres de los tipos que la importación y la exportación asocian a los formatos
+    # bibliográficos (article/JOUR e inproceedings/CONF)
+    ARTICLE = 'Artículo'
+    CONFERENCE = 'Conferencia'
+    
     name = db.Column(db.String(50), nullable=False, unique=True)
     description = db.Column(db.Text)
     
@@ -126,6 +287,9 @@ class PublicationType(BaseMixin, db.Model):
 class Journal(BaseMixin, db.Model):
     __tablename__ = 'journals'
     
+    SORT_KEYS = ('name', 'h_index', 'created_at')
+    __table_args__ = sort_indexes('journals', SORT_KEYS)
+    
     name = db.Column(db.String(100), nullable=False)
     issn = db.Column(db.String(9), unique=True)
     h_index = db.Column(db.Integer)
@@ -143,6 +307,9 @@ class Journal(BaseMixin, db.Model):
 class Conference(BaseMixin, db.Model):
     __tablename__ = 'conferences'
     
+    SORT_KEYS = ('year', 'name', 'start_date')
+    __table_args__ = sort_indexes('conferences', SORT_KEYS)
+    
     name = db.Column(db.String(100), nullable=False)
     year = db.Column(db.Integer, nullable=False)
     location = db.Column(db.String(100))
@@ -161,6 +328,12 @@ class Conference(BaseMixin, db.Model):
 class Keyword(BaseMixin, db.Model):
     __tablename__ = 'keywords'
     
+    SORT_KEYS = ('name', 'created_at')
+    __table_args__ = sort_indexes('keywords', SORT_KEYS) + (
+        # Búsqueda por nombre sin distinguir mayúsculas (importación masiva)
+        db.Index('ix_keywords_lower_name', db.text('lower(name)')),
+    )
+    
     name = db.Column(db.String(50), nullable=False, unique=True)
     
     # Relaciones
@@ -174,7 +347,20 @@ import uuid
 class Publication(BaseMixin, db.Model):
     __tablename__ = 'publications'
     
+    SORT_KEYS = ('created_at', 'publication_date', 'title', 'citation_count')
+    __table_args__ = sort_indexes('publications', SORT_KEYS) + (
+        # Resolución de referencias por título normalizado y por DOI sin distinguir mayúsculas
+        db.Index('ix_publications_normalized_title', 'normalized_title'),
+        db.Index('ix_publications_lower_doi', db.text('lower(doi)')),
+    )
+    
+    CACHE_PARENTS = {'journal_id': 'journals', 'project_id': 'projects'}
+    PRIVATE_COLUMNS = ('normalized_title', 'merged_into_id')
+    # citation_count solo cambia con las referencias (ver CitationCountService)
+    READ_ONLY_COLUMNS = ('citation_count',)
+    
     title = db.Column(db.String(255), nullable=False)
+    normalized_title = db.Column(db.String(255))  # Se mantiene al asignar title (ver normalize_title)
     abstract = db.Column(db.Text)
     doi = db.Column(db.String(100), unique=True)
     external_id = db.Column(db.Text, unique=True)  # Añadir este campo como texto
@@ -189,6 +375,8 @@ class Publication(BaseMixin, db.Model):
     conference_id = db.Column(UUID(as_uuid=True), db.ForeignKey('conferences.id'))
     citation_count = db.Column(db.Integer, default=0)
     project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('projects.id'))
+    # Publicación que la sustituye tras fusionar duplicados (la fusionada queda inactiva)
+    merged_into_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id'))
     
     
     # Relaciones
@@ -209,24 +397,52 @@ class Publication(BaseMixin, db.Model):
         cascade='all, delete-orphan'
     )
 
+    @db.validates('title')
+    def _sync_normalized_title(self, key, title):
+        self.normalized_title = normalize_title(title)
+        return title
+
 
 
 # 10. Modelo de relaci�n publicaci�n-autor
 class PublicationAuthor(BaseMixin, db.Model):
     __tablename__ = 'publication_authors'
     
+    CACHE_PARENTS = {'publication_id': 'publications', 'author_id': 'authors'}
+    
     publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id'), nullable=False)
     author_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id'), nullable=False)
     is_corresponding = db.Column(db.Boolean, default=False)
     author_order = db.Column(db.Integer, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_publication_authors_publication_id', 'publication_id'),
+        db.Index('ix_publication_authors_author_id', 'author_id'),
+        db.Index('ix_publication_authors_active_publication_id', 'publication_id', 'author_order',
+                 postgresql_where=db.text('is_active')),
+        db.Index('ix_publication_authors_active_author_id', 'author_id', 'publication_id',
+                 postgresql_where=db.text('is_active')),
+    )
 
 
 # 11. Modelo de relaci�n publicaci�n-keyword
 class PublicationKeyword(BaseMixin, db.Model):
     __tablename__ = 'publication_keywords'
     
+    CACHE_PARENTS = {'publication_id': 'publications', 'keyword_id': 'keywords'}
+    
     publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id'), nullable=False)
     keyword_id = db.Column(UUID(as_uuid=True), db.ForeignKey('keywords.id'), nullable=False)
+    
+    __table_args__ = (
+        # Una publicación no puede tener dos vínculos con la misma keyword (los inactivos se reactivan)
+        db.UniqueConstraint('publication_id', 'keyword_id', name='uq_publication_keywords_publication_id_keyword_id'),
+        db.Index('ix_publication_keywords_keyword_id', 'keyword_id'),
+        db.Index('ix_publication_keywords_active_publication_id', 'publication_id', 'keyword_id',
+                 postgresql_where=db.text('is_active')),
+        db.Index('ix_publication_keywords_active_keyword_id', 'keyword_id', 'publication_id',
+                 postgresql_where=db.text('is_active')),
+    )
 
 
 # 12. Modelo de referencia de publicaci�n
@@ -234,14 +450,32 @@ class PublicationReference(BaseMixin, db.Model):
     __tablename__ = 'publication_references'
     
     citing_publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id'), nullable=False)
-    referenced_publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id'), nullable=False)
+    # Nulo mientras la referencia solo tiene texto y no se ha resuelto a una publicación del catálogo
+    referenced_publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id'))
     reference_text = db.Column(db.Text)  # Para cuando la publicaci�n referenciada no est� en el sistema
+    
+    __table_args__ = (
+        db.Index('ix_publication_references_citing_publication_id', 'citing_publication_id'),
+        db.Index('ix_publication_references_referenced_publication_id', 'referenced_publication_id'),
+        db.Index('ix_publication_references_active_citing_publication_id', 'citing_publication_id',
+                 postgresql_where=db.text('is_active')),
+        db.Index('ix_publication_references_active_referenced_publication_id', 'referenced_publication_id',
+                 postgresql_where=db.text('is_active')),
+        # Sincronización incremental del grafo de citas (filas modificadas desde la última lectura)
+        db.Index('ix_publication_references_updated_at', 'updated_at'),
+        # Referencias pendientes de resolver (solo texto)
+        db.Index('ix_publication_references_unresolved_id', 'id',
+                 postgresql_where=db.text('referenced_publication_id IS NULL AND is_active')),
+    )
 
 
 # 13. Modelo de proyecto
 class Project(BaseMixin, db.Model):
     __tablename__ = 'projects'
     
+    SORT_KEYS = ('created_at', 'name', 'start_date')
+    __table_args__ = sort_indexes('projects', SORT_KEYS)
+    
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     start_date = db.Column(db.Date, nullable=False)
@@ -263,12 +497,24 @@ class ProjectMember(BaseMixin, db.Model):
     project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('projects.id'), nullable=False)
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False)
     role = db.Column(db.String(50), nullable=False) # investigador principal, co-investigador, asistente, etc.
+    
+    __table_args__ = (
+        db.Index('ix_project_members_project_id_user_id', 'project_id', 'user_id'),
+        db.Index('ix_project_members_user_id', 'user_id'),
+        db.Index('ix_project_members_active_project_id_user_id', 'project_id', 'user_id',
+                 postgresql_where=db.text('is_active')),
+        db.Index('ix_project_members_active_user_id', 'user_id', 'project_id',
+                 postgresql_where=db.text('is_active')),
+    )
 
 
 # 15. Modelo de hito de proyecto
 class Milestone(BaseMixin, db.Model):
     __tablename__ = 'milestones'
     
+    SORT_KEYS = ('due_date', 'created_at')
+    __table_args__ = sort_indexes('milestones', SORT_KEYS, scope=('project_id',))
+    
     project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('projects.id'), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -284,6 +530,9 @@ class Milestone(BaseMixin, db.Model):
 class Deliverable(BaseMixin, db.Model):
     __tablename__ = 'deliverables'
     
+    SORT_KEYS = ('created_at', 'due_date')
+    __table_args__ = sort_indexes('deliverables', SORT_KEYS, scope=('milestone_id',))
+    
     milestone_id = db.Column(UUID(as_uuid=True), db.ForeignKey('milestones.id'), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -296,6 +545,9 @@ class Deliverable(BaseMixin, db.Model):
 class Acquisition(BaseMixin, db.Model):
     __tablename__ = 'acquisitions'
     
+    SORT_KEYS = ('purchase_date', 'amount')
+    __table_args__ = sort_indexes('acquisitions', SORT_KEYS, scope=('project_id',))
+    
     project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('projects.id'), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -303,4 +555,170 @@ class Acquisition(BaseMixin, db.Model):
     purchase_date = db.Column(db.Date)
     category = db.Column(db.String(50))  # equipo, materiales, servicios, etc.
     supplier = db.Column(db.String(100))
-    invoice_number = db.Column(db.String(50))
\ No newline at end of file
+    invoice_number = db.Column(db.String(50))
+
+
+# 18. Estadísticas precalculadas (tablas resumen mantenidas al confirmar cada escritura)
+class StatsMixin(SortableMixin, SerializableMixin):
+    """Métricas agregadas de las publicaciones activas de una entidad"""
+    publication_count = db.Column(db.Integer, nullable=False, default=0)
+    total_citations = db.Column(db.Integer, nullable=False, default=0)
+    h_index = db.Column(db.Integer, nullable=False, default=0)
+    first_year = db.Column(db.Integer)
+    last_year = db.Column(db.Integer)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Claves por las que se permite ordenar los rankings
+    SORT_KEYS = ('publication_count', 'total_citations', 'h_index')
+
+
+def stats_indexes(tablename):
+    return tuple(db.Index(f'ix_{tablename}_{key}', key) for key in StatsMixin.SORT_KEYS)
+
+
+class AuthorStats(StatsMixin, db.Model):
+    __tablename__ = 'author_stats'
+    __table_args__ = stats_indexes('author_stats')
+
+    author_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True)
+
+
+class JournalStats(StatsMixin, db.Model):
+    __tablename__ = 'journal_stats'
+    __table_args__ = stats_indexes('journal_stats')
+
+    journal_id = db.Column(UUID(as_uuid=True), db.ForeignKey('journals.id', ondelete='CASCADE'), primary_key=True)
+
+
+class KeywordStats(StatsMixin, db.Model):
+    __tablename__ = 'keyword_stats'
+    __table_args__ = stats_indexes('keyword_stats')
+
+    keyword_id = db.Column(UUID(as_uuid=True), db.ForeignKey('keywords.id', ondelete='CASCADE'), primary_key=True)
+
+
+class ProjectStats(StatsMixin, db.Model):
+    __tablename__ = 'project_stats'
+    __table_args__ = stats_indexes('project_stats')
+
+    project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+
+
+# 19. Red de coautoría (lista de adyacencia ponderada mantenida al confirmar cada escritura)
+class Coauthorship(SerializableMixin, db.Model):
+    """Arista autor -> coautor con el número de publicaciones activas en común.
+
+    Se guardan los dos sentidos de cada par para leer los coautores de un autor por la clave primaria.
+    """
+    __tablename__ = 'coauthorships'
+    __table_args__ = (
+        db.Index('ix_coauthorships_author_id_weight', 'author_id', 'weight'),
+    )
+
+    author_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True)
+    coauthor_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True)
+    weight = db.Column(db.Integer, nullable=False)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class AuthorCommunity(SerializableMixin, db.Model):
+    """Comunidad de colaboración de un autor según la última detección (propagación de etiquetas)"""
+    __tablename__ = 'author_communities'
+    __table_args__ = (
+        db.Index('ix_author_communities_community_id', 'community_id'),
+    )
+
+    author_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True)
+    community_id = db.Column(UUID(as_uuid=True), nullable=False)  # Autor que da nombre a la comunidad
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+# 20. Detección de publicaciones duplicadas (firmas MinHash e índice LSH de los títulos)
+class PublicationSignature(db.Model):
+    """Firma MinHash del título normalizado de una publicación"""
+    __tablename__ = 'publication_signatures'
+
+    publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class PublicationLSHBucket(db.Model):
+    """Cubeta LSH de una banda de la firma: las publicaciones que comparten cubeta son candidatas a duplicado"""
+    __tablename__ = 'publication_lsh_buckets'
+    __table_args__ = (
+        db.Index('ix_publication_lsh_buckets_publication_id', 'publication_id'),
+    )
+
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+
+
+class DuplicateCandidate(SerializableMixin, db.Model):
+    """Par de publicaciones probablemente duplicadas (publication_id < duplicate_id)"""
+    __tablename__ = 'duplicate_candidates'
+    __table_args__ = (
+        db.Index('ix_duplicate_candidates_status_similarity', 'status', 'similarity'),
+        db.Index('ix_duplicate_candidates_duplicate_id', 'duplicate_id'),
+    )
+
+    publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+    duplicate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+    similarity = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, merged, dismissed
+    detected_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+# 21. Desambiguación de autores (pares candidatos por bloque de apellido e inicial)
+class AuthorMatchCandidate(SerializableMixin, db.Model):
+    """Par de autores que probablemente son la misma persona (author_id < duplicate_id)"""
+    __tablename__ = 'author_match_candidates'
+    __table_args__ = (
+        db.Index('ix_author_match_candidates_status_score', 'status', 'score'),
+        db.Index('ix_author_match_candidates_duplicate_id', 'duplicate_id'),
+    )
+
+    author_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True)
+    duplicate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('authors.id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    evidence = db.Column(db.String(100))  # Señales que suman a la puntuación: email, institution, coauthors...
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, merged, dismissed
+    detected_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+# 22. Publicaciones relacionadas (índice TF-IDF y vecinos precalculados)
+class RelatedTerm(db.Model):
+    """Término del vocabulario del índice con su frecuencia documental e IDF"""
+    __tablename__ = 'related_terms'
+
+    id = db.Column(db.Integer, primary_key=True)
+    term = db.Column(db.String(50), nullable=False, unique=True)
+    document_count = db.Column(db.Integer, nullable=False)
+    idf = db.Column(db.Float, nullable=False)
+
+
+class PublicationTerm(db.Model):
+    """Entrada del índice invertido: peso TF-IDF normalizado de un término en una publicación"""
+    __tablename__ = 'publication_terms'
+    __table_args__ = (
+        # Las entradas de más peso de cada término se leen primero
+        db.Index('ix_publication_terms_term_id_weight', 'term_id', 'weight'),
+        db.Index('ix_publication_terms_publication_id', 'publication_id'),
+    )
+
+    term_id = db.Column(db.Integer, db.ForeignKey('related_terms.id', ondelete='CASCADE'), primary_key=True)
+    publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+    weight = db.Column(db.Float, nullable=False)
+
+
+class RelatedPublication(db.Model):
+    """Vecino precalculado de una publicación por similitud coseno de sus vectores TF-IDF"""
+    __tablename__ = 'related_publications'
+    __table_args__ = (
+        db.Index('ix_related_publications_publication_id_score', 'publication_id', 'score'),
+        db.Index('ix_related_publications_related_id', 'related_id'),
+    )
+
+    publication_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+    related_id = db.Column(UUID(as_uuid=True), db.ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
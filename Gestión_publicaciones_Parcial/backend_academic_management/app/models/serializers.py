@@ -0,0 +1,104 @@
+from operator import attrgetter, itemgetter
+from sqlalchemy import types as sa_types
+
+
+def _iso(value):
+    return value.isoformat()
+
+
+def _converter_for(column_type):
+    """Devuelve el conversor específico del tipo de columna (None si no requiere conversión)"""
+    if isinstance(column_type, sa_types.Uuid):
+        return str
+    if isinstance(column_type, (sa_types.DateTime, sa_types.Date, sa_types.Time)):
+        return _iso
+    if isinstance(column_type, sa_types.Numeric) and getattr(column_type, 'asdecimal', False):
+        return str
+    return None
+
+
+class ModelSerializer:
+    """Serializador precompilado de un modelo: getters y conversores calculados una sola vez"""
+
+    def __init__(self, model):
+        self.model = model
+        private = set(getattr(model, 'PRIVATE_COLUMNS', ()))
+        self.columns = tuple(
+            (column.key, _converter_for(column.type)) for column in model.__table__.columns
+            if column.key not in private
+        )
+        self._plans = {}
+        self._default_plan = self._compile(tuple(self.columns))
+
+    @staticmethod
+    def _compile(columns):
+        """Genera el plan de serialización para una lista de columnas"""
+        names = tuple(name for name, _ in columns)
+        converted = tuple((name, converter) for name, converter in columns if converter is not None)
+
+        if len(names) == 1:
+            fast_getter = itemgetter(names[0])
+            slow_getter = attrgetter(names[0])
+            return names, (lambda state: (fast_getter(state),)), (lambda instance: (slow_getter(instance),)), converted
+        if names:
+            return names, itemgetter(*names), attrgetter(*names), converted
+        return names, (lambda state: ()), (lambda instance: ()), converted
+
+    def _plan(self, fields, exclude):
+        """Obtiene (y memoriza) el plan para una combinación de campos incluidos/excluidos"""
+        key = (frozenset(fields) if fields is not None else None, frozenset(exclude or ()))
+        plan = self._plans.get(key)
+        if plan is None:
+            columns = tuple(
+                (name, converter) for name, converter in self.columns
+                if (fields is None or name in fields) and name not in key[1]
+            )
+            plan = self._plans[key] = self._compile(columns)
+        return plan
+
+    @staticmethod
+    def _apply(plan, instance):
+        names, fast_getter, slow_getter, converted = plan
+        try:
+            # Atributos ya cargados: se leen directamente del estado de la instancia
+            values = fast_getter(instance.__dict__)
+        except KeyError:
+            # Algún atributo expirado o diferido: se delega en SQLAlchemy para cargarlo
+            values = slow_getter(instance)
+
+        data = dict(zip(names, values))
+        for name, converter in converted:
+            value = data[name]
+            if value is not None:
+                data[name] = converter(value)
+        return data
+
+    def serialize(self, instance, fields=None, exclude=None):
+        """Convierte una instancia en diccionario"""
+        if fields is None and not exclude:
+            return self._apply(self._default_plan, instance)
+        return self._apply(self._plan(fields, exclude), instance)
+
+    def serialize_many(self, instances, fields=None, exclude=None):
+        """Convierte una lista de instancias reutilizando el mismo plan"""
+        plan = self._default_plan if fields is None and not exclude else self._plan(fields, exclude)
+        apply = self._apply
+        return [apply(plan, instance) for instance in instances]
+
+
+_serializers = {}
+
+
+def get_serializer(model):
+    """Obtiene el serializador del modelo, generándolo la primera vez"""
+    serializer = _serializers.get(model)
+    if serializer is None:
+        serializer = _serializers[model] = ModelSerializer(model)
+    return serializer
+
+
+def build_serializers(base_model):
+    """Genera al arranque los serializadores de todos los modelos mapeados"""
+    for mapper in base_model.registry.mappers:
+        if hasattr(mapper.class_, '__table__'):
+            get_serializer(mapper.class_)
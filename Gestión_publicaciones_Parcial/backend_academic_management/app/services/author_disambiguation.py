@@ -0,0 +1,305 @@
+import itertools
+import time
+from datetime import datetime
+from operator import attrgetter
+from flask import current_app
+from app.extensions import db
+from app.models import Author, AuthorMatchCandidate, Coauthorship, PublicationAuthor
+from app.services.bulk import insert_ignore
+from app.services.maintenance import chunks
+from app.services.normalization import normalize_name
+
+# Peso de cada señal; la puntuación de un par se limita a 1
+ORCID_WEIGHT = 1.0
+EMAIL_WEIGHT = 0.6
+EMAIL_DOMAIN_WEIGHT = 0.1
+INSTITUTION_WEIGHT = 0.25
+GIVEN_NAME_WEIGHT = 0.15
+SHARED_COAUTHOR_WEIGHT = 0.25
+MAX_COAUTHOR_SCORE = 0.5
+
+# Los bloques mayores se dividen por nombre de pila completo: compararlos enteros es cuadrático
+MAX_BLOCK_SIZE = 500
+
+# Máximo de valores por lista IN
+LOOKUP_CHUNK = 5000
+
+_COLUMNS = (
+    Author.id, Author.first_name, Author.last_name, Author.email,
+    Author.institution, Author.orcid_id, Author.block_key
+)
+
+
+def _pair(first_id, second_id):
+    """Orden canónico de un par para la clave primaria de author_match_candidates"""
+    return (first_id, second_id) if str(first_id) < str(second_id) else (second_id, first_id)
+
+
+class _Profile:
+    """Datos normalizados de un autor que se usan para puntuar"""
+    __slots__ = ('id', 'given', 'email', 'domain', 'institution', 'orcid')
+
+    def __init__(self, row):
+        self.id = row.id
+        self.given = (normalize_name(row.first_name) or '').split()
+        self.email = row.email.strip().lower() if row.email else None
+        self.domain = self.email.rpartition('@')[2] if self.email and '@' in self.email else None
+        self.institution = normalize_name(row.institution)
+        self.orcid = row.orcid_id.strip().upper() if row.orcid_id else None
+
+
+def given_names_match(first, second):
+    """(compatibles, coincide el nombre completo) de dos nombres de pila ya separados en palabras.
+
+    Una inicial es compatible con cualquier nombre que empiece por ella ("j" y "juan");
+    dos nombres completos distintos no lo son ("juan" y "jose").
+    """
+    for mine, theirs in zip(first, second):
+        if mine == theirs:
+            continue
+        if (len(mine) == 1 or len(theirs) == 1) and mine[0] == theirs[0]:
+            continue
+        return False, False
+    return True, bool(first and second and first[0] == second[0] and len(first[0]) > 1)
+
+
+def score_pair(first, second, coauthors):
+    """Puntuación y señales de que dos perfiles son la misma persona, o None si hay evidencia en contra"""
+    if first.orcid and second.orcid and first.orcid != second.orcid:
+        return None
+    # Dos autores que firman la misma publicación son personas distintas
+    if second.id in coauthors.get(first.id, ()):
+        return None
+    compatible, full_name = given_names_match(first.given, second.given)
+    if not compatible:
+        return None
+
+    score, evidence = 0.0, []
+    if first.orcid and first.orcid == second.orcid:
+        score += ORCID_WEIGHT
+        evidence.append('orcid')
+    if first.email and first.email == second.email:
+        score += EMAIL_WEIGHT
+        evidence.append('email')
+    elif first.domain and first.domain == second.domain:
+        score += EMAIL_DOMAIN_WEIGHT
+        evidence.append('email_domain')
+    if first.institution and first.institution == second.institution:
+        score += INSTITUTION_WEIGHT
+        evidence.append('institution')
+    if full_name:
+        score += GIVEN_NAME_WEIGHT
+        evidence.append('given_name')
+    shared = len(coauthors.get(first.id, set()) & coauthors.get(second.id, set()))
+    if shared:
+        score += min(MAX_COAUTHOR_SCORE, shared * SHARED_COAUTHOR_WEIGHT)
+        evidence.append(f'coauthors:{shared}')
+    return min(score, 1.0), evidence
+
+
+class AuthorDisambiguationService:
+    """Detección de autores duplicados por bloques (apellido normalizado + inicial) y su fusión.
+
+    Solo se comparan autores del mismo bloque, que se recorren en el orden del
+    índice (block_key, id) por lotes: la memoria depende del tamaño del lote, no
+    del número de autores. Cada par se puntúa con email, institución, nombre de
+    pila, coautores en común y ORCID.
+    """
+
+    @staticmethod
+    def _threshold():
+        return current_app.config['AUTHOR_MATCH_THRESHOLD']
+
+    @staticmethod
+    def _coauthors(author_ids):
+        """Coautores de cada autor {id: {coautor}} leídos de la tabla de adyacencia"""
+        coauthors = {}
+        for chunk in chunks(author_ids, LOOKUP_CHUNK):
+            rows = db.session.execute(
+                db.select(Coauthorship.author_id, Coauthorship.coauthor_id).where(Coauthorship.author_id.in_(chunk))
+            )
+            for author_id, coauthor_id in rows:
+                coauthors.setdefault(author_id, set()).add(coauthor_id)
+        return coauthors
+
+    @staticmethod
+    def _split(block):
+        """Bloques comparables: los demasiado grandes se dividen por nombre de pila; devuelve (bloques, descartados)"""
+        if len(block) <= MAX_BLOCK_SIZE:
+            return [block], 0
+        groups, skipped = [], 0
+        by_given = sorted(block, key=lambda profile: profile.given[:1])
+        for _, group in itertools.groupby(by_given, key=lambda profile: profile.given[:1]):
+            group = list(group)
+            if len(group) > MAX_BLOCK_SIZE:
+                skipped += len(group)
+            elif len(group) > 1:
+                groups.append(group)
+        return groups, skipped
+
+    @classmethod
+    def _score_blocks(cls, blocks, min_score):
+        """Pares por encima del umbral dentro de cada bloque: ([filas de candidato], comparaciones, descartados)"""
+        comparable, skipped = [], 0
+        for block in blocks:
+            groups, dropped = cls._split([_Profile(row) for row in block])
+            comparable.extend(groups)
+            skipped += dropped
+        coauthors = cls._coauthors(profile.id for group in comparable for profile in group)
+
+        rows, comparisons = [], 0
+        now = datetime.utcnow()
+        for group in comparable:
+            for first, second in itertools.combinations(group, 2):
+                comparisons += 1
+                result = score_pair(first, second, coauthors)
+                if result is None or result[0] < min_score:
+                    continue
+                author_id, duplicate_id = _pair(first.id, second.id)
+                rows.append({
+                    'author_id': author_id, 'duplicate_id': duplicate_id, 'score': result[0],
+                    'evidence': ','.join(result[1]), 'status': 'pending', 'detected_at': now
+                })
+        return rows, comparisons, skipped
+
+    @classmethod
+    def detect_all(cls, batch_size=5000, min_score=None, progress=None):
+        """Recorre los autores activos por bloques y registra como pendientes los pares probables.
+
+        Cada lote lee batch_size autores a partir de la última clave (block_key, id); el
+        último bloque del lote puede continuar en el siguiente y se completa antes de puntuarlo.
+        """
+        min_score = cls._threshold() if min_score is None else min_score
+        totals = {'batches': 0, 'authors': 0, 'comparisons': 0, 'pairs': 0, 'skipped': 0}
+        started = time.perf_counter()
+        last_key, carry = None, []
+        while True:
+            batch_started = time.perf_counter()
+            query = db.select(*_COLUMNS).where(
+                Author.is_active == True, Author.block_key.isnot(None)
+            ).order_by(Author.block_key, Author.id).limit(batch_size)
+            if last_key is not None:
+                query = query.where(db.tuple_(Author.block_key, Author.id) > last_key)
+            rows = db.session.execute(query).all()
+            if not rows and not carry:
+                break
+            exhausted = len(rows) < batch_size
+            if rows:
+                last_key = (rows[-1].block_key, rows[-1].id)
+
+            blocks = [list(group) for _, group in itertools.groupby(carry + rows, key=attrgetter('block_key'))]
+            carry = [] if exhausted or not blocks else blocks.pop()
+            blocks = [block for block in blocks if len(block) > 1]
+            if blocks:
+                candidates, comparisons, skipped = cls._score_blocks(blocks, min_score)
+                # Los pares ya revisados (descartados o fusionados) conservan su estado
+                insert_ignore(AuthorMatchCandidate, candidates, ['author_id', 'duplicate_id'])
+                db.session.commit()
+                totals['comparisons'] += comparisons
+                totals['pairs'] += len(candidates)
+                totals['skipped'] += skipped
+
+            totals['batches'] += 1
+            totals['authors'] += len(rows)
+            if progress:
+                elapsed = time.perf_counter() - batch_started
+                progress({**totals, 'batch_rate': len(rows) / elapsed if elapsed else 0.0})
+            if exhausted:
+                break
+
+        totals['elapsed'] = time.perf_counter() - started
+        totals['rate'] = totals['authors'] / totals['elapsed'] if totals['elapsed'] else 0.0
+        return totals
+
+    @classmethod
+    def candidates_for(cls, author_id, min_score=None):
+        """Posibles duplicados activos de un autor [(id, puntuación, señales)], de mayor a menor puntuación"""
+        min_score = cls._threshold() if min_score is None else min_score
+        author = db.session.execute(db.select(*_COLUMNS).where(Author.id == author_id)).first()
+        if author is None or author.block_key is None:
+            return []
+        others = db.session.execute(
+            db.select(*_COLUMNS).where(
+                Author.block_key == author.block_key, Author.id != author_id, Author.is_active == True
+            ).order_by(Author.id).limit(MAX_BLOCK_SIZE)
+        ).all()
+        profile, profiles = _Profile(author), [_Profile(row) for row in others]
+        coauthors = cls._coauthors([author_id] + [other.id for other in profiles])
+
+        matches = []
+        for other in profiles:
+            result = score_pair(profile, other, coauthors)
+            if result is not None and result[0] >= min_score:
+                matches.append((other.id, *result))
+        return sorted(matches, key=lambda match: -match[1])
+
+    @staticmethod
+    def _merge_links(source, target):
+        """Traslada las autorías de source a target; si ambos firman una publicación queda un solo vínculo"""
+        moved = 0
+        target_links = {link.publication_id: link for link in PublicationAuthor.query.filter_by(author_id=target.id)}
+        for link in PublicationAuthor.query.filter_by(author_id=source.id, is_active=True):
+            existing = target_links.get(link.publication_id)
+            if existing is None:
+                link.author_id = target.id
+            else:
+                if existing.is_active:
+                    existing.author_order = min(existing.author_order, link.author_order)
+                    existing.is_corresponding = bool(existing.is_corresponding or link.is_corresponding)
+                else:
+                    existing.is_active = True
+                    existing.author_order = link.author_order
+                    existing.is_corresponding = link.is_corresponding
+                link.is_active = False
+            moved += 1
+        return moved
+
+    @classmethod
+    def merge(cls, source_id, target_id):
+        """Fusiona el autor source en target en la transacción actual (sin confirmarla).
+
+        Bloquea ambos autores (en orden de id, para evitar interbloqueos), consolida sus
+        autorías y completa los datos vacíos de target. Los eventos de sesión mantienen
+        coautorías, estadísticas y caché.
+        """
+        if source_id == target_id:
+            raise ValueError('Un autor no puede fusionarse consigo mismo')
+        locked = {
+            author_id: Author.query.filter_by(id=author_id, is_active=True).with_for_update().first_or_404()
+            for author_id in sorted((source_id, target_id), key=str)
+        }
+        source, target = locked[source_id], locked[target_id]
+        if source.orcid_id and target.orcid_id and source.orcid_id != target.orcid_id:
+            raise ValueError('Los autores tienen ORCID distintos: no son la misma persona')
+
+        changes = {'publications': cls._merge_links(source, target), 'fields': []}
+        for field in ('orcid_id', 'email', 'institution'):
+            value = getattr(source, field)
+            if value is not None and getattr(target, field) is None:
+                if field != 'institution':
+                    # Se libera el valor único antes de asignarlo a target
+                    setattr(source, field, None)
+                    db.session.flush()
+                setattr(target, field, value)
+                changes['fields'].append(field)
+
+        # Se conserva el nombre de pila más completo ("Juan" en lugar de "J.")
+        source_given = (normalize_name(source.first_name) or '').split()
+        target_given = (normalize_name(target.first_name) or '').split()
+        if len(''.join(source_given)) > len(''.join(target_given)) and given_names_match(source_given, target_given)[0]:
+            target.first_name = source.first_name
+            changes['fields'].append('first_name')
+
+        now = datetime.utcnow()
+        source.is_active = False
+        source.merged_into_id = target.id
+        source.updated_at = target.updated_at = now
+
+        author_id, duplicate_id = _pair(source.id, target.id)
+        candidate = db.session.get(AuthorMatchCandidate, (author_id, duplicate_id))
+        if candidate is None:
+            candidate = AuthorMatchCandidate(author_id=author_id, duplicate_id=duplicate_id, score=0.0, evidence='manual')
+            db.session.add(candidate)
+        candidate.status = 'merged'
+        db.session.flush()
+        return changes
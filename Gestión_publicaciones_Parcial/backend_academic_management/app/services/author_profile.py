@@ -0,0 +1,114 @@
+from sqlalchemy.orm import aliased, load_only
+from app.extensions import db
+from app.models import Author, Publication, PublicationAuthor
+from app.services.fieldsets import column_options
+
+
+class AuthorProfileService:
+    """Perfil de un autor: publicaciones paginadas y métricas agregadas en la base de datos"""
+
+    @staticmethod
+    def _authored(author_id):
+        """Condiciones de las publicaciones activas firmadas por el autor"""
+        return (
+            PublicationAuthor.author_id == author_id,
+            PublicationAuthor.is_active == True,
+            Publication.is_active == True
+        )
+
+    @classmethod
+    def publications_page(cls, author_id, page, per_page, sort_by, sort_dir, fields=None):
+        """Una página de publicaciones del autor con un único JOIN (más el COUNT de la paginación)"""
+        query = db.session.query(PublicationAuthor, Publication).join(
+            Publication, Publication.id == PublicationAuthor.publication_id
+        ).filter(*cls._authored(author_id)).options(
+            load_only(PublicationAuthor.is_corresponding, PublicationAuthor.author_order),
+            *column_options(Publication, fields)
+        )
+        paginated = Publication.apply_sort(query, sort_by, sort_dir).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+
+        data = []
+        for pub_author, publication in paginated.items:
+            publication_data = publication.to_dict(fields=fields)
+            publication_data['is_corresponding'] = pub_author.is_corresponding
+            publication_data['author_order'] = pub_author.author_order
+            data.append(publication_data)
+
+        return {
+            'data': data,
+            'total': paginated.total,
+            'pages': paginated.pages,
+            'current_page': page
+        }
+
+    @classmethod
+    def metrics(cls, author_id, top_coauthors=10):
+        """Total de publicaciones y citas, índice h, publicaciones por año y coautores principales"""
+        citations = db.func.coalesce(Publication.citation_count, 0)
+
+        # Índice h: mayor posición r (por citas descendentes) con al menos r citas
+        ranked = db.select(
+            citations.label('citations'),
+            db.func.row_number().over(order_by=citations.desc()).label('position')
+        ).select_from(PublicationAuthor).join(
+            Publication, Publication.id == PublicationAuthor.publication_id
+        ).where(*cls._authored(author_id)).subquery()
+
+        totals = db.session.execute(db.select(
+            db.func.count(),
+            db.func.coalesce(db.func.sum(ranked.c.citations), 0),
+            db.func.count().filter(ranked.c.citations >= ranked.c.position)
+        ).select_from(ranked)).one()
+
+        year = db.func.coalesce(Publication.year, db.extract('year', Publication.publication_date)).label('year')
+        by_year = db.session.execute(
+            db.select(year, db.func.count(), db.func.sum(citations))
+            .select_from(PublicationAuthor)
+            .join(Publication, Publication.id == PublicationAuthor.publication_id)
+            .where(*cls._authored(author_id))
+            .group_by(year)
+            .order_by(year)
+        ).all()
+
+        coauthor_link = aliased(PublicationAuthor)
+        shared = db.func.count(db.distinct(PublicationAuthor.publication_id)).label('shared')
+        coauthors = db.session.execute(
+            db.select(Author.id, Author.first_name, Author.last_name, shared)
+            .select_from(PublicationAuthor)
+            .join(Publication, Publication.id == PublicationAuthor.publication_id)
+            .join(coauthor_link, db.and_(
+                coauthor_link.publication_id == PublicationAuthor.publication_id,
+                coauthor_link.author_id != author_id,
+                coauthor_link.is_active == True
+            ))
+            .join(Author, db.and_(Author.id == coauthor_link.author_id, Author.is_active == True))
+            .where(*cls._authored(author_id))
+            .group_by(Author.id, Author.first_name, Author.last_name)
+            .order_by(shared.desc(), Author.last_name, Author.id)
+            .limit(top_coauthors)
+        ).all()
+
+        return {
+            'publication_count': totals[0],
+            'total_citations': int(totals[1]),
+            'h_index': totals[2],
+            'by_year': [
+                {
+                    'year': int(row[0]) if row[0] is not None else None,
+                    'publications': row[1],
+                    'citations': int(row[2] or 0)
+                }
+                for row in by_year
+            ],
+            'top_coauthors': [
+                {
+                    'id': str(row.id),
+                    'first_name': row.first_name,
+                    'last_name': row.last_name,
+                    'shared_publications': row.shared
+                }
+                for row in coauthors
+            ]
+        }
@@ -0,0 +1,22 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+
+
+def dialect_insert(model):
+    """INSERT del dialecto activo, con soporte de ON CONFLICT (PostgreSQL en producción, SQLite en local)"""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def insert_rows(model, rows):
+    """Inserta varias filas con un INSERT multi-fila de Core (sin la contabilidad del ORM)"""
+    if rows:
+        db.session.execute(model.__table__.insert(), rows)
+
+
+def insert_ignore(model, rows, index_elements):
+    """Inserta varias filas ignorando las que violan la restricción única indicada"""
+    if rows:
+        statement = dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+        db.session.execute(statement, rows)
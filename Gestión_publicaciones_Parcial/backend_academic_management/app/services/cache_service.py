@@ -0,0 +1,401 @@
+import functools
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from flask import current_app, has_app_context, make_response, request
+from app.extensions import db
+
+
+class TTLCache:
+    """Caché en memoria con expiración por tiempo (TTL) y tamaño máximo"""
+
+    def __init__(self, ttl=30, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts, **params):
+        """Construye una clave estable a partir de posiciones y parámetros"""
+        items = tuple(sorted((k, str(v)) for k, v in params.items() if v is not None))
+        return tuple(str(p) for p in parts) + items
+
+    def get(self, key):
+        """Obtiene un valor si existe y no ha expirado"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Guarda un valor con el TTL indicado (o el TTL por defecto)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.max_entries:
+                self._evict()
+            self._data[key] = (expires_at, value)
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        """Elimina las entradas expiradas o, si no hay, la más próxima a expirar"""
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._data.items() if expires_at < now]
+        for k in expired:
+            del self._data[k]
+
+        if not expired and self._data:
+            oldest = min(self._data, key=lambda k: self._data[k][0])
+            del self._data[oldest]
+
+
+class LRUCache:
+    """Caché LRU en la memoria del proceso, con expiración por entrada"""
+
+    name = 'lru'
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Devuelve {clave: valor} de las claves presentes y vigentes"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                if entry[0] < now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = entry[1]
+        return found
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            # Se descartan las entradas usadas hace más tiempo
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """Caché compartida por todos los workers de la máquina en un fichero SQLite (modo WAL)"""
+
+    name = 'sqlite'
+    PRUNE_EVERY = 256
+
+    def __init__(self, path, max_entries=2048):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = itertools.count(1)
+
+    def _connection(self):
+        # Una conexión por hilo y por proceso: las heredadas de un fork no se reutilizan
+        pid, conn = getattr(self._local, 'connection', (None, None))
+        if pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._local.connection = (os.getpid(), conn)
+        return conn
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        rows = self._connection().execute(
+            f'SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expires_at > ?',
+            (*keys, time.time())
+        )
+        return {key: json.loads(value) for key, value in rows}
+
+    def set(self, key, value, ttl):
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, json.dumps(value), time.time() + ttl)
+        )
+        if next(self._writes) % self.PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn):
+        """Elimina las entradas expiradas y, si sobran, las más próximas a expirar"""
+        conn.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at LIMIT ?)',
+                (excess,)
+            )
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        if keys:
+            placeholders = ','.join('?' * len(keys))
+            self._connection().execute(f'DELETE FROM cache WHERE key IN ({placeholders})', keys)
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+# Clave de Session.info con las etiquetas modificadas pendientes de confirmar
+STALE_TAGS_KEY = 'response_cache_stale_tags'
+# Por encima de estas filas una sentencia masiva invalida por tabla y no fila a fila
+MAX_ROW_TAGS = 100
+
+
+def mark_stale(*tags, session=None):
+    """Registra etiquetas cuyas respuestas en caché dejarán de ser válidas al confirmar"""
+    session = session if session is not None else db.session
+    session.info.setdefault(STALE_TAGS_KEY, set()).update(tags)
+
+
+class ResponseCache:
+    """Caché de respuestas de lectura con invalidación por etiquetas.
+
+    Cada respuesta declara las etiquetas de los datos que muestra ('journals',
+    'publications:<id>'...). Cada etiqueta tiene un token de versión guardado en la
+    propia caché que forma parte de la clave; al confirmar una escritura se borran
+    los tokens de las etiquetas afectadas y las respuestas que dependían de ellos
+    dejan de encontrarse.
+    """
+
+    TAG_TTL = 24 * 3600
+
+    def __init__(self):
+        self.backend = None
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._invalidations = 0
+
+    def init_app(self, app):
+        backend = app.config['RESPONSE_CACHE_BACKEND']
+        max_entries = app.config['RESPONSE_CACHE_MAX_ENTRIES']
+        if backend == 'lru':
+            self.backend = LRUCache(max_entries)
+        elif backend == 'sqlite':
+            self.backend = SQLiteCache(app.config['RESPONSE_CACHE_PATH'], max_entries)
+        elif backend == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f'Backend de caché no soportado: {backend}')
+
+        app.extensions['response_cache'] = self
+        _register_session_events()
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def ttl_for(self, name):
+        return current_app.config['RESPONSE_CACHE_TTLS'].get(name, current_app.config['RESPONSE_CACHE_DEFAULT_TTL'])
+
+    def _tag_versions(self, tags):
+        """Tokens de versión de las etiquetas; las que no tienen token reciben uno nuevo"""
+        keys = [f'tag:{tag}' for tag in tags]
+        versions = self.backend.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                versions[key] = uuid.uuid4().hex[:12]
+                self.backend.set(key, versions[key], self.TAG_TTL)
+        return [versions[key] for key in keys]
+
+    def response_key(self, name, view_args, tags):
+        """Clave de la respuesta: endpoint, argumentos de ruta y de consulta y versiones de sus etiquetas"""
+        raw = json.dumps([
+            name,
+            sorted((key, str(value)) for key, value in view_args.items()),
+            sorted(request.args.items(multi=True)),
+            self._tag_versions(tags)
+        ])
+        return 'response:' + hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, key):
+        return self.backend.get_many([key]).get(key)
+
+    def store(self, key, response, ttl):
+        self.backend.set(key, {
+            'body': response.get_data(as_text=True),
+            'mimetype': response.mimetype,
+            # Cabeceras de validación de las respuestas condicionales (ETag, Last-Modified)
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name in ('ETag', 'Last-Modified', 'Cache-Control')
+            }
+        }, ttl)
+
+    def invalidate(self, tags):
+        if self.enabled and tags:
+            self.backend.delete_many(f'tag:{tag}' for tag in tags)
+            with self._lock:
+                self._invalidations += len(tags)
+
+    def record(self, name, hit):
+        with self._lock:
+            counters = self._counters.setdefault(name, {'hits': 0, 'misses': 0})
+            counters['hits' if hit else 'misses'] += 1
+
+    @staticmethod
+    def _with_rate(counters):
+        total = counters['hits'] + counters['misses']
+        return {**counters, 'hit_rate': round(counters['hits'] / total, 4) if total else None}
+
+    def stats(self):
+        """Métricas de aciertos de este proceso, por endpoint y totales"""
+        with self._lock:
+            endpoints = {name: dict(counters) for name, counters in self._counters.items()}
+            invalidations = self._invalidations
+        totals = {
+            'hits': sum(c['hits'] for c in endpoints.values()),
+            'misses': sum(c['misses'] for c in endpoints.values())
+        }
+        return {
+            'backend': self.backend.name if self.enabled else 'none',
+            'pid': os.getpid(),
+            'entries': len(self.backend) if self.enabled else 0,
+            'invalidated_tags': invalidations,
+            **self._with_rate(totals),
+            'endpoints': {name: self._with_rate(counters) for name, counters in sorted(endpoints.items())}
+        }
+
+
+response_cache = ResponseCache()
+
+
+def cached(name, tags=()):
+    """Decorador de lectura: sirve la respuesta desde la caché o la genera y la guarda.
+
+    name identifica el endpoint (TTL en RESPONSE_CACHE_TTLS y métricas); tags es la
+    lista de etiquetas de las que depende o una función de los argumentos de la ruta.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            cache = current_app.extensions.get('response_cache')
+            if cache is None or not cache.enabled or request.method != 'GET':
+                return view(**view_args)
+
+            key = cache.response_key(name, view_args, tags(**view_args) if callable(tags) else tags)
+            entry = cache.get(key)
+            if entry is not None:
+                cache.record(name, hit=True)
+                response = current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+                response.headers.update(entry['headers'])
+                response.headers['X-Cache'] = 'HIT'
+                # Respeta If-None-Match / If-Modified-Since con las cabeceras guardadas
+                return response.make_conditional(request)
+
+            cache.record(name, hit=False)
+            response = make_response(view(**view_args))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.store(key, response, cache.ttl_for(name))
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def _model_for_table(table_name):
+    for mapper in db.Model.registry.mappers:
+        if getattr(mapper.class_, '__tablename__', None) == table_name:
+            return mapper.class_
+    return None
+
+
+def _statement_tags(statement, parameters):
+    """Etiquetas afectadas por un INSERT/UPDATE/DELETE ejecutado sin pasar por el flush"""
+    model = _model_for_table(statement.table.name)
+    if model is None or not hasattr(model, 'cache_tags_for'):
+        return {statement.table.name}
+
+    rows = [parameters] if isinstance(parameters, dict) else list(parameters or ())
+    if rows and all(rows) and len(rows) <= MAX_ROW_TAGS:
+        return set(itertools.chain.from_iterable(model.cache_tags_for(row) for row in rows))
+    # Filas no identificables (WHERE arbitrario o carga masiva): se invalida toda la tabla
+    return set(model.cache_tags_for({}))
+
+
+def _on_after_flush(session, flush_context):
+    for instance in itertools.chain(session.new, session.dirty, session.deleted):
+        if hasattr(instance, 'cache_tags'):
+            mark_stale(*instance.cache_tags(), session=session)
+
+
+def _on_orm_execute(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        # Quien ejecuta la sentencia puede indicar las etiquetas exactas con execution_options
+        tags = state.execution_options.get('cache_tags')
+        if tags is None:
+            tags = _statement_tags(state.statement, state.parameters)
+        mark_stale(*tags, session=state.session)
+
+
+def _on_after_commit(session):
+    tags = session.info.pop(STALE_TAGS_KEY, None)
+    if tags and has_app_context():
+        cache = current_app.extensions.get('response_cache')
+        if cache is not None:
+            cache.invalidate(tags)
+
+
+def _on_after_rollback(session):
+    session.info.pop(STALE_TAGS_KEY, None)
+
+
+_session_events_registered = False
+
+
+def _register_session_events():
+    global _session_events_registered
+    if _session_events_registered:
+        return
+    session_class = db.session.session_factory.class_
+    db.event.listen(session_class, 'after_flush', _on_after_flush)
+    db.event.listen(session_class, 'do_orm_execute', _on_orm_execute)
+    db.event.listen(session_class, 'after_commit', _on_after_commit)
+    db.event.listen(session_class, 'after_rollback', _on_after_rollback)
+    _session_events_registered = True
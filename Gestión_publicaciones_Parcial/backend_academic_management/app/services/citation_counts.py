@@ -0,0 +1,156 @@
+from collections import Counter
+from app.extensions import db
+from app.models import Publication, PublicationReference
+from app.services.cache_service import mark_stale
+
+
+def _previous(state, attribute):
+    """Valor de un atributo antes de los cambios pendientes de la instancia"""
+    history = state.attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return state.attrs[attribute].value
+
+
+class CitationCountService:
+    """Mantiene Publication.citation_count como el número de referencias activas que la citan.
+
+    Los cambios de PublicationReference se traducen en incrementos
+    (citation_count + delta), que son correctos aunque varias transacciones
+    citen a la vez la misma publicación. recompute() recalcula todo por lotes.
+    """
+
+    @staticmethod
+    def apply_deltas(deltas):
+        """Aplica {publication_id: delta} con un UPDATE por cada valor distinto de delta"""
+        by_delta = {}
+        for publication_id, delta in deltas.items():
+            if publication_id is not None and delta:
+                by_delta.setdefault(delta, []).append(publication_id)
+
+        for delta, ids in by_delta.items():
+            db.session.execute(
+                db.update(Publication)
+                .where(Publication.id.in_(ids))
+                .values(citation_count=db.func.coalesce(Publication.citation_count, 0) + delta),
+                # El UPDATE no lleva ids en los parámetros: se indican las etiquetas exactas
+                execution_options={'cache_tags': ['publications', *(f'publications:{id}' for id in ids)]}
+            )
+
+    @staticmethod
+    def _instance_deltas(session):
+        """Variación de citas por publicación que producen las referencias del flush"""
+        deltas = Counter()
+        for instance in session.new:
+            if isinstance(instance, PublicationReference) and instance.is_active is not False:
+                deltas[instance.referenced_publication_id] += 1
+
+        for instance in session.deleted:
+            if isinstance(instance, PublicationReference):
+                state = db.inspect(instance)
+                if _previous(state, 'is_active') is not False:
+                    deltas[_previous(state, 'referenced_publication_id')] -= 1
+
+        for instance in session.dirty:
+            if isinstance(instance, PublicationReference):
+                state = db.inspect(instance)
+                # Solo cuentan los cambios de is_active o de la publicación citada
+                was = (_previous(state, 'is_active') is not False, _previous(state, 'referenced_publication_id'))
+                now = (instance.is_active is not False, instance.referenced_publication_id)
+                if was != now:
+                    if was[0]:
+                        deltas[was[1]] -= 1
+                    if now[0]:
+                        deltas[now[1]] += 1
+        return deltas
+
+    @classmethod
+    def recompute(cls, batch_size=5000, commit=True):
+        """Recalcula citation_count por lotes de publicaciones con un UPDATE ... FROM por lote.
+
+        Cada lote agrupa las referencias activas (GROUP BY) de un rango de ids y solo
+        actualiza las publicaciones cuyo valor cambia. Devuelve el número de
+        publicaciones corregidas; con commit=True confirma tras cada lote.
+        """
+        updated = 0
+        last_id = None
+        while True:
+            batch = db.select(Publication.id).order_by(Publication.id).limit(batch_size)
+            if last_id is not None:
+                batch = batch.where(Publication.id > last_id)
+            batch_ids = db.session.scalars(batch).all()
+            if not batch_ids:
+                break
+            last_id = batch_ids[-1]
+
+            counts = db.select(
+                Publication.id.label('publication_id'),
+                db.func.count(PublicationReference.id).label('citations')
+            ).outerjoin(PublicationReference, db.and_(
+                PublicationReference.referenced_publication_id == Publication.id,
+                PublicationReference.is_active == True
+            )).where(Publication.id.in_(batch_ids)).group_by(Publication.id).subquery()
+
+            changed = db.session.scalars(
+                db.update(Publication)
+                .where(
+                    Publication.id == counts.c.publication_id,
+                    db.func.coalesce(Publication.citation_count, -1) != counts.c.citations
+                )
+                .values(citation_count=counts.c.citations)
+                .returning(Publication.id),
+                execution_options={'cache_tags': ()}
+            ).all()
+
+            if changed:
+                mark_stale('publications', *(f'publications:{id}' for id in changed))
+                updated += len(changed)
+            if commit:
+                db.session.commit()
+        return updated
+
+
+def _on_after_flush(session, flush_context):
+    deltas = CitationCountService._instance_deltas(session)
+    if deltas:
+        CitationCountService.apply_deltas(deltas)
+
+
+def _on_orm_execute(state):
+    """INSERT/UPDATE/DELETE masivos sobre publication_references (fuera del flush)"""
+    statement = state.statement
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return None
+    if statement.table.name != PublicationReference.__tablename__:
+        return None
+    # Quien ejecuta la sentencia puede mantener los contadores por su cuenta
+    if state.execution_options.get('maintain_citation_counts') is False:
+        return None
+
+    rows = [state.parameters] if isinstance(state.parameters, dict) else list(state.parameters or ())
+    if state.is_insert and rows:
+        result = state.invoke_statement()
+        CitationCountService.apply_deltas(Counter(
+            row.get('referenced_publication_id') for row in rows if row.get('is_active', True) is not False
+        ))
+        return result
+
+    # Filas no identificables: se recalculan todos los contadores dentro de la transacción
+    result = state.invoke_statement()
+    CitationCountService.recompute(commit=False)
+    return result
+
+
+_citation_events_registered = False
+
+
+def register_citation_count_events():
+    """Mantiene citation_count al confirmar cambios en las referencias"""
+    global _citation_events_registered
+    if not _citation_events_registered:
+        session_class = db.session.session_factory.class_
+        db.event.listen(session_class, 'after_flush', _on_after_flush)
+        db.event.listen(session_class, 'do_orm_execute', _on_orm_execute)
+        _citation_events_registered = True
@@ -0,0 +1,347 @@
+import threading
+import time
+from datetime import timedelta
+from flask import current_app
+from app.extensions import db
+from app.models import Publication, PublicationReference
+from app.services.maintenance import np
+
+# Las aristas se codifican como (citante << 32) | citado en un único int64 ordenable
+_SHIFT = 32
+_MASK = (1 << _SHIFT) - 1
+
+
+class GraphUnavailable(RuntimeError):
+    """El grafo de citas no está disponible (falta numpy)"""
+
+
+def _gather(indptr, indices, nodes):
+    """Concatena las listas de adyacencia de varios nodos sin bucles en Python"""
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int32)
+    # Cada posición = inicio de su tramo + desplazamiento dentro del tramo
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return indices[offsets + np.arange(total)]
+
+
+def _top(nodes, exclude, limit):
+    """Cuenta las apariciones de cada nodo y devuelve los limit más frecuentes [(nodo, cuenta)]"""
+    nodes = nodes[nodes != exclude]
+    if not len(nodes):
+        return []
+    values, counts = np.unique(nodes, return_counts=True)
+    if len(values) > limit:
+        best = np.argpartition(-counts, limit - 1)[:limit]
+        values, counts = values[best], counts[best]
+    order = np.lexsort((values, -counts))
+    return [(int(values[i]), int(counts[i])) for i in order]
+
+
+class _Snapshot:
+    """Estado inmutable del grafo en formato CSR (salientes y entrantes) con índices int32"""
+
+    def __init__(self, codes, ids, index, version, epoch):
+        self.codes = codes
+        # ids/index son compartidos con el grafo y solo crecen: este snapshot usa los n primeros
+        self.ids = ids
+        self.index = index
+        self.n = n = len(ids)
+        self.version = version
+        # Cambia con cada reconstrucción, que renumera los nodos
+        self.epoch = epoch
+
+        self.src = (codes >> _SHIFT).astype(np.int32)
+        self.dst = (codes & _MASK).astype(np.int32)
+
+        # Los códigos están ordenados por citante: el CSR saliente sale directamente
+        self.out_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.src, minlength=n), out=self.out_indptr[1:])
+        self.out_indices = self.dst
+
+        order = np.argsort(self.dst, kind='stable')
+        self.in_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.dst, minlength=n), out=self.in_indptr[1:])
+        self.in_indices = self.src[order]
+
+    @property
+    def edges(self):
+        return len(self.codes)
+
+    def out_degree(self, node):
+        return int(self.out_indptr[node + 1] - self.out_indptr[node])
+
+    def in_degree(self, node):
+        return int(self.in_indptr[node + 1] - self.in_indptr[node])
+
+    def neighbors(self, nodes, direction):
+        if direction == 'out':
+            return _gather(self.out_indptr, self.out_indices, nodes)
+        if direction == 'in':
+            return _gather(self.in_indptr, self.in_indices, nodes)
+        return np.concatenate([
+            _gather(self.out_indptr, self.out_indices, nodes),
+            _gather(self.in_indptr, self.in_indices, nodes)
+        ])
+
+    def pagerank(self, damping=0.85, tol=1e-8, max_iter=100):
+        """PageRank por iteración de potencias; los nodos sin referencias reparten su peso entre todos"""
+        n = self.n
+        if n == 0:
+            return np.empty(0)
+        out_degree = np.diff(self.out_indptr)
+        dangling = out_degree == 0
+        inverse = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(self.dst, weights=(rank * inverse)[self.src], minlength=n)
+            updated = (1.0 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+            delta = np.abs(updated - rank).sum()
+            rank = updated
+            if delta < tol:
+                break
+        return rank
+
+
+class CitationGraph:
+    """Grafo de citas en memoria del proceso construido a partir de PublicationReference.
+
+    La primera consulta carga todas las aristas activas. Después solo se leen las
+    filas modificadas desde la última sincronización (por updated_at) y se genera un
+    nuevo snapshot; las lecturas usan siempre un snapshot completo e inmutable. Una
+    reconstrucción periódica recoge los borrados físicos.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise GraphUnavailable('El grafo de citas requiere numpy')
+        self._ids = []
+        self._index = {}
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        self._watermark = None
+        self._epoch = 0
+        self._pagerank = None
+
+    # --- Sincronización con la base de datos ---
+
+    def _node(self, publication_id):
+        node = self._index.get(publication_id)
+        if node is None:
+            node = self._index[publication_id] = len(self._ids)
+            self._ids.append(publication_id)
+        return node
+
+    def _encode(self, pairs):
+        return np.fromiter(
+            ((self._node(citing) << _SHIFT) | self._node(referenced) for citing, referenced in pairs),
+            dtype=np.int64
+        )
+
+    @staticmethod
+    def _edges():
+        """Aristas activas que apuntan a una publicación del sistema"""
+        return db.select(
+            PublicationReference.citing_publication_id, PublicationReference.referenced_publication_id
+        ).where(
+            PublicationReference.is_active == True,
+            PublicationReference.referenced_publication_id.isnot(None),
+            PublicationReference.citing_publication_id != PublicationReference.referenced_publication_id
+        )
+
+    def _publish(self, codes):
+        version = self._snapshot.version + 1 if self._snapshot is not None else 1
+        self._snapshot = _Snapshot(codes, self._ids, self._index, version, self._epoch)
+
+    def _rebuild(self):
+        # Numeración nueva: los nodos que ya no tienen citas desaparecen
+        self._ids, self._index = [], {}
+        self._epoch += 1
+        watermark = db.session.scalar(db.select(db.func.max(PublicationReference.updated_at)))
+        rows = db.session.execute(self._edges().execution_options(yield_per=50000))
+        self._publish(np.unique(self._encode(rows)))
+        self._watermark = watermark
+        self._built_at = self._synced_at = time.monotonic()
+
+    def _apply_changes(self):
+        config = current_app.config
+        if self._watermark is None:
+            changed_since = db.select(PublicationReference.updated_at)
+        else:
+            # Margen hacia atrás para las transacciones confirmadas con un updated_at anterior
+            overlap = timedelta(seconds=config['CITATION_GRAPH_SYNC_OVERLAP'])
+            changed_since = db.select(PublicationReference.updated_at).where(
+                PublicationReference.updated_at >= self._watermark - overlap
+            )
+
+        changed = db.session.execute(
+            changed_since.add_columns(
+                PublicationReference.citing_publication_id, PublicationReference.referenced_publication_id
+            ).where(PublicationReference.referenced_publication_id.isnot(None))
+        ).all()
+        self._synced_at = time.monotonic()
+        if not changed:
+            return
+
+        stamps = [row[0] for row in changed if row[0] is not None]
+        if stamps:
+            self._watermark = max(stamps)
+        pairs = {(row[1], row[2]) for row in changed}
+
+        # Estado actual de cada par modificado (puede haber varias filas por par)
+        active = set()
+        pair_list = list(pairs)
+        for start in range(0, len(pair_list), 1000):
+            chunk = pair_list[start:start + 1000]
+            active.update(db.session.execute(self._edges().where(db.tuple_(
+                PublicationReference.citing_publication_id, PublicationReference.referenced_publication_id
+            ).in_(chunk))).tuples())
+
+        codes = self._snapshot.codes
+        added = np.unique(self._encode(active))
+        removed = np.unique(self._encode(pairs - active))
+        added = added[~np.isin(added, codes, assume_unique=True)]
+        removed = removed[np.isin(removed, codes, assume_unique=True)]
+        if len(added) or len(removed) or len(self._ids) != self._snapshot.n:
+            codes = np.union1d(np.setdiff1d(codes, removed, assume_unique=True), added)
+            self._publish(codes)
+
+    def sync(self):
+        """Carga el grafo o aplica los cambios pendientes, como mucho una vez por intervalo"""
+        config = current_app.config
+        now = time.monotonic()
+        stale = self._snapshot is None or now - self._built_at > config['CITATION_GRAPH_REBUILD_INTERVAL']
+        due = now - self._synced_at > config['CITATION_GRAPH_SYNC_INTERVAL']
+        if not (stale or due):
+            return
+
+        # Si otro hilo ya sincroniza se sigue usando el snapshot actual
+        if not self._lock.acquire(blocking=self._snapshot is None):
+            return
+        try:
+            if self._snapshot is None or time.monotonic() - self._built_at > config['CITATION_GRAPH_REBUILD_INTERVAL']:
+                self._rebuild()
+            elif time.monotonic() - self._synced_at > config['CITATION_GRAPH_SYNC_INTERVAL']:
+                self._apply_changes()
+        finally:
+            self._lock.release()
+
+    # --- Consultas ---
+
+    def _resolve(self, snapshot, publication_id):
+        """Nodo de la publicación; None si existe pero no tiene citas; LookupError si no existe"""
+        node = snapshot.index.get(publication_id)
+        if node is not None and node < snapshot.n:
+            return node
+        exists = db.session.scalar(
+            db.select(Publication.id).where(Publication.id == publication_id, Publication.is_active == True)
+        )
+        if exists is None:
+            raise LookupError('Publicación no encontrada')
+        return None
+
+    def _ranks(self, snapshot):
+        """PageRank del snapshot; se reutiliza el anterior mientras no supere su TTL.
+
+        Solo entre snapshots de la misma numeración: tras una reconstrucción los
+        valores anteriores corresponderían a otras publicaciones.
+        """
+        cached = self._pagerank
+        ttl = current_app.config['CITATION_GRAPH_PAGERANK_TTL']
+        if cached is None or cached[0] != snapshot.epoch or (
+            cached[1] != snapshot.version and time.monotonic() - cached[2] > ttl
+        ):
+            ranks = snapshot.pagerank(damping=current_app.config['CITATION_GRAPH_DAMPING'])
+            cached = self._pagerank = (snapshot.epoch, snapshot.version, time.monotonic(), ranks)
+        ranks = cached[3]
+        if len(ranks) < snapshot.n:
+            ranks = np.concatenate([ranks, np.zeros(snapshot.n - len(ranks))])
+        return ranks[:snapshot.n]
+
+    def summary(self):
+        snapshot = self._snapshot
+        return {'nodes': snapshot.n, 'edges': snapshot.edges, 'version': snapshot.version}
+
+    def node(self, publication_id):
+        snapshot = self._snapshot
+        node = self._resolve(snapshot, publication_id)
+        if node is None:
+            return {'id': str(publication_id), 'in_degree': 0, 'out_degree': 0, 'pagerank': None}
+        return {
+            'id': str(publication_id),
+            'in_degree': snapshot.in_degree(node),
+            'out_degree': snapshot.out_degree(node),
+            'pagerank': float(self._ranks(snapshot)[node])
+        }
+
+    def neighborhood(self, publication_id, hops, direction, limit):
+        """Publicaciones a k saltos (BFS por capas); devuelve [(id, distancia)] y el total"""
+        snapshot = self._snapshot
+        node = self._resolve(snapshot, publication_id)
+        if node is None:
+            return [], 0
+
+        visited = np.zeros(snapshot.n, dtype=bool)
+        visited[node] = True
+        frontier = np.array([node], dtype=np.int64)
+        found, total = [], 0
+        for distance in range(1, hops + 1):
+            # Deduplicación con una máscara booleana: evita ordenar las listas de los nodos muy citados
+            reached = np.zeros(snapshot.n, dtype=bool)
+            reached[snapshot.neighbors(frontier, direction)] = True
+            reached &= ~visited
+            frontier = np.flatnonzero(reached)
+            if not len(frontier):
+                break
+            visited[frontier] = True
+            total += len(frontier)
+            room = limit - len(found)
+            found.extend((snapshot.ids[i], distance) for i in frontier[:max(room, 0)])
+        return found, total
+
+    def co_citation(self, publication_id, limit):
+        """Publicaciones citadas junto con esta: número de trabajos que citan a ambas"""
+        snapshot = self._snapshot
+        node = self._resolve(snapshot, publication_id)
+        if node is None:
+            return []
+        citing = snapshot.neighbors(np.array([node]), 'in')
+        return [(snapshot.ids[i], score) for i, score in _top(snapshot.neighbors(citing, 'out'), node, limit)]
+
+    def coupling(self, publication_id, limit):
+        """Acoplamiento bibliográfico: número de referencias compartidas con esta publicación"""
+        snapshot = self._snapshot
+        node = self._resolve(snapshot, publication_id)
+        if node is None:
+            return []
+        referenced = snapshot.neighbors(np.array([node]), 'out')
+        return [(snapshot.ids[i], score) for i, score in _top(snapshot.neighbors(referenced, 'in'), node, limit)]
+
+    def top_pagerank(self, limit):
+        snapshot = self._snapshot
+        ranks = self._ranks(snapshot)
+        if not len(ranks):
+            return []
+        best = np.argpartition(-ranks, min(limit, len(ranks)) - 1)[:limit]
+        best = best[np.argsort(-ranks[best], kind='stable')]
+        return [(snapshot.ids[i], float(ranks[i])) for i in best]
+
+
+_graph_lock = threading.Lock()
+
+
+def citation_graph():
+    """Grafo de citas de la aplicación, sincronizado con los últimos cambios"""
+    graph = current_app.extensions.get('citation_graph')
+    if graph is None:
+        with _graph_lock:
+            graph = current_app.extensions.get('citation_graph')
+            if graph is None:
+                graph = current_app.extensions['citation_graph'] = CitationGraph()
+    graph.sync()
+    return graph
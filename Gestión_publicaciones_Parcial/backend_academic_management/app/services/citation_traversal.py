@@ -0,0 +1,122 @@
+from flask import current_app
+from app.extensions import db
+from app.models import Publication, PublicationReference
+
+DIRECTIONS = ('in', 'out')
+
+
+class CitationTraversal:
+    """Subgrafo de citas alrededor de una publicación con una única CTE recursiva.
+
+    direction='in' recorre quién cita a la publicación (y quién cita a esas);
+    direction='out' recorre lo que cita. La CTE usa UNION sobre (publicación,
+    profundidad), por lo que cada nodo aparece como mucho una vez por nivel y
+    los ciclos no multiplican filas; depth acota la recursión.
+    """
+
+    @staticmethod
+    def _endpoints(direction):
+        """(columna del nodo actual, columna del siguiente nodo) según el sentido del recorrido"""
+        if direction == 'in':
+            return PublicationReference.referenced_publication_id, PublicationReference.citing_publication_id
+        return PublicationReference.citing_publication_id, PublicationReference.referenced_publication_id
+
+    @classmethod
+    def reachable(cls, publication_id, direction, depth):
+        """Subconsulta (publication_id, depth) con la distancia mínima de cada publicación alcanzable"""
+        current, following = cls._endpoints(direction)
+        reach = db.select(
+            db.literal(publication_id, type_=Publication.id.type).label('publication_id'),
+            db.literal(0).label('depth')
+        ).cte('reach', recursive=True)
+
+        step = db.select(following, reach.c.depth + 1).join(
+            reach, current == reach.c.publication_id
+        ).join(
+            Publication, Publication.id == following
+        ).where(
+            PublicationReference.is_active == True,
+            Publication.is_active == True,
+            following.isnot(None),
+            reach.c.depth < depth
+        )
+        reach = reach.union(step)
+
+        return db.select(
+            reach.c.publication_id, db.func.min(reach.c.depth).label('depth')
+        ).group_by(reach.c.publication_id).subquery()
+
+    @classmethod
+    def iter_subgraph(cls, publication_id, direction, depth, limit, batch_size=None):
+        """Genera ('node', fila), ('edge', fila) y por último ('summary', datos) sin materializar el resultado"""
+        batch_size = batch_size or current_app.config['EXPORT_BATCH_SIZE']
+        reachable = cls.reachable(publication_id, direction, depth)
+        nodes = db.select(
+            Publication.id, Publication.title, Publication.year, Publication.doi,
+            Publication.citation_count, reachable.c.depth
+        ).join(
+            reachable, reachable.c.publication_id == Publication.id
+        ).where(
+            Publication.is_active == True
+        ).order_by(reachable.c.depth, Publication.id).limit(limit + 1)
+
+        node_ids, truncated = [], False
+        result = db.session.execute(nodes.execution_options(yield_per=batch_size))
+        try:
+            for row in result:
+                # La fila limit + 1 solo indica que el subgrafo se ha recortado
+                if len(node_ids) == limit:
+                    truncated = True
+                    break
+                node_ids.append(row.id)
+                yield 'node', row
+        finally:
+            result.close()
+
+        # Aristas entre los nodos devueltos (el subgrafo inducido), en una sola consulta
+        edge_count = 0
+        if node_ids:
+            edges = db.select(
+                PublicationReference.citing_publication_id, PublicationReference.referenced_publication_id
+            ).where(
+                PublicationReference.is_active == True,
+                PublicationReference.citing_publication_id.in_(node_ids),
+                PublicationReference.referenced_publication_id.in_(node_ids),
+                PublicationReference.citing_publication_id != PublicationReference.referenced_publication_id
+            ).distinct()
+            for row in db.session.execute(edges.execution_options(yield_per=batch_size)):
+                edge_count += 1
+                yield 'edge', row
+
+        yield 'summary', {'node_count': len(node_ids), 'edge_count': edge_count, 'truncated': truncated}
+
+    @classmethod
+    def stream_json(cls, publication_id, direction, depth, limit):
+        """Documento JSON {root, ..., nodes, edges, node_count, edge_count, truncated} generado por fragmentos"""
+        dumps = current_app.json.dumps
+        header = dumps({'root': publication_id, 'direction': direction, 'depth': depth}).rstrip()[:-1]
+        yield header + ',"nodes":['
+
+        section, first = 'nodes', True
+        for kind, row in cls.iter_subgraph(publication_id, direction, depth, limit):
+            if kind != 'node' and section == 'nodes':
+                yield '],"edges":['
+                section, first = 'edges', True
+
+            if kind == 'summary':
+                yield '],' + dumps(row).lstrip()[1:]
+                return
+
+            if kind == 'node':
+                item = {
+                    'id': row.id,
+                    'title': row.title,
+                    'year': row.year,
+                    'doi': row.doi,
+                    'citation_count': row.citation_count,
+                    'depth': row.depth
+                }
+            else:
+                item = {'source': row.citing_publication_id, 'target': row.referenced_publication_id}
+            yield dumps(item) if first else ',' + dumps(item)
+            first = False
@@ -0,0 +1,245 @@
+import itertools
+import uuid
+from datetime import datetime
+from sqlalchemy.orm import aliased
+from app.extensions import db
+from app.models import Author, AuthorCommunity, Coauthorship, Publication, PublicationAuthor
+from app.services.bulk import insert_rows
+from app.services.citation_graph import GraphUnavailable
+from app.services.maintenance import (
+    ALL, affected, changed, chunks, np, register_maintainer, statement_tags
+)
+
+# Por encima de estos autores afectados se recalcula la tabla completa con una sola sentencia
+MAX_INCREMENTAL_AUTHORS = 1000
+
+# Tamaño máximo de las listas IN al expandir la búsqueda en anchura
+FRONTIER_CHUNK = 5000
+
+
+def _pairs():
+    """Pares (autor, coautor, publicaciones en común) de las publicaciones activas, en ambos sentidos"""
+    link, other = aliased(PublicationAuthor), aliased(PublicationAuthor)
+    query = db.select(
+        link.author_id,
+        other.author_id.label('coauthor_id'),
+        db.func.count(db.distinct(link.publication_id)),
+        db.func.current_timestamp()
+    ).join(other, db.and_(
+        other.publication_id == link.publication_id,
+        other.author_id != link.author_id,
+        other.is_active == True
+    )).join(Publication, db.and_(
+        Publication.id == link.publication_id,
+        Publication.is_active == True
+    )).where(link.is_active == True).group_by(link.author_id, other.author_id)
+    return query, link, other
+
+
+class CoauthorshipService:
+    """Grafo de coautoría: tabla de adyacencia, coautores principales, caminos y comunidades"""
+
+    @staticmethod
+    def refresh(author_ids=ALL):
+        """Recalcula las aristas de los autores indicados (o de todos) con DELETE + INSERT ... SELECT"""
+        query, link, other = _pairs()
+        delete = db.delete(Coauthorship)
+
+        if author_ids is not ALL:
+            if not author_ids:
+                return
+            author_ids = list(author_ids)
+            # Cada arista que toca a un autor afectado se guarda en ambos sentidos
+            query = query.where(db.or_(link.author_id.in_(author_ids), other.author_id.in_(author_ids)))
+            delete = delete.where(db.or_(
+                Coauthorship.author_id.in_(author_ids), Coauthorship.coauthor_id.in_(author_ids)
+            ))
+
+        options = {'cache_tags': ()}
+        db.session.execute(delete, execution_options=options)
+        db.session.execute(
+            db.insert(Coauthorship).from_select(['author_id', 'coauthor_id', 'weight', 'refreshed_at'], query),
+            execution_options=options
+        )
+
+    @classmethod
+    def refresh_affected(cls, tags):
+        """Recalcula los autores de los vínculos y publicaciones modificados en la transacción"""
+        entities = affected(tags, ('publications', 'authors'))
+        publications, authors = entities['publications'], entities['authors']
+        if publications is ALL or authors is ALL:
+            return cls.refresh()
+
+        if publications:
+            # Todos los autores vinculados (activos o no): su conjunto de coautores puede haber cambiado
+            authors.update(db.session.scalars(
+                db.select(PublicationAuthor.author_id).where(PublicationAuthor.publication_id.in_(list(publications)))
+            ))
+        if len(authors) > MAX_INCREMENTAL_AUTHORS:
+            return cls.refresh()
+        cls.refresh(authors)
+
+    @staticmethod
+    def top_collaborators(author_id, limit=20):
+        """Coautores activos ordenados por publicaciones en común (lectura por el índice del autor)"""
+        rows = db.session.execute(
+            db.select(Author.id, Author.first_name, Author.last_name, Coauthorship.weight)
+            .join(Author, Author.id == Coauthorship.coauthor_id)
+            .where(Coauthorship.author_id == author_id, Author.is_active == True)
+            .order_by(Coauthorship.weight.desc(), Author.id)
+            .limit(limit)
+        ).all()
+        return [
+            {'id': str(row.id), 'first_name': row.first_name, 'last_name': row.last_name, 'shared_publications': row.weight}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _expand(frontier, visited, other_side):
+        """Un nivel de la búsqueda en anchura: devuelve (nueva frontera, autor donde se cruzan las dos búsquedas)"""
+        following = set()
+        for chunk in chunks(frontier, FRONTIER_CHUNK):
+            rows = db.session.execute(
+                db.select(Coauthorship.author_id, Coauthorship.coauthor_id).where(Coauthorship.author_id.in_(chunk))
+            )
+            for author_id, coauthor_id in rows:
+                if coauthor_id in visited:
+                    continue
+                visited[coauthor_id] = author_id
+                if coauthor_id in other_side:
+                    return following, coauthor_id
+                following.add(coauthor_id)
+        return following, None
+
+    @classmethod
+    def shortest_path(cls, source_id, target_id, max_depth=6):
+        """Camino de colaboración más corto entre dos autores (búsqueda en anchura bidireccional).
+
+        Cada nivel es una consulta por la clave primaria de la tabla de adyacencia y
+        siempre se expande la frontera más pequeña. Devuelve la lista de ids o None.
+        """
+        if source_id == target_id:
+            return [source_id]
+
+        forward_parents, backward_parents = {source_id: None}, {target_id: None}
+        forward, backward = {source_id}, {target_id}
+        meeting = None
+        for _ in range(max_depth):
+            if len(forward) <= len(backward):
+                forward, meeting = cls._expand(forward, forward_parents, backward_parents)
+            else:
+                backward, meeting = cls._expand(backward, backward_parents, forward_parents)
+            if meeting is not None or not forward or not backward:
+                break
+
+        if meeting is None:
+            return None
+
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = forward_parents[node]
+        path.reverse()
+        node = backward_parents[meeting]
+        while node is not None:
+            path.append(node)
+            node = backward_parents[node]
+        return path
+
+    @staticmethod
+    def detect_communities(max_iterations=50, seed=0, batch_size=5000):
+        """Detecta comunidades por propagación de etiquetas ponderada y las guarda en author_communities.
+
+        En cada iteración cada autor adopta la etiqueta con más peso entre sus coautores
+        (empates al azar); solo se actualiza una parte aleatoria de los autores para evitar
+        oscilaciones. Termina cuando la etiqueta de cada autor ya es una de las de más peso.
+        Todo el cálculo es vectorial sobre la lista de aristas ordenada.
+        """
+        if np is None:
+            raise GraphUnavailable('La detección de comunidades requiere numpy')
+
+        # Una sola lectura (coherente) con los ids como texto: no se crea un UUID por fila, solo por autor
+        rows = db.session.connection().execute(db.select(
+            db.cast(Coauthorship.author_id, db.String), db.cast(Coauthorship.coauthor_id, db.String), Coauthorship.weight
+        )).all()
+        columns = list(zip(*rows)) or [(), (), ()]
+        names, nodes = np.unique(np.array(columns[0] + columns[1], dtype=str), return_inverse=True)
+        src, dst = nodes[:len(rows)].astype(np.int64), nodes[len(rows):].astype(np.int64)
+        weights = np.array(columns[2], dtype=np.float64)
+        ids = [uuid.UUID(name) for name in names]
+
+        n = len(ids)
+        labels = np.arange(n, dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        iterations = 0
+        for iterations in range(1, max_iterations + 1):
+            if not n:
+                break
+            # Peso de cada etiqueta vecina por autor: las claves (autor, etiqueta) ordenadas se suman por tramos
+            keys = src * n + labels[dst]
+            order = np.argsort(keys)
+            keys = keys[order]
+            starts = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1]
+            scores = np.add.reduceat(weights[order], starts)
+            nodes, candidates = keys[starts] // n, keys[starts] % n
+
+            # Tramos por autor y etiquetas de peso máximo dentro de cada uno
+            groups = np.r_[0, np.flatnonzero(nodes[1:] != nodes[:-1]) + 1]
+            sizes = np.diff(np.r_[groups, len(nodes)])
+            is_best = scores == np.repeat(np.maximum.reduceat(scores, groups), sizes)
+            if np.count_nonzero(is_best & (candidates == labels[nodes])) == len(groups):
+                break
+
+            # Empates al azar: una puntuación aleatoria entre las etiquetas de peso máximo
+            noise = np.where(is_best, rng.random(len(nodes)), -1.0)
+            chosen = noise == np.repeat(np.maximum.reduceat(noise, groups), sizes)
+            best = labels.copy()
+            best[nodes[chosen]] = candidates[chosen]
+
+            update = rng.random(n) < 0.8
+            labels[update] = best[update]
+
+        # Cada etiqueta es el índice de un autor: la comunidad toma su id
+        now = datetime.utcnow()
+        records = [
+            {'author_id': ids[node], 'community_id': ids[label], 'computed_at': now}
+            for node, label in enumerate(labels.tolist())
+        ]
+
+        db.session.execute(db.delete(AuthorCommunity), execution_options={'cache_tags': ()})
+        for batch in chunks(records, batch_size):
+            insert_rows(AuthorCommunity, batch)
+
+        return {'authors': n, 'communities': len(np.unique(labels)), 'iterations': iterations}
+
+
+def _affected_tags(session):
+    tags = set()
+    for instance in itertools.chain(session.new, session.deleted):
+        if isinstance(instance, PublicationAuthor):
+            tags.update(instance.cache_tags())
+    for instance in session.dirty:
+        # Cambiar el orden o el autor de correspondencia no altera el grafo
+        if isinstance(instance, PublicationAuthor) and changed(instance, 'is_active', 'author_id', 'publication_id'):
+            tags.update(instance.cache_tags())
+        elif isinstance(instance, Publication) and changed(instance, 'is_active'):
+            # Activar o desactivar una publicación añade o quita todos sus pares de autores
+            tags.add(f'publications:{instance.id}')
+    return tags
+
+
+def _statement_tags(state):
+    """INSERT/UPDATE/DELETE por lotes de vínculos autor-publicación (fuera del flush)"""
+    if state.statement.table.name != PublicationAuthor.__tablename__:
+        return None
+    # Filas sin publication_id/author_id producen comodines y se recalcula todo
+    return statement_tags(state, PublicationAuthor)
+
+
+def register_coauthorship_events():
+    """Mantiene la tabla de coautoría en la misma transacción que los cambios de autoría"""
+    register_maintainer(
+        'coauthorships', CoauthorshipService.refresh_affected,
+        on_flush=_affected_tags, on_statement=_statement_tags
+    )
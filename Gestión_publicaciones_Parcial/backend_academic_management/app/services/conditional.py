@@ -0,0 +1,43 @@
+import hashlib
+from datetime import datetime, timezone
+from flask import current_app, make_response, request
+from werkzeug.http import is_resource_modified
+from app.extensions import db
+
+
+def max_updated_at(model, *criteria):
+    """Subconsulta escalar con el updated_at más reciente de las filas relacionadas"""
+    return db.select(db.func.max(model.updated_at)).where(*criteria).scalar_subquery()
+
+
+def count_rows(model, *criteria):
+    """Subconsulta escalar con el número de filas relacionadas (detecta vínculos eliminados)"""
+    return db.select(db.func.count(model.id)).where(*criteria).scalar_subquery()
+
+
+def conditional_get(version, build):
+    """Responde 304 Not Modified si el cliente ya tiene la versión actual del recurso.
+
+    version es la fila de marcas (updated_at y contadores) obtenida con una sola consulta;
+    build solo se invoca, y por tanto solo se serializa, cuando el recurso ha cambiado.
+    """
+    # La representación depende también de fields[...] e include=, que van en la query string
+    raw = '|'.join(str(part) for part in version) + '|' + request.query_string.decode()
+    etag = hashlib.sha1(raw.encode()).hexdigest()
+
+    stamps = [part for part in version if isinstance(part, datetime)]
+    last_modified = max(stamps).replace(microsecond=0, tzinfo=timezone.utc) if stamps else None
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # El cliente puede guardar la respuesta pero debe revalidarla en cada uso
+    response.cache_control.no_cache = True
+    return response
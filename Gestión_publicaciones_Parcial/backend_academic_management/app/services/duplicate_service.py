@@ -0,0 +1,441 @@
+import hashlib
+import itertools
+import struct
+import time
+import zlib
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models import (
+    DuplicateCandidate, Publication, PublicationAuthor, PublicationKeyword,
+    PublicationLSHBucket, PublicationReference, PublicationSignature
+)
+from app.services.bulk import insert_ignore, insert_rows
+from app.services.maintenance import changed, chunks, np, register_maintainer, statement_rows
+from app.services.normalization import normalize_title
+
+# Firma de 64 permutaciones en 16 bandas de 4 filas: un par con similitud de Jaccard
+# 0.8 comparte alguna cubeta con probabilidad > 0.999; con 0.3, menos de 0.13
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 4
+
+# Máximo de valores por lista IN en las búsquedas por cubeta
+LOOKUP_CHUNK = 5000
+
+# Una cubeta con más publicaciones procede de títulos plantilla ("Actas de ...") y no
+# discrimina: se ignora al buscar candidatos (los duplicados reales coinciden en otras bandas)
+MAX_BUCKET_SIZE = 100
+
+_PRIME = (1 << 31) - 1
+_SIGNATURE_FORMAT = f'<{NUM_PERMUTATIONS}I'
+
+# Columnas que la publicación conservada toma de la fusionada cuando no las tiene
+MERGE_FIELDS = (
+    'doi', 'external_id', 'abstract', 'publication_date', 'year', 'month', 'day', 'url', 'pdf_url',
+    'journal_id', 'conference_id', 'project_id'
+)
+UNIQUE_MERGE_FIELDS = ('doi', 'external_id')
+
+
+def _permutation(index):
+    """Parámetros (a, b) de la permutación h(x) = (a·x + b) mod p, deterministas entre procesos"""
+    digest = hashlib.blake2b(f'minhash:{index}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest[:4], 'big') % (_PRIME - 1) + 1, int.from_bytes(digest[4:], 'big') % _PRIME
+
+
+_PERMUTATIONS = [_permutation(index) for index in range(NUM_PERMUTATIONS)]
+if np is not None:
+    _A = np.array([a for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    _B = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64)[:, None]
+
+
+def shingles(title):
+    """Conjunto de fragmentos de SHINGLE_SIZE caracteres del título normalizado"""
+    normalized = normalize_title(title)
+    if not normalized:
+        return frozenset()
+    if len(normalized) <= SHINGLE_SIZE:
+        return frozenset((normalized,))
+    return frozenset(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+
+
+def minhash(shingle_set):
+    """Firma MinHash (NUM_PERMUTATIONS enteros de 32 bits en bytes) de un conjunto de fragmentos"""
+    if not shingle_set:
+        return None
+    # crc32 es estable entre procesos (hash() de Python no lo es)
+    values = [zlib.crc32(shingle.encode()) % _PRIME for shingle in shingle_set]
+    if np is not None:
+        # a, x < 2^31: a·x + b cabe en 64 bits sin desbordar
+        hashed = (_A * np.array(values, dtype=np.uint64)[None, :] + _B) % _PRIME
+        return hashed.min(axis=1).astype('<u4').tobytes()
+    return struct.pack(_SIGNATURE_FORMAT, *(min((a * x + b) % _PRIME for x in values) for a, b in _PERMUTATIONS))
+
+
+def lsh_buckets(signature):
+    """Una cubeta por banda: hash de 64 bits (con signo) del número de banda y sus filas"""
+    width = ROWS_PER_BAND * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes((band,)) + signature[band * width:(band + 1) * width], digest_size=8).digest(),
+            'big', signed=True
+        )
+        for band in range(BANDS)
+    ]
+
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def _pair(first_id, second_id):
+    """Orden canónico de un par para la clave primaria de duplicate_candidates"""
+    return (first_id, second_id) if str(first_id) < str(second_id) else (second_id, first_id)
+
+
+class DuplicateService:
+    """Detección de publicaciones casi duplicadas (MinHash + LSH sobre el título) y su fusión.
+
+    Las firmas y cubetas se guardan en la base de datos: buscar candidatos es una
+    consulta por cubeta indexada, sin comparar con todo el catálogo. Los candidatos
+    se confirman con la similitud de Jaccard exacta de los fragmentos del título.
+    """
+
+    @staticmethod
+    def _threshold():
+        return current_app.config['DUPLICATE_SIMILARITY_THRESHOLD']
+
+    @staticmethod
+    def _signatures(publication_ids):
+        """Borra las firmas y cubetas guardadas y calcula las nuevas: {id: (fragmentos, cubetas, firma)}"""
+        options = {'cache_tags': ()}
+        indexed = {}
+        for chunk in chunks(publication_ids, LOOKUP_CHUNK):
+            db.session.execute(
+                db.delete(PublicationLSHBucket).where(PublicationLSHBucket.publication_id.in_(chunk)),
+                execution_options=options
+            )
+            db.session.execute(
+                db.delete(PublicationSignature).where(PublicationSignature.publication_id.in_(chunk)),
+                execution_options=options
+            )
+            rows = db.session.execute(
+                db.select(Publication.id, Publication.title).where(Publication.id.in_(chunk), Publication.is_active == True)
+            )
+            for publication_id, title in rows:
+                shingle_set = shingles(title)
+                signature = minhash(shingle_set)
+                if signature is not None:
+                    indexed[publication_id] = (shingle_set, lsh_buckets(signature), signature)
+        return indexed
+
+    @staticmethod
+    def _store(indexed):
+        now = datetime.utcnow()
+        insert_rows(PublicationSignature, [
+            {'publication_id': publication_id, 'signature': signature, 'computed_at': now}
+            for publication_id, (_, _, signature) in indexed.items()
+        ])
+        # Dos bandas pueden coincidir en la misma cubeta: se guarda una sola fila
+        insert_rows(PublicationLSHBucket, [
+            {'bucket': bucket, 'publication_id': publication_id}
+            for publication_id, (_, buckets, _) in indexed.items() for bucket in set(buckets)
+        ])
+
+    @staticmethod
+    def _neighbours(indexed):
+        """Candidatos LSH {id: {otro id}}: coincidencias dentro del lote y una consulta por bloque de cubetas"""
+        by_bucket = {}
+        for publication_id, (_, buckets, _) in indexed.items():
+            for bucket in buckets:
+                by_bucket.setdefault(bucket, set()).add(publication_id)
+
+        stored = {}
+        for chunk in chunks([bucket for bucket, members in by_bucket.items() if len(members) <= MAX_BUCKET_SIZE],
+                             LOOKUP_CHUNK):
+            # Las cubetas demasiado pobladas se descartan en la base de datos (el recuento usa solo
+            # la clave primaria) para no leer sus filas; las publicaciones inactivas se descartan al puntuar
+            small_buckets = (
+                db.select(PublicationLSHBucket.bucket)
+                .where(PublicationLSHBucket.bucket.in_(chunk))
+                .group_by(PublicationLSHBucket.bucket)
+                .having(db.func.count() <= MAX_BUCKET_SIZE)
+            )
+            rows = db.session.execute(
+                db.select(PublicationLSHBucket.bucket, PublicationLSHBucket.publication_id)
+                .where(PublicationLSHBucket.bucket.in_(small_buckets))
+            )
+            for bucket, other_id in rows:
+                stored.setdefault(bucket, set()).add(other_id)
+
+        neighbours = {publication_id: set() for publication_id in indexed}
+        for bucket, members in by_bucket.items():
+            members = members | stored.get(bucket, set())
+            if 1 < len(members) <= MAX_BUCKET_SIZE:
+                for publication_id in by_bucket[bucket]:
+                    neighbours[publication_id].update(members)
+
+        for publication_id, candidates in neighbours.items():
+            candidates.discard(publication_id)
+        return neighbours
+
+    @classmethod
+    def _score(cls, indexed, neighbours, min_similarity):
+        """Similitud exacta de los candidatos: [(id, otro id, similitud)] por encima del umbral"""
+        others = set(itertools.chain.from_iterable(neighbours.values()))
+        details = {}
+        for chunk in chunks(others, LOOKUP_CHUNK):
+            rows = db.session.execute(
+                db.select(Publication.id, Publication.title, Publication.doi)
+                .where(Publication.id.in_(chunk), Publication.is_active == True)
+            )
+            details.update({row.id: (shingles(row.title), row.doi) for row in rows})
+        dois = {}
+        if indexed:
+            for chunk in chunks(indexed, LOOKUP_CHUNK):
+                dois.update(db.session.execute(
+                    db.select(Publication.id, Publication.doi).where(Publication.id.in_(chunk))
+                ).all())
+
+        matches = []
+        for publication_id, candidates in neighbours.items():
+            shingle_set = indexed[publication_id][0]
+            for other_id in candidates:
+                if other_id not in details:
+                    continue
+                other_shingles, other_doi = details[other_id]
+                # Dos DOIs distintos identifican publicaciones distintas aunque el título coincida
+                doi = dois.get(publication_id)
+                if doi and other_doi and doi.lower() != other_doi.lower():
+                    continue
+                similarity = jaccard(shingle_set, other_shingles)
+                if similarity >= min_similarity:
+                    matches.append((publication_id, other_id, similarity))
+        return matches
+
+    @classmethod
+    def detect(cls, publication_ids, min_similarity=None, upto=None):
+        """Indexa las publicaciones y registra como pendientes los pares casi duplicados que encuentre.
+
+        Con upto solo se emparejan publicaciones de id <= upto: al reindexar por lotes
+        los pares con las siguientes se registran al procesar esos lotes, no dos veces.
+        """
+        min_similarity = cls._threshold() if min_similarity is None else min_similarity
+        # Las cubetas del lote se consultan antes de guardarlas: la búsqueda no devuelve las propias
+        indexed = cls._signatures(list(publication_ids))
+        matches = cls._score(indexed, cls._neighbours(indexed), min_similarity)
+        cls._store(indexed)
+        if upto is not None:
+            matches = [match for match in matches if match[1] <= upto]
+
+        rows, seen = [], set()
+        now = datetime.utcnow()
+        for publication_id, other_id, similarity in matches:
+            pair = _pair(publication_id, other_id)
+            if pair not in seen:
+                seen.add(pair)
+                rows.append({
+                    'publication_id': pair[0], 'duplicate_id': pair[1], 'similarity': similarity,
+                    'status': 'pending', 'detected_at': now
+                })
+        # Los pares ya revisados (descartados o fusionados) conservan su estado
+        insert_ignore(DuplicateCandidate, rows, ['publication_id', 'duplicate_id'])
+        return len(rows)
+
+    @classmethod
+    def candidates_for(cls, publication_id, min_similarity=None):
+        """Posibles duplicados activos de una publicación [(id, similitud)], de mayor a menor similitud"""
+        min_similarity = cls._threshold() if min_similarity is None else min_similarity
+        title = db.session.scalar(db.select(Publication.title).where(Publication.id == publication_id))
+        shingle_set = shingles(title)
+        signature = minhash(shingle_set)
+        if signature is None:
+            return []
+        indexed = {publication_id: (shingle_set, lsh_buckets(signature), signature)}
+        matches = cls._score(indexed, cls._neighbours(indexed), min_similarity)
+        return sorted(((other_id, similarity) for _, other_id, similarity in matches), key=lambda item: -item[1])
+
+    @classmethod
+    def detect_all(cls, batch_size=1000, reindex=False, progress=None):
+        """Recorre por lotes las publicaciones activas (solo las no indexadas salvo reindex) y confirma tras cada lote"""
+        totals = {'batches': 0, 'processed': 0, 'pairs': 0}
+        started = time.perf_counter()
+        last_id = None
+        while True:
+            batch_started = time.perf_counter()
+            query = db.select(Publication.id).where(Publication.is_active == True).order_by(Publication.id).limit(batch_size)
+            if not reindex:
+                query = query.outerjoin(
+                    PublicationSignature, PublicationSignature.publication_id == Publication.id
+                ).where(PublicationSignature.publication_id.is_(None))
+            if last_id is not None:
+                query = query.where(Publication.id > last_id)
+            ids = db.session.scalars(query).all()
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            pairs = cls.detect(ids, upto=last_id if reindex else None)
+            db.session.commit()
+
+            elapsed = time.perf_counter() - batch_started
+            totals['batches'] += 1
+            totals['processed'] += len(ids)
+            totals['pairs'] += pairs
+            if progress:
+                progress({**totals, 'batch_rate': len(ids) / elapsed if elapsed else 0.0})
+
+        totals['elapsed'] = time.perf_counter() - started
+        totals['rate'] = totals['processed'] / totals['elapsed'] if totals['elapsed'] else 0.0
+        return totals
+
+    @staticmethod
+    def canonical(publication, max_hops=10):
+        """Sigue merged_into_id hasta la publicación que sustituye a una fusionada"""
+        for _ in range(max_hops):
+            if publication is None or publication.merged_into_id is None:
+                break
+            publication = db.session.get(Publication, publication.merged_into_id)
+        return publication
+
+    @staticmethod
+    def _merge_authors(source, target):
+        moved = 0
+        target_links = {link.author_id: link for link in PublicationAuthor.query.filter_by(publication_id=target.id)}
+        next_order = max((link.author_order or 0 for link in target_links.values() if link.is_active), default=0) + 1
+        for link in PublicationAuthor.query.filter_by(publication_id=source.id, is_active=True).order_by(PublicationAuthor.author_order):
+            existing = target_links.get(link.author_id)
+            if existing is None:
+                link.publication_id = target.id
+                link.author_order = next_order
+                next_order += 1
+                moved += 1
+            else:
+                if not existing.is_active:
+                    existing.is_active = True
+                    moved += 1
+                link.is_active = False
+        return moved
+
+    @staticmethod
+    def _merge_keywords(source, target):
+        moved = 0
+        target_links = {link.keyword_id: link for link in PublicationKeyword.query.filter_by(publication_id=target.id)}
+        for link in PublicationKeyword.query.filter_by(publication_id=source.id, is_active=True):
+            existing = target_links.get(link.keyword_id)
+            if existing is None:
+                link.publication_id = target.id
+                moved += 1
+            else:
+                # (publication_id, keyword_id) es único: se reutiliza el vínculo de la conservada
+                if not existing.is_active:
+                    existing.is_active = True
+                    moved += 1
+                link.is_active = False
+        return moved
+
+    @staticmethod
+    def _merge_references(source, target):
+        moved = {'references': 0, 'citations': 0}
+        cited_by_target = set(db.session.scalars(
+            db.select(PublicationReference.referenced_publication_id)
+            .where(PublicationReference.citing_publication_id == target.id, PublicationReference.is_active == True)
+        ))
+        for reference in PublicationReference.query.filter_by(citing_publication_id=source.id, is_active=True):
+            referenced_id = reference.referenced_publication_id
+            if referenced_id == target.id or (referenced_id is not None and referenced_id in cited_by_target):
+                reference.is_active = False
+            else:
+                reference.citing_publication_id = target.id
+                cited_by_target.add(referenced_id)
+                moved['references'] += 1
+
+        citing_target = set(db.session.scalars(
+            db.select(PublicationReference.citing_publication_id)
+            .where(PublicationReference.referenced_publication_id == target.id, PublicationReference.is_active == True)
+        ))
+        for reference in PublicationReference.query.filter_by(referenced_publication_id=source.id, is_active=True):
+            if reference.citing_publication_id == target.id or reference.citing_publication_id in citing_target:
+                reference.is_active = False
+            else:
+                # citation_count se ajusta con los eventos de la sesión (-1 fusionada, +1 conservada)
+                reference.referenced_publication_id = target.id
+                citing_target.add(reference.citing_publication_id)
+                moved['citations'] += 1
+        return moved
+
+    @classmethod
+    def merge(cls, source_id, target_id):
+        """Fusiona source en target: traslada autores, keywords y referencias y desactiva source.
+
+        Los cambios se hacen sobre instancias del ORM para que los eventos de sesión
+        mantengan citation_count, estadísticas, coautorías y caché. No confirma la transacción.
+        """
+        if source_id == target_id:
+            raise ValueError('Una publicación no puede fusionarse consigo misma')
+        source = Publication.get_by_id(source_id)
+        target = Publication.get_by_id(target_id)
+
+        changes = {
+            'authors': cls._merge_authors(source, target),
+            'keywords': cls._merge_keywords(source, target),
+            **cls._merge_references(source, target),
+            'fields': []
+        }
+
+        for field in MERGE_FIELDS:
+            value = getattr(source, field)
+            if value is not None and getattr(target, field) is None:
+                if field in UNIQUE_MERGE_FIELDS:
+                    # Se libera el valor único antes de asignarlo a la conservada
+                    setattr(source, field, None)
+                    db.session.flush()
+                setattr(target, field, value)
+                changes['fields'].append(field)
+
+        now = datetime.utcnow()
+        source.is_active = False
+        source.merged_into_id = target.id
+        source.updated_at = target.updated_at = now
+
+        first_id, second_id = _pair(source.id, target.id)
+        candidate = db.session.get(DuplicateCandidate, (first_id, second_id))
+        if candidate is None:
+            candidate = DuplicateCandidate(
+                publication_id=first_id, duplicate_id=second_id,
+                similarity=jaccard(shingles(source.title), shingles(target.title))
+            )
+            db.session.add(candidate)
+        candidate.status = 'merged'
+        db.session.flush()
+        return changes
+
+
+def _pending_publications(session):
+    pending = set()
+    for instance in session.new:
+        if isinstance(instance, Publication):
+            pending.add(instance.id)
+    for instance in session.dirty:
+        if isinstance(instance, Publication) and changed(instance, 'title'):
+            pending.add(instance.id)
+    return pending
+
+
+def _inserted_publications(state):
+    """Publicaciones insertadas por lotes (importación) fuera del flush"""
+    if not state.is_insert or state.statement.table.name != Publication.__tablename__:
+        return None
+    return {row['id'] for row in statement_rows(state) if row.get('id') is not None}
+
+
+def register_duplicate_events():
+    """Busca duplicados de las publicaciones creadas o renombradas antes de confirmar la transacción"""
+    register_maintainer(
+        'duplicates', DuplicateService.detect,
+        on_flush=_pending_publications, on_statement=_inserted_publications
+    )
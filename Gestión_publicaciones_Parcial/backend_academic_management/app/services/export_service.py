@@ -0,0 +1,228 @@
+import csv
+import io
+import re
+import unicodedata
+import zlib
+from flask import current_app
+from app.extensions import db
+from app.models import Publication, PublicationAuthor, PublicationKeyword, Author, Keyword, Journal, PublicationType
+
+
+class ExportService:
+    """Exportación masiva de publicaciones en streaming (NDJSON, CSV, BibTeX, RIS)"""
+
+    FORMATS = {
+        'ndjson': ('application/x-ndjson', 'ndjson'),
+        'csv': ('text/csv', 'csv'),
+        'bibtex': ('application/x-bibtex', 'bib'),
+        'ris': ('application/x-research-info-systems', 'ris'),
+    }
+
+    CSV_COLUMNS = [
+        'id', 'title', 'authors', 'year', 'publication_date', 'publication_type',
+        'journal', 'doi', 'url', 'keywords', 'citation_count', 'abstract'
+    ]
+
+    @classmethod
+    def iter_batches(cls, query, batch_size):
+        """Recorre las publicaciones con un cursor del lado del servidor, lote a lote"""
+        statement = query.order_by(None).with_entities(
+            Publication.id,
+            Publication.title,
+            Publication.abstract,
+            Publication.doi,
+            Publication.url,
+            Publication.publication_date,
+            Publication.year,
+            Publication.citation_count,
+            PublicationType.name.label('publication_type'),
+            Journal.name.label('journal')
+        ).join(
+            PublicationType, PublicationType.id == Publication.publication_type_id
+        ).outerjoin(
+            Journal, Journal.id == Publication.journal_id
+        ).statement
+
+        # yield_per activa stream_results: las filas no se cargan todas en memoria
+        # ni pasan por el identity map de la sesión
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+
+        for rows in result.partitions():
+            publication_ids = [row.id for row in rows]
+            authors = cls._load_authors(publication_ids)
+            keywords = cls._load_keywords(publication_ids)
+
+            yield [
+                {
+                    'id': str(row.id),
+                    'title': row.title,
+                    'abstract': row.abstract,
+                    'doi': row.doi,
+                    'url': row.url,
+                    'publication_date': row.publication_date.isoformat() if row.publication_date else None,
+                    'year': row.year or (row.publication_date.year if row.publication_date else None),
+                    'citation_count': row.citation_count or 0,
+                    'publication_type': row.publication_type,
+                    'journal': row.journal,
+                    'authors': authors.get(row.id, []),
+                    'keywords': keywords.get(row.id, [])
+                }
+                for row in rows
+            ]
+
+    @staticmethod
+    def _load_authors(publication_ids):
+        """Autores de un lote de publicaciones, en orden de autoría"""
+        rows = db.session.execute(
+            db.select(
+                PublicationAuthor.publication_id,
+                Author.first_name,
+                Author.last_name,
+                Author.orcid_id
+            ).join(
+                Author, Author.id == PublicationAuthor.author_id
+            ).where(
+                PublicationAuthor.publication_id.in_(publication_ids),
+                PublicationAuthor.is_active == True
+            ).order_by(PublicationAuthor.publication_id, PublicationAuthor.author_order)
+        )
+
+        authors = {}
+        for row in rows:
+            authors.setdefault(row.publication_id, []).append({
+                'first_name': row.first_name,
+                'last_name': row.last_name,
+                'orcid_id': row.orcid_id
+            })
+        return authors
+
+    @staticmethod
+    def _load_keywords(publication_ids):
+        """Keywords de un lote de publicaciones"""
+        rows = db.session.execute(
+            db.select(PublicationKeyword.publication_id, Keyword.name).join(
+                Keyword, Keyword.id == PublicationKeyword.keyword_id
+            ).where(
+                PublicationKeyword.publication_id.in_(publication_ids),
+                PublicationKeyword.is_active == True
+            )
+        )
+
+        keywords = {}
+        for row in rows:
+            keywords.setdefault(row.publication_id, []).append(row.name)
+        return keywords
+
+    @classmethod
+    def stream(cls, query, export_format, compress=False, batch_size=None):
+        """Genera el contenido exportado por fragmentos, opcionalmente comprimido con gzip"""
+        batch_size = batch_size or current_app.config['EXPORT_BATCH_SIZE']
+        writer = getattr(cls, f'_write_{export_format}')
+        chunks = (writer(batch) for batch in cls.iter_batches(query, batch_size))
+
+        if export_format == 'csv':
+            chunks = cls._with_csv_header(chunks)
+
+        if not compress:
+            for chunk in chunks:
+                yield chunk.encode('utf-8')
+            return
+
+        # wbits=31 produce un flujo gzip completo (cabecera + CRC)
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @classmethod
+    def _with_csv_header(cls, chunks):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(cls.CSV_COLUMNS)
+        yield buffer.getvalue()
+        yield from chunks
+
+    @staticmethod
+    def _write_ndjson(batch):
+        dumps = current_app.json.dumps
+        return ''.join(f'{dumps(item)}\n' for item in batch)
+
+    @classmethod
+    def _write_csv(cls, batch):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for item in batch:
+            writer.writerow([
+                item['id'],
+                item['title'],
+                '; '.join(f"{a['last_name']}, {a['first_name']}" for a in item['authors']),
+                item['year'],
+                item['publication_date'],
+                item['publication_type'],
+                item['journal'],
+                item['doi'],
+                item['url'],
+                '; '.join(item['keywords']),
+                item['citation_count'],
+                item['abstract']
+            ])
+        return buffer.getvalue()
+
+    @staticmethod
+    def _bibtex_escape(value):
+        return str(value).replace('{', '\\{').replace('}', '\\}')
+
+    @classmethod
+    def _bibtex_key(cls, item):
+        first_author = item['authors'][0]['last_name'] if item['authors'] else 'anon'
+        ascii_name = unicodedata.normalize('NFKD', first_author).encode('ascii', 'ignore').decode()
+        base = re.sub(r'[^A-Za-z0-9]', '', ascii_name) or 'anon'
+        return f"{base}{item['year'] or ''}_{item['id'][:8]}"
+
+    @classmethod
+    def _write_bibtex(cls, batch):
+        entries = []
+        for item in batch:
+            entry_type = 'inproceedings' if item['publication_type'] == PublicationType.CONFERENCE else 'article'
+            fields = [
+                ('title', item['title']),
+                ('author', ' and '.join(f"{a['last_name']}, {a['first_name']}" for a in item['authors'])),
+                ('booktitle' if entry_type == 'inproceedings' else 'journal', item['journal']),
+                ('year', item['year']),
+                ('doi', item['doi']),
+                ('url', item['url']),
+                ('keywords', ', '.join(item['keywords'])),
+                ('abstract', item['abstract']),
+            ]
+            body = ',\n'.join(
+                f"  {name} = {{{cls._bibtex_escape(value)}}}" for name, value in fields if value
+            )
+            entries.append(f"@{entry_type}{{{cls._bibtex_key(item)},\n{body}\n}}\n\n")
+        return ''.join(entries)
+
+    @staticmethod
+    def _write_ris(batch):
+        lines = []
+        for item in batch:
+            lines.append('TY  - CONF' if item['publication_type'] == PublicationType.CONFERENCE else 'TY  - JOUR')
+            lines.append(f"TI  - {item['title']}")
+            for author in item['authors']:
+                lines.append(f"AU  - {author['last_name']}, {author['first_name']}")
+            if item['year']:
+                lines.append(f"PY  - {item['year']}")
+            if item['publication_date']:
+                lines.append(f"DA  - {item['publication_date'].replace('-', '/')}")
+            if item['journal']:
+                lines.append(f"T2  - {item['journal']}")
+            if item['doi']:
+                lines.append(f"DO  - {item['doi']}")
+            if item['url']:
+                lines.append(f"UR  - {item['url']}")
+            for keyword in item['keywords']:
+                lines.append(f"KW  - {keyword}")
+            if item['abstract']:
+                lines.append(f"AB  - {' '.join(item['abstract'].split())}")
+            lines.append('ER  - ')
+            lines.append('')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,44 @@
+from sqlalchemy.orm import load_only
+
+
+def _split(raw):
+    return {part.strip() for part in raw.split(',') if part.strip()}
+
+
+def parse_fields(args, resource, model, default=None):
+    """Lee fields[<resource>]=a,b,c y lo valida contra las columnas del modelo (siempre incluye id)"""
+    raw = args.get(f'fields[{resource}]')
+    if raw is None:
+        return set(default) if default is not None else None
+
+    requested = _split(raw)
+    valid = {column.key for column in model.__table__.columns} - set(getattr(model, 'PRIVATE_COLUMNS', ()))
+    unknown = requested - valid
+    if unknown:
+        raise ValueError(f"Campos no válidos para {resource}: {', '.join(sorted(unknown))}")
+
+    return requested | {'id'}
+
+
+def parse_include(args, allowed, default=()):
+    """Lee include=a,b y lo valida contra las relaciones permitidas"""
+    raw = args.get('include')
+    if raw is None:
+        return set(default)
+
+    requested = _split(raw)
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Relaciones no válidas en include: {', '.join(sorted(unknown))}")
+
+    return requested
+
+
+def column_options(model, fields, required=()):
+    """Opción load_only para consultar solo las columnas pedidas (más las requeridas internamente)"""
+    if fields is None:
+        return []
+
+    wanted = set(fields) | set(required)
+    columns = [getattr(model, column.key) for column in model.__table__.columns if column.key in wanted]
+    return [load_only(*columns)]
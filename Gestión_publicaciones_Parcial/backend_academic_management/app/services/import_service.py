@@ -0,0 +1,412 @@
+import csv
+import re
+import uuid
+from datetime import date
+from itertools import islice
+from flask import current_app
+from app.extensions import db
+from app.models import Publication, PublicationAuthor, PublicationKeyword, Author, Keyword, Journal, PublicationType
+from app.services.bulk import insert_rows, insert_ignore
+from app.services.normalization import author_block_key, normalize_title
+
+ARTICLE_TYPE = PublicationType.ARTICLE
+CONFERENCE_TYPE = PublicationType.CONFERENCE
+
+RIS_TYPES = {'JOUR': ARTICLE_TYPE, 'CONF': CONFERENCE_TYPE, 'CPAPER': CONFERENCE_TYPE}
+BIBTEX_TYPES = {'article': ARTICLE_TYPE, 'inproceedings': CONFERENCE_TYPE, 'conference': CONFERENCE_TYPE}
+
+_BIBTEX_ENTRY = re.compile(r'@(\w+)\s*\{')
+_RIS_LINE = re.compile(r'^([A-Z][A-Z0-9])  -\s?(.*)$')
+
+# Longitudes máximas de las columnas de publications que se comprueban fila a fila
+MAX_LENGTHS = (('title', 'El título', 255), ('doi', 'El DOI', 100), ('url', 'La URL', 255))
+
+
+def _split_name(name):
+    """'Apellido, Nombre' o 'Nombre Apellido' -> (nombre, apellido)"""
+    name = ' '.join(name.split())
+    if ',' in name:
+        last, first = (part.strip() for part in name.split(',', 1))
+    else:
+        first, _, last = name.rpartition(' ')
+    # Longitudes máximas de las columnas de authors
+    return (first or last)[:50], last[:50]
+
+
+def _to_int(value):
+    try:
+        return int(str(value).strip()[:4]) if value else None
+    except ValueError:
+        return None
+
+
+def _to_date(value):
+    if not value:
+        return None
+    parts = [part for part in re.split(r'[-/]', value.strip()) if part]
+    try:
+        if len(parts) >= 3:
+            return date(int(parts[0]), int(parts[1]), int(parts[2]))
+    except ValueError:
+        pass
+    return None
+
+
+def _unique_ignoring_case(values):
+    """Valores sin repetir (sin distinguir mayúsculas), conservando la primera grafía"""
+    unique = {}
+    for value in values:
+        unique.setdefault(value.lower(), value)
+    return list(unique.values())
+
+
+def _record(title=None, authors=(), year=None, publication_date=None, publication_type=None, journal=None,
+            doi=None, url=None, keywords=(), abstract=None):
+    """Registro normalizado común a todos los formatos (citation_count se deriva de las referencias)"""
+    publication_date = _to_date(publication_date)
+    return {
+        'title': ' '.join(title.split()) if title else None,
+        'authors': [_split_name(name) for name in authors if name and name.strip()],
+        'year': _to_int(year) or (publication_date.year if publication_date else None),
+        'publication_date': publication_date,
+        'publication_type': (publication_type or ARTICLE_TYPE)[:50],
+        'journal': ' '.join(journal.split())[:100] if journal else None,
+        'doi': doi.strip() if doi and doi.strip() else None,
+        'url': url.strip() if url and url.strip() else None,
+        'keywords': _unique_ignoring_case(k.strip()[:50] for k in keywords if k and k.strip()),
+        'abstract': abstract.strip() if abstract and abstract.strip() else None,
+    }
+
+
+def parse_csv(stream):
+    """Lee un CSV con las mismas columnas que la exportación, fila a fila"""
+    for number, row in enumerate(csv.DictReader(stream), start=1):
+        yield number, _record(
+            title=row.get('title'),
+            authors=(row.get('authors') or '').split(';'),
+            year=row.get('year'),
+            publication_date=row.get('publication_date'),
+            publication_type=row.get('publication_type') or None,
+            journal=row.get('journal'),
+            doi=row.get('doi'),
+            url=row.get('url'),
+            keywords=(row.get('keywords') or '').split(';'),
+            abstract=row.get('abstract'),
+        )
+
+
+def parse_ris(stream):
+    """Lee un fichero RIS registro a registro (cada uno termina en ER)"""
+    number, fields = 0, {}
+    for line in stream:
+        match = _RIS_LINE.match(line.rstrip('\r\n'))
+        if not match:
+            continue
+        tag, value = match.group(1), match.group(2).strip()
+        if tag == 'ER':
+            number += 1
+            yield number, _record(
+                title=(fields.get('TI') or fields.get('T1') or [None])[0],
+                authors=fields.get('AU', []) + fields.get('A1', []),
+                year=(fields.get('PY') or fields.get('Y1') or [None])[0],
+                publication_date=(fields.get('DA') or [None])[0],
+                publication_type=RIS_TYPES.get((fields.get('TY') or [''])[0], ARTICLE_TYPE),
+                journal=(fields.get('T2') or fields.get('JO') or fields.get('JF') or [None])[0],
+                doi=(fields.get('DO') or [None])[0],
+                url=(fields.get('UR') or [None])[0],
+                keywords=fields.get('KW', []),
+                abstract=(fields.get('AB') or [None])[0],
+            )
+            fields = {}
+        else:
+            fields.setdefault(tag, []).append(value)
+
+
+def _bibtex_entries(stream):
+    """Divide el flujo en entradas @tipo{...} equilibrando llaves, sin leer el fichero completo"""
+    buffer, depth, entry_type = [], 0, None
+    for line in stream:
+        if entry_type is None:
+            match = _BIBTEX_ENTRY.search(line)
+            if not match:
+                continue
+            entry_type = match.group(1).lower()
+            line = line[match.end():]
+            depth = 1
+        for position, char in enumerate(line):
+            if char == '{' and (position == 0 or line[position - 1] != '\\'):
+                depth += 1
+            elif char == '}' and (position == 0 or line[position - 1] != '\\'):
+                depth -= 1
+                if depth == 0:
+                    buffer.append(line[:position])
+                    yield entry_type, ''.join(buffer)
+                    buffer, entry_type = [], None
+                    break
+        else:
+            buffer.append(line)
+
+
+def _bibtex_fields(body):
+    """Campos 'nombre = {valor}' / 'nombre = "valor"' / 'nombre = valor' de una entrada"""
+    fields = {}
+    _, _, body = body.partition(',')  # Descarta la clave de cita
+    position, length = 0, len(body)
+    while position < length:
+        equals = body.find('=', position)
+        if equals == -1:
+            break
+        name = body[position:equals].strip(' \t\r\n,').lower()
+        position = equals + 1
+        while position < length and body[position] in ' \t\r\n':
+            position += 1
+        if position >= length:
+            break
+
+        opener = body[position]
+        if opener in '{"':
+            closer, depth, start = ('}' if opener == '{' else '"'), 1, position + 1
+            position += 1
+            while position < length and depth:
+                char = body[position]
+                if body[position - 1] != '\\':
+                    if opener == '{' and char == '{':
+                        depth += 1
+                    elif char == closer:
+                        depth -= 1
+                position += 1
+            value = body[start:position - 1]
+        else:
+            end = body.find(',', position)
+            end = length if end == -1 else end
+            value, position = body[position:end], end
+
+        value = value.replace('\\{', '{').replace('\\}', '}').replace('{', '').replace('}', '')
+        fields[name] = ' '.join(value.split())
+    return fields
+
+
+def parse_bibtex(stream):
+    """Lee un fichero BibTeX entrada a entrada"""
+    number = 0
+    for entry_type, body in _bibtex_entries(stream):
+        if entry_type in ('comment', 'preamble', 'string'):
+            continue
+        number += 1
+        fields = _bibtex_fields(body)
+        yield number, _record(
+            title=fields.get('title'),
+            authors=fields.get('author', '').split(' and '),
+            year=fields.get('year'),
+            publication_type=BIBTEX_TYPES.get(entry_type, ARTICLE_TYPE),
+            journal=fields.get('journal') or fields.get('booktitle'),
+            doi=fields.get('doi'),
+            url=fields.get('url'),
+            keywords=re.split(r'[;,]', fields.get('keywords', '')),
+            abstract=fields.get('abstract'),
+        )
+
+
+class ImportService:
+    """Importación masiva de publicaciones desde BibTeX, RIS o CSV en una sola transacción"""
+
+    PARSERS = {
+        'bibtex': parse_bibtex,
+        'bib': parse_bibtex,
+        'ris': parse_ris,
+        'csv': parse_csv,
+    }
+
+    @classmethod
+    def detect_format(cls, filename, requested=None):
+        """Formato indicado explícitamente o deducido de la extensión del fichero"""
+        import_format = (requested or (filename or '').rsplit('.', 1)[-1]).lower()
+        if import_format not in cls.PARSERS:
+            raise ValueError(f'Formato de importación no soportado: {import_format}')
+        return import_format
+
+    @classmethod
+    def import_stream(cls, stream, import_format, batch_size=None):
+        """Importa todas las entradas del flujo; confirma una única vez al final"""
+        batch_size = batch_size or current_app.config['IMPORT_BATCH_SIZE']
+        records = cls.PARSERS[import_format](stream)
+        context = {'types': {}, 'journals': {}, 'keywords': {}, 'authors': {}, 'dois': set()}
+        report = []
+
+        try:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                report.extend(cls._import_batch(batch, context))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        summary = {'total': len(report), 'created': 0, 'skipped': 0, 'errors': 0}
+        for row in report:
+            summary[{'created': 'created', 'skipped': 'skipped', 'error': 'errors'}[row['status']]] += 1
+        return {'summary': summary, 'rows': report}
+
+    @classmethod
+    def _import_batch(cls, batch, context):
+        """Valida, resuelve las entidades relacionadas e inserta un lote de registros"""
+        report, valid = [], []
+
+        existing_dois = cls._existing_dois({record['doi'] for _, record in batch if record['doi']})
+        for number, record in batch:
+            error = cls._validate(record)
+            if error:
+                report.append({'row': number, 'status': 'error', 'error': error})
+            elif record['doi'] and (record['doi'].lower() in existing_dois or record['doi'].lower() in context['dois']):
+                report.append({'row': number, 'status': 'skipped', 'error': f"DOI duplicado: {record['doi']}"})
+            else:
+                if record['doi']:
+                    context['dois'].add(record['doi'].lower())
+                valid.append((number, record))
+
+        if not valid:
+            return report
+
+        records = [record for _, record in valid]
+        types = cls._resolve_types({r['publication_type'] for r in records}, context['types'])
+        journals = cls._resolve_journals({r['journal'] for r in records if r['journal']}, context['journals'])
+        keywords = cls._resolve_keywords([k for r in records for k in r['keywords']], context['keywords'])
+        authors = cls._resolve_authors({name for r in records for name in r['authors']}, context['authors'])
+
+        publications, author_links, keyword_links = [], [], []
+        for number, record in valid:
+            publication_id = uuid.uuid4()
+            publications.append({
+                'id': publication_id,
+                'title': record['title'],
+                # La inserción masiva no pasa por el validador del modelo
+                'normalized_title': normalize_title(record['title']),
+                'abstract': record['abstract'],
+                'doi': record['doi'],
+                'url': record['url'],
+                'publication_date': record['publication_date'],
+                'year': record['year'],
+                'month': record['publication_date'].month if record['publication_date'] else None,
+                'day': record['publication_date'].day if record['publication_date'] else None,
+                # Las referencias no se importan: el contador parte de 0 y lo mantienen sus eventos
+                'citation_count': 0,
+                'publication_type_id': types[record['publication_type']],
+                'journal_id': journals.get(record['journal']),
+            })
+
+            seen_authors = set()
+            for order, name in enumerate(record['authors'], start=1):
+                author_id = authors[name]
+                if author_id in seen_authors:
+                    continue
+                seen_authors.add(author_id)
+                author_links.append({
+                    'publication_id': publication_id,
+                    'author_id': author_id,
+                    'author_order': order,
+                    'is_corresponding': order == 1,
+                })
+
+            for keyword_id in dict.fromkeys(keywords[k.lower()] for k in record['keywords']):
+                keyword_links.append({'publication_id': publication_id, 'keyword_id': keyword_id})
+
+            report.append({'row': number, 'status': 'created', 'id': str(publication_id)})
+
+        insert_rows(Publication, publications)
+        insert_rows(PublicationAuthor, author_links)
+        insert_rows(PublicationKeyword, keyword_links)
+
+        report.sort(key=lambda row: row['row'])
+        return report
+
+    @staticmethod
+    def _validate(record):
+        """Mensaje de error de un registro, o None si cabe en las columnas de publications"""
+        if not record['title']:
+            return 'El título es obligatorio'
+        for field, label, max_length in MAX_LENGTHS:
+            if record[field] and len(record[field]) > max_length:
+                return f'{label} supera los {max_length} caracteres'
+        return None
+
+    @staticmethod
+    def _existing_dois(dois):
+        """DOIs ya registrados, en minúsculas (el DOI no distingue mayúsculas)"""
+        if not dois:
+            return set()
+        lower_doi = db.func.lower(Publication.doi)
+        return set(db.session.scalars(db.select(lower_doi).where(lower_doi.in_({doi.lower() for doi in dois}))))
+
+    @staticmethod
+    def _resolve_types(names, cache):
+        """Tipos de publicación por nombre (únicos), creando los que falten"""
+        missing = names - cache.keys()
+        if missing:
+            insert_ignore(PublicationType, [{'id': uuid.uuid4(), 'name': name} for name in missing], ['name'])
+            rows = db.session.execute(
+                db.select(PublicationType.name, PublicationType.id).where(PublicationType.name.in_(missing))
+            )
+            cache.update(dict(rows.all()))
+        return cache
+
+    @staticmethod
+    def _resolve_journals(names, cache):
+        """Revistas por nombre (sin restricción única: se reutiliza la primera existente)"""
+        missing = names - cache.keys()
+        if missing:
+            rows = db.session.execute(
+                db.select(Journal.name, Journal.id).where(Journal.name.in_(missing), Journal.is_active == True)
+            )
+            for name, journal_id in rows:
+                cache.setdefault(name, journal_id)
+
+            new = [{'id': uuid.uuid4(), 'name': name} for name in missing - cache.keys()]
+            insert_rows(Journal, new)
+            cache.update((row['name'], row['id']) for row in new)
+        return cache
+
+    @staticmethod
+    def _resolve_keywords(names, cache):
+        """Keywords por nombre sin distinguir mayúsculas (caché en minúsculas).
+
+        Se reutiliza la keyword existente con cualquier grafía; las nuevas conservan la
+        primera grafía recibida y se insertan con INSERT ... ON CONFLICT DO NOTHING.
+        """
+        missing = {name.lower(): name for name in reversed(names) if name.lower() not in cache}
+        if missing:
+            lower_name = db.func.lower(Keyword.name)
+            for key, keyword_id in db.session.execute(db.select(lower_name, Keyword.id).where(lower_name.in_(missing))):
+                cache.setdefault(key, keyword_id)
+
+            new = [{'id': uuid.uuid4(), 'name': name} for key, name in missing.items() if key not in cache]
+            if new:
+                insert_ignore(Keyword, new, ['name'])
+                rows = db.session.execute(
+                    db.select(Keyword.name, Keyword.id).where(Keyword.name.in_([row['name'] for row in new]))
+                )
+                cache.update((name.lower(), keyword_id) for name, keyword_id in rows)
+        return cache
+
+    @staticmethod
+    def _resolve_authors(names, cache):
+        """Autores por (nombre, apellido), creando los que no existan"""
+        missing = names - cache.keys()
+        if missing:
+            rows = db.session.execute(
+                db.select(Author.first_name, Author.last_name, Author.id).where(
+                    db.tuple_(Author.first_name, Author.last_name).in_(list(missing)),
+                    Author.is_active == True
+                )
+            )
+            for first, last, author_id in rows:
+                cache.setdefault((first, last), author_id)
+
+            new = [
+                {'id': uuid.uuid4(), 'first_name': first, 'last_name': last, 'block_key': author_block_key(first, last)}
+                for first, last in missing - cache.keys()
+            ]
+            insert_rows(Author, new)
+            cache.update(((row['first_name'], row['last_name']), row['id']) for row in new)
+        return cache
@@ -0,0 +1,148 @@
+import itertools
+import uuid
+from collections import namedtuple
+from app.extensions import db
+from app.services.cache_service import STALE_TAGS_KEY
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional; sin él el grafo de citas responde 503 y los servicios usan su ruta en Python
+    np = None
+
+# Sentinela: hay que recalcular todas las entidades de un tipo
+ALL = None
+
+# Por encima de estas entidades afectadas se recalcula la tabla completa con una sola sentencia
+MAX_INCREMENTAL_IDS = 1000
+
+# Clave de Session.info con los elementos pendientes de cada tabla derivada: {nombre: set()}
+PENDING_KEY = 'derived_tables_pending'
+
+
+def chunks(values, size):
+    """Divide los valores en listas de como máximo size elementos (listas IN acotadas)"""
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def changed(instance, *attributes):
+    """Indica si alguno de los atributos de la instancia cambia en el flush"""
+    state = db.inspect(instance)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+def statement_rows(state):
+    """Filas de parámetros de un INSERT/UPDATE/DELETE ejecutado fuera del flush"""
+    return [state.parameters] if isinstance(state.parameters, dict) else list(state.parameters or ())
+
+
+def statement_tags(state, model):
+    """Etiquetas de una sentencia por lotes: las de execution_options o las de sus filas.
+
+    Las filas sin las columnas de las etiquetas producen comodines ('tabla:*').
+    """
+    tags = state.execution_options.get('cache_tags')
+    if tags is not None:
+        return tags
+    rows = statement_rows(state)
+    if not rows:
+        return model.cache_tags_for({})
+    return itertools.chain.from_iterable(model.cache_tags_for(row) for row in rows)
+
+
+def affected(tags, kinds, max_ids=MAX_INCREMENTAL_IDS):
+    """Traduce las etiquetas de escritura ('tipo:id' o 'tipo:*') a {tipo: ids | ALL}"""
+    result = {kind: set() for kind in kinds}
+    for tag in tags:
+        kind, _, value = tag.partition(':')
+        if kind not in result or not value or result[kind] is ALL:
+            continue
+        if value == '*':
+            result[kind] = ALL
+            continue
+        try:
+            result[kind].add(uuid.UUID(value))
+        except ValueError:
+            continue
+
+    for kind, ids in result.items():
+        if ids is not ALL and len(ids) > max_ids:
+            result[kind] = ALL
+    return result
+
+
+_Maintainer = namedtuple('_Maintainer', 'name refresh on_flush on_statement')
+_maintainers = []
+
+
+def register_maintainer(name, refresh, on_flush=None, on_statement=None):
+    """Registra una tabla derivada que se actualiza en la misma transacción que las escrituras.
+
+    on_flush(session) y on_statement(state) devuelven los elementos afectados (etiquetas o
+    ids) por un flush o por un INSERT/UPDATE/DELETE ejecutado fuera de él; antes de confirmar
+    se llama a refresh(elementos). Sin recolectores, refresh recibe las etiquetas de escritura
+    que ya recoge la caché de respuestas. Se actualizan en el orden de registro.
+    """
+    if any(maintainer.name == name for maintainer in _maintainers):
+        return
+    _maintainers.append(_Maintainer(name, refresh, on_flush, on_statement))
+    _register_session_events()
+
+
+def _add_pending(session, name, items):
+    session.info.setdefault(PENDING_KEY, {}).setdefault(name, set()).update(items)
+
+
+def _on_after_flush(session, flush_context):
+    for maintainer in _maintainers:
+        if maintainer.on_flush is not None:
+            items = maintainer.on_flush(session)
+            if items:
+                _add_pending(session, maintainer.name, items)
+
+
+def _on_orm_execute(state):
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    if getattr(state.statement, 'table', None) is None:
+        return
+    for maintainer in _maintainers:
+        if maintainer.on_statement is not None:
+            items = maintainer.on_statement(state)
+            if items:
+                _add_pending(state.session, maintainer.name, items)
+
+
+def _on_before_commit(session):
+    # El flush completa los elementos de los cambios aún pendientes
+    session.flush()
+    for maintainer in _maintainers:
+        if maintainer.on_flush is None and maintainer.on_statement is None:
+            items = set(session.info.get(STALE_TAGS_KEY, ()))
+        else:
+            items = session.info.get(PENDING_KEY, {}).pop(maintainer.name, None)
+        if items:
+            maintainer.refresh(items)
+            # Lo que escriba el recálculo lo ven las tablas registradas después
+            session.flush()
+    session.info.pop(PENDING_KEY, None)
+
+
+def _on_after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+_session_events_registered = False
+
+
+def _register_session_events():
+    global _session_events_registered
+    if _session_events_registered:
+        return
+    session_class = db.session.session_factory.class_
+    db.event.listen(session_class, 'after_flush', _on_after_flush)
+    db.event.listen(session_class, 'do_orm_execute', _on_orm_execute)
+    db.event.listen(session_class, 'before_commit', _on_before_commit)
+    db.event.listen(session_class, 'after_rollback', _on_after_rollback)
+    _session_events_registered = True
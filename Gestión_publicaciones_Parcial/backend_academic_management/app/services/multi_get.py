@@ -0,0 +1,59 @@
+import uuid
+from flask import current_app, jsonify, request
+from app.services.fieldsets import parse_fields, column_options
+
+
+def requested_ids():
+    """Ids pedidos: ?ids=a,b,c en GET o {"ids": [...]} en el cuerpo de POST .../batch-get"""
+    if request.method == 'GET':
+        return [part for part in request.args.get('ids', '').split(',') if part.strip()]
+
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list):
+        raise ValueError('Se requiere una lista de ids')
+    return ids
+
+
+def parse_ids(raw_ids, limit):
+    """Convierte los ids a UUID conservando el orden de la petición y descartando repetidos"""
+    if not raw_ids:
+        raise ValueError('Se requiere al menos un id')
+
+    ids = []
+    for raw_id in raw_ids:
+        try:
+            ids.append(uuid.UUID(str(raw_id).strip()))
+        except ValueError:
+            raise ValueError(f'Id no válido: {raw_id}')
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > limit:
+        raise ValueError(f'Se pueden consultar como máximo {limit} ids por petición')
+    return ids
+
+
+def multi_get_response(model, resource, exclude=None, options=(), serialize_many=None):
+    """Resuelve varios ids con una sola consulta IN.
+
+    data sigue el orden de la petición y contiene null en cada id no encontrado,
+    que además se listan en missing.
+    """
+    try:
+        ids = parse_ids(requested_ids(), current_app.config['MULTI_GET_MAX_IDS'])
+        fields = None if serialize_many else parse_fields(request.args, resource, model)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if serialize_many is None:
+        options = column_options(model, fields)
+        serialize_many = lambda items: [item.to_dict(fields=fields, exclude=exclude) for item in items]
+
+    found = model.get_many(ids, options)
+    items = [found[id] for id in ids if id in found]
+    by_id = dict(zip((item.id for item in items), serialize_many(items)))
+
+    return jsonify({
+        'data': [by_id.get(id) for id in ids],
+        'missing': [str(id) for id in ids if id not in by_id],
+        'total': len(by_id)
+    })
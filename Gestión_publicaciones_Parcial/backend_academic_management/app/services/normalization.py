@@ -0,0 +1,105 @@
+import re
+import unicodedata
+
+# DOI según el esquema de Crossref: prefijo 10.NNNN y sufijo hasta el primer espacio o delimitador
+DOI_PATTERN = re.compile(r'\b(10\.\d{4,9}/[^\s"<>]+)', re.IGNORECASE)
+_DOI_TRAILING = '.,;:)]}\''
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_URL = re.compile(r'(?:https?://|doi:)\S*', re.IGNORECASE)
+_QUOTED = re.compile(r'["“”«»]([^"“”«»]{10,})["“”«»]')
+_TRAILING_YEAR = re.compile(r'\s*[\(\[]\s*\d{4}[a-z]?\s*[\)\]]\s*\.?$')
+_SENTENCE_SPLIT = re.compile(r'(?<=[^\s.]{2})\.\s+|\?\s+')
+
+NORMALIZED_TITLE_LENGTH = 255
+# Títulos más cortos no identifican una publicación (p. ej. "Introduction")
+MIN_TITLE_WORDS = 3
+
+# Longitud máxima del apellido en la clave de bloque de autores (cabe en authors.block_key)
+AUTHOR_BLOCK_SURNAME_LENGTH = 57
+
+
+def normalize_doi(doi):
+    """DOI en minúsculas y sin prefijo de resolvedor (https://doi.org/, doi:)"""
+    if not doi:
+        return None
+    match = DOI_PATTERN.search(doi)
+    return match.group(1).rstrip(_DOI_TRAILING).lower() if match else None
+
+
+def extract_dois(text):
+    """DOIs presentes en un texto libre, normalizados y sin repetir"""
+    if not text:
+        return []
+    return list(dict.fromkeys(match.rstrip(_DOI_TRAILING).lower() for match in DOI_PATTERN.findall(text)))
+
+
+def normalize_title(title):
+    """Título sin acentos, en minúsculas y con la puntuación reducida a espacios simples"""
+    if not title:
+        return None
+    decomposed = unicodedata.normalize('NFKD', title)
+    ascii_text = ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    normalized = _NON_ALNUM.sub(' ', ascii_text).strip()
+    return normalized[:NORMALIZED_TITLE_LENGTH] or None
+
+
+def title_candidates(text):
+    """Posibles títulos normalizados dentro del texto de una referencia.
+
+    Se prueban el texto completo (sin el año final que añade la API), los
+    fragmentos entre comillas y cada frase del estilo "Autores (año). Título. Revista".
+    """
+    if not text:
+        return []
+    text = DOI_PATTERN.sub(' ', _URL.sub(' ', text))
+    fragments = [_TRAILING_YEAR.sub('', text.strip())]
+    fragments.extend(_QUOTED.findall(text))
+    fragments.extend(_SENTENCE_SPLIT.split(text))
+
+    candidates = []
+    for fragment in fragments:
+        normalized = normalize_title(_TRAILING_YEAR.sub('', fragment.strip()))
+        if normalized and normalized.count(' ') + 1 >= MIN_TITLE_WORDS:
+            candidates.append(normalized)
+    return list(dict.fromkeys(candidates))
+
+
+def normalize_name(name):
+    """Nombre sin acentos, en minúsculas y con guiones y puntos reducidos a espacios simples"""
+    return normalize_title(name)
+
+
+def author_block_key(first_name, last_name):
+    """Clave de bloque de un autor: apellido normalizado e inicial del nombre ("garcia marquez|g").
+
+    Solo se comparan entre sí autores con la misma clave; None si falta alguno de los dos.
+    """
+    surname, given = normalize_name(last_name), normalize_name(first_name)
+    if not surname or not given:
+        return None
+    return f'{surname[:AUTHOR_BLOCK_SURNAME_LENGTH]}|{given[0]}'
+
+
+# Palabras vacías (español e inglés) que no aportan al parecido entre textos
+STOPWORDS = frozenset('''
+    a al ante bajo como con contra de del desde el en entre es esta este hacia hasta la las lo los mas mediante
+    para pero por que se segun sin sobre su sus un una uno unos unas y o u e ni no
+    an and are as at be by for from has have in into is it its of on or that the their this to using via was
+    were which with within
+'''.split())
+
+# Longitud máxima de un término (cabe en related_terms.term)
+MAX_TERM_LENGTH = 50
+
+
+def tokenize(text):
+    """Términos de un texto: palabras normalizadas de 3 o más caracteres, sin números ni palabras vacías"""
+    if not text:
+        return []
+    decomposed = unicodedata.normalize('NFKD', text)
+    ascii_text = ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    return [
+        word[:MAX_TERM_LENGTH] for word in _NON_ALNUM.split(ascii_text)
+        if len(word) > 2 and word not in STOPWORDS and not word.isdigit()
+    ]
@@ -6,6 +6,7 @@ from datetime import date
 from dotenv import load_dotenv
 from app.extensions import db
 from app.models import Author, Publication, PublicationAuthor, Journal, Conference, PublicationType
+from app.services.duplicate_service import DuplicateService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -144,6 +145,9 @@ class OrcidService:
                         # Si hay un error (como la columna no existe), simplemente continuamos
                         existing_pub = None
                 
+                # Una publicación fusionada se sustituye por la que la conserva
+                existing_pub = DuplicateService.canonical(existing_pub)
+                
                 if existing_pub:
                     # Si ya existe, solo nos aseguramos que el autor esté vinculado
                     logger.info(f"Publication already exists with ID: {existing_pub.id}")
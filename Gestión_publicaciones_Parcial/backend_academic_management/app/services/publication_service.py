@@ -0,0 +1,153 @@
+import uuid
+from datetime import datetime
+from app.extensions import db
+from app.models import PublicationAuthor, PublicationKeyword, Keyword
+from app.services.bulk import dialect_insert, insert_rows
+
+
+class PublicationService:
+    """Operaciones sobre las relaciones de una publicación aplicadas como diferencias"""
+
+    @staticmethod
+    def parse_authors(authors_data):
+        """Normaliza la lista de autores de la petición a {author_id: (author_order, is_corresponding)}"""
+        authors = {}
+        for idx, author_data in enumerate(authors_data):
+            if isinstance(author_data, dict) and 'author_id' in author_data:
+                author_id = uuid.UUID(str(author_data['author_id']))
+                # Si un autor aparece repetido se conserva la primera aparición
+                authors.setdefault(author_id, (
+                    author_data.get('author_order', idx + 1),
+                    bool(author_data.get('is_corresponding', False))
+                ))
+        return authors
+
+    @staticmethod
+    def _apply(model, inserts, updates, deletes, cache_tags):
+        """Aplica las diferencias con sentencias por lotes: un INSERT multi-fila, un UPDATE por clave y un DELETE"""
+        # El DELETE y el UPDATE solo llevan ids: las etiquetas de caché afectadas se indican explícitamente
+        options = {'cache_tags': cache_tags}
+        if deletes:
+            db.session.execute(db.delete(model).where(model.id.in_(deletes)), execution_options=options)
+        if updates:
+            db.session.execute(db.update(model), updates, execution_options=options)
+        insert_rows(model, inserts)
+        return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes)}
+
+    @classmethod
+    def sync_authors(cls, publication_id, authors):
+        """Deja los autores de la publicación exactamente como {author_id: (author_order, is_corresponding)}"""
+        current = db.session.execute(
+            db.select(
+                PublicationAuthor.id,
+                PublicationAuthor.author_id,
+                PublicationAuthor.author_order,
+                PublicationAuthor.is_corresponding,
+                PublicationAuthor.is_active
+            ).where(PublicationAuthor.publication_id == publication_id)
+            # Las filas activas primero: son las que se conservan si hay duplicados
+            .order_by(PublicationAuthor.is_active.desc())
+        ).all()
+
+        inserts, updates, deletes, kept = [], [], [], set()
+        cache_tags = {PublicationAuthor.__tablename__, f'publications:{publication_id}'}
+        for row in current:
+            wanted = authors.get(row.author_id)
+            if wanted is None or row.author_id in kept:
+                deletes.append(row.id)
+                cache_tags.add(f'authors:{row.author_id}')
+                continue
+
+            kept.add(row.author_id)
+            author_order, is_corresponding = wanted
+            if (row.author_order, bool(row.is_corresponding), row.is_active) != (author_order, is_corresponding, True):
+                updates.append({
+                    'id': row.id,
+                    'author_order': author_order,
+                    'is_corresponding': is_corresponding,
+                    'is_active': True
+                })
+                cache_tags.add(f'authors:{row.author_id}')
+
+        for author_id, (author_order, is_corresponding) in authors.items():
+            if author_id not in kept:
+                inserts.append({
+                    'id': uuid.uuid4(),
+                    'publication_id': publication_id,
+                    'author_id': author_id,
+                    'author_order': author_order,
+                    'is_corresponding': is_corresponding
+                })
+
+        return cls._apply(PublicationAuthor, inserts, updates, deletes, cache_tags)
+
+    @classmethod
+    def sync_keywords(cls, publication_id, keyword_ids):
+        """Deja las keywords de la publicación exactamente como el conjunto indicado"""
+        wanted = {uuid.UUID(str(keyword_id)) for keyword_id in keyword_ids}
+        current = db.session.execute(
+            db.select(PublicationKeyword.id, PublicationKeyword.keyword_id, PublicationKeyword.is_active)
+            .where(PublicationKeyword.publication_id == publication_id)
+            .order_by(PublicationKeyword.is_active.desc())
+        ).all()
+
+        inserts, updates, deletes, kept = [], [], [], set()
+        cache_tags = {PublicationKeyword.__tablename__, f'publications:{publication_id}'}
+        for row in current:
+            if row.keyword_id not in wanted or row.keyword_id in kept:
+                deletes.append(row.id)
+                cache_tags.add(f'keywords:{row.keyword_id}')
+                continue
+
+            kept.add(row.keyword_id)
+            if not row.is_active:
+                updates.append({'id': row.id, 'is_active': True})
+                cache_tags.add(f'keywords:{row.keyword_id}')
+
+        for keyword_id in wanted - kept:
+            inserts.append({'id': uuid.uuid4(), 'publication_id': publication_id, 'keyword_id': keyword_id})
+
+        return cls._apply(PublicationKeyword, inserts, updates, deletes, cache_tags)
+
+    @staticmethod
+    def upsert_keywords(names):
+        """Obtiene {nombre: id} creando en una sola sentencia las keywords que no existan.
+
+        INSERT ... ON CONFLICT (name) reactiva además las keywords desactivadas con ese nombre.
+        """
+        names = set(names)
+        if not names:
+            return {}
+
+        statement = dialect_insert(Keyword).on_conflict_do_update(
+            index_elements=['name'],
+            set_={'is_active': True, 'updated_at': datetime.utcnow()},
+            where=Keyword.is_active == False
+        )
+        db.session.execute(statement, [{'id': uuid.uuid4(), 'name': name} for name in names])
+
+        rows = db.session.execute(db.select(Keyword.name, Keyword.id).where(Keyword.name.in_(names)))
+        return dict(rows.all())
+
+    @staticmethod
+    def attach_keywords(publication_id, keyword_ids):
+        """Asocia las keywords con un único INSERT ... ON CONFLICT y devuelve los ids realmente agregados.
+
+        Los vínculos activos se dejan como están; los desactivados se reactivan.
+        """
+        keyword_ids = set(keyword_ids)
+        if not keyword_ids:
+            return set()
+
+        statement = dialect_insert(PublicationKeyword).on_conflict_do_update(
+            index_elements=['publication_id', 'keyword_id'],
+            set_={'is_active': True, 'updated_at': datetime.utcnow()},
+            where=PublicationKeyword.is_active == False
+        ).returning(PublicationKeyword.keyword_id)
+
+        rows = [
+            {'id': uuid.uuid4(), 'publication_id': publication_id, 'keyword_id': keyword_id}
+            for keyword_id in keyword_ids
+        ]
+        # Solo devuelve filas el INSERT de vínculos nuevos o la reactivación de los desactivados
+        return set(db.session.scalars(statement, rows))
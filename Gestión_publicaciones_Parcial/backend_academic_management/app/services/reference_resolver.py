@@ -0,0 +1,132 @@
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from app.extensions import db
+from app.models import Publication, PublicationReference
+from app.services.citation_counts import CitationCountService
+from app.services.normalization import extract_dois, title_candidates
+
+
+class ReferenceResolver:
+    """Enlaza las referencias que solo tienen reference_text con publicaciones del catálogo.
+
+    Cada referencia se analiza en Python (DOIs con expresión regular y títulos
+    normalizados) y todas las de un lote se comparan con una única consulta contra
+    los índices lower(doi) y normalized_title. El DOI tiene prioridad; un título
+    solo se acepta si corresponde a una única publicación.
+    """
+
+    @staticmethod
+    def match(references):
+        """Resuelve [(clave, citing_publication_id, texto)] -> {clave: (publication_id, 'doi' | 'title')}"""
+        parsed, dois, titles = [], set(), set()
+        for key, citing_id, text in references:
+            reference_dois, reference_titles = extract_dois(text), title_candidates(text)
+            if reference_dois or reference_titles:
+                parsed.append((key, citing_id, reference_dois, reference_titles))
+                dois.update(reference_dois)
+                titles.update(reference_titles)
+        if not parsed:
+            return {}
+
+        lower_doi = db.func.lower(Publication.doi)
+        conditions = []
+        if dois:
+            conditions.append(lower_doi.in_(dois))
+        if titles:
+            conditions.append(Publication.normalized_title.in_(titles))
+        rows = db.session.execute(
+            db.select(Publication.id, lower_doi, Publication.normalized_title)
+            .where(Publication.is_active == True, db.or_(*conditions))
+        ).all()
+
+        by_doi, by_title = {}, defaultdict(set)
+        for publication_id, doi, title in rows:
+            if doi in dois:
+                by_doi[doi] = publication_id
+            if title in titles:
+                by_title[title].add(publication_id)
+
+        matches = {}
+        for key, citing_id, reference_dois, reference_titles in parsed:
+            for doi in reference_dois:
+                if by_doi.get(doi, citing_id) != citing_id:
+                    matches[key] = (by_doi[doi], 'doi')
+                    break
+            else:
+                for title in reference_titles:
+                    candidates = by_title.get(title, set()) - {citing_id}
+                    if len(candidates) == 1:
+                        matches[key] = (candidates.pop(), 'title')
+                        break
+        return matches
+
+    @staticmethod
+    def _link(matches):
+        """Asigna referenced_publication_id con un UPDATE por clave primaria para todo el lote"""
+        now = datetime.utcnow()
+        db.session.execute(
+            db.update(PublicationReference),
+            [
+                {'id': reference_id, 'referenced_publication_id': publication_id, 'updated_at': now}
+                for reference_id, (publication_id, _) in matches.items()
+            ],
+            execution_options={
+                # Los contadores se ajustan aquí con incrementos, sin recalcularlos todos
+                'maintain_citation_counts': False,
+                'cache_tags': ['publication_references', *(f'publication_references:{id}' for id in matches)]
+            }
+        )
+        CitationCountService.apply_deltas(Counter(publication_id for publication_id, _ in matches.values()))
+
+    @classmethod
+    def resolve_pending(cls, batch_size=1000, progress=None):
+        """Recorre por lotes todas las referencias activas sin resolver y confirma tras cada lote.
+
+        progress recibe, tras cada lote, un diccionario con los totales acumulados,
+        los del lote y su rendimiento (referencias por segundo).
+        """
+        totals = {'batches': 0, 'processed': 0, 'resolved': 0, 'doi': 0, 'title': 0}
+        started = time.perf_counter()
+        last_id = None
+        while True:
+            batch_started = time.perf_counter()
+            query = db.select(
+                PublicationReference.id, PublicationReference.citing_publication_id, PublicationReference.reference_text
+            ).where(
+                PublicationReference.referenced_publication_id.is_(None),
+                PublicationReference.is_active == True,
+                PublicationReference.reference_text.isnot(None)
+            ).order_by(PublicationReference.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(PublicationReference.id > last_id)
+            # Las filas del lote quedan bloqueadas hasta el commit; otros procesos saltan a las siguientes
+            rows = db.session.execute(query.with_for_update(skip_locked=True)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            matches = cls.match(rows)
+            if matches:
+                cls._link(matches)
+            db.session.commit()
+
+            methods = Counter(method for _, method in matches.values())
+            elapsed = time.perf_counter() - batch_started
+            totals['batches'] += 1
+            totals['processed'] += len(rows)
+            totals['resolved'] += len(matches)
+            totals['doi'] += methods['doi']
+            totals['title'] += methods['title']
+            if progress:
+                progress({
+                    **totals,
+                    'batch_processed': len(rows),
+                    'batch_resolved': len(matches),
+                    'batch_rate': len(rows) / elapsed if elapsed else 0.0,
+                    'elapsed': time.perf_counter() - started
+                })
+
+        totals['elapsed'] = time.perf_counter() - started
+        totals['rate'] = totals['processed'] / totals['elapsed'] if totals['elapsed'] else 0.0
+        return totals
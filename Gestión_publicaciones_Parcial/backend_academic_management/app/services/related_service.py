@@ -0,0 +1,451 @@
+import heapq
+import itertools
+import math
+import time
+from array import array
+from collections import Counter
+from operator import itemgetter
+from flask import current_app
+from app.extensions import db
+from app.models import Keyword, Publication, PublicationKeyword, PublicationTerm, RelatedPublication, RelatedTerm
+from app.services.bulk import insert_rows
+from app.services.citation_graph import GraphUnavailable
+from app.services.maintenance import ALL, affected, changed, chunks, np, register_maintainer, statement_tags
+from app.services.normalization import tokenize
+
+try:
+    from scipy import sparse
+except ImportError:  # scipy es opcional; sin él el producto disperso se calcula con numpy
+    sparse = None
+
+# Frecuencia de cada palabra ponderada según el campo en el que aparece
+TITLE_WEIGHT = 2
+KEYWORD_WEIGHT = 2
+ABSTRACT_WEIGHT = 1
+
+# Términos presentes en más de esta fracción de publicaciones no distinguen unas de otras
+MAX_DOCUMENT_FREQUENCY = 0.3
+# Términos de más peso que se guardan por publicación: acota el índice invertido
+MAX_TERMS_PER_PUBLICATION = 64
+
+# Actualización incremental: términos de la publicación que se consultan y entradas
+# de más peso leídas por término (similitud aproximada hasta la siguiente reconstrucción)
+QUERY_TERMS = 16
+POSTINGS_PER_TERM = 200
+TERMS_PER_QUERY = 50
+
+# Reconstrucción: productos término a término por bloque de filas (acota la memoria)
+BLOCK_WORK = 2_000_000
+INSERT_BATCH = 10000
+LOOKUP_CHUNK = 5000
+
+
+def term_counts(title, abstract, keywords):
+    """Frecuencia ponderada de cada término en el título, el resumen y las keywords"""
+    counts = Counter()
+    for weight, text in ((TITLE_WEIGHT, title), (ABSTRACT_WEIGHT, abstract)):
+        for term in tokenize(text):
+            counts[term] += weight
+    for keyword in keywords:
+        for term in tokenize(keyword):
+            counts[term] += KEYWORD_WEIGHT
+    return counts
+
+
+def weigh(counts, idf):
+    """Vector TF-IDF {término: peso} con los términos de más peso y norma 1 (como en la reconstrucción)"""
+    weights = {term: (1 + math.log(count)) * idf[term] for term, count in counts.items() if term in idf}
+    if len(weights) > MAX_TERMS_PER_PUBLICATION:
+        weights = dict(heapq.nlargest(MAX_TERMS_PER_PUBLICATION, weights.items(), key=itemgetter(1)))
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+
+def _top_k(rows, columns, scores, k):
+    """Las k columnas de más puntuación de cada fila (sin la diagonal), ordenadas por fila y puntuación"""
+    keep = rows != columns
+    rows, columns, scores = rows[keep], columns[keep], scores[keep]
+    order = np.lexsort((columns, -scores, rows))
+    rows, columns, scores = rows[order], columns[order], scores[order]
+    starts = np.r_[0, np.flatnonzero(rows[1:] != rows[:-1]) + 1]
+    rank = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+    keep = rank < k
+    return rows[keep], columns[keep], scores[keep]
+
+
+class RelatedPublicationsService:
+    """Publicaciones relacionadas por similitud coseno de vectores TF-IDF (título, resumen y keywords).
+
+    La reconstrucción vectoriza todo el catálogo en una matriz dispersa (CSR) y guarda
+    el vocabulario, el índice invertido y los k vecinos de cada publicación. Al crear
+    o modificar publicaciones se recalculan solo sus vectores y vecinos con el índice
+    invertido. El endpoint lee la lista precalculada con una consulta indexada.
+    """
+
+    @staticmethod
+    def _k():
+        return current_app.config['RELATED_PUBLICATIONS_K']
+
+    @staticmethod
+    def _documents(publication_ids):
+        """{id: (título, resumen, [keywords])} de las publicaciones activas indicadas"""
+        documents = {}
+        for chunk in chunks(publication_ids, LOOKUP_CHUNK):
+            rows = db.session.execute(
+                db.select(Publication.id, Publication.title, Publication.abstract)
+                .where(Publication.id.in_(chunk), Publication.is_active == True)
+            )
+            documents.update({row.id: (row.title, row.abstract, []) for row in rows})
+            keywords = db.session.execute(
+                db.select(PublicationKeyword.publication_id, Keyword.name)
+                .join(Keyword, Keyword.id == PublicationKeyword.keyword_id)
+                .where(
+                    PublicationKeyword.publication_id.in_(chunk),
+                    PublicationKeyword.is_active == True,
+                    Keyword.is_active == True
+                )
+            )
+            for publication_id, name in keywords:
+                if publication_id in documents:
+                    documents[publication_id][2].append(name)
+        return documents
+
+    @classmethod
+    def _vectorize(cls, batch_size):
+        """Recorre el catálogo por lotes y devuelve (ids, vocabulario, longitudes, términos, frecuencias)"""
+        ids, vocabulary = [], {}
+        # 'q' es siempre de 64 bits ('l' es C long: 32 bits en Windows); se lee como np.int64
+        lengths, terms, counts = array('q'), array('q'), array('q')
+        last_id = None
+        while True:
+            query = db.select(Publication.id).where(Publication.is_active == True).order_by(Publication.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(Publication.id > last_id)
+            batch = db.session.scalars(query).all()
+            if not batch:
+                break
+            last_id = batch[-1]
+
+            documents = cls._documents(batch)
+            for publication_id in batch:
+                if publication_id not in documents:
+                    continue
+                document_counts = term_counts(*documents[publication_id])
+                if not document_counts:
+                    continue
+                ids.append(publication_id)
+                lengths.append(len(document_counts))
+                terms.extend(vocabulary.setdefault(term, len(vocabulary)) for term in document_counts)
+                counts.extend(document_counts.values())
+        return ids, vocabulary, lengths, terms, counts
+
+    @staticmethod
+    def _neighbours(indptr, terms, weights, n, k):
+        """Genera (filas, columnas, puntuaciones) con los k vecinos de cada fila, por bloques de filas"""
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        # Índice invertido (CSC): entradas ordenadas por término
+        by_term = np.argsort(terms, kind='stable')
+        postings, posting_weights = rows[by_term], weights[by_term]
+        posting_lengths = np.bincount(terms, minlength=int(terms.max()) + 1 if len(terms) else 0)
+        term_indptr = np.r_[0, np.cumsum(posting_lengths)]
+
+        # Trabajo de cada fila = longitud total de las listas de sus términos
+        work = np.cumsum(np.bincount(rows, weights=posting_lengths[terms], minlength=n))
+        matrix = transposed = None
+        if sparse is not None:
+            matrix = sparse.csr_matrix((weights, terms, indptr), shape=(n, len(posting_lengths)))
+            transposed = matrix.T.tocsr()
+
+        start = 0
+        while start < n:
+            done = work[start - 1] if start else 0.0
+            end = max(int(np.searchsorted(work, done + BLOCK_WORK, side='right')), start + 1)
+            end = min(end, n)
+            if matrix is not None:
+                block = (matrix[start:end] @ transposed).tocoo()
+                block_rows, columns, scores = block.row + start, block.col, block.data
+            else:
+                entries = slice(indptr[start], indptr[end])
+                entry_terms, entry_weights = terms[entries], weights[entries]
+                lengths = posting_lengths[entry_terms]
+                total = int(lengths.sum())
+                # Posición de cada producto en su lista: inicio de la lista + desplazamiento
+                offsets = np.repeat(term_indptr[entry_terms] - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+                keys = np.repeat(rows[entries], lengths) * n + postings[offsets]
+                products = np.repeat(entry_weights, lengths) * posting_weights[offsets]
+                order = np.argsort(keys, kind='stable')
+                keys = keys[order]
+                starts = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1] if total else np.empty(0, dtype=np.int64)
+                scores = np.add.reduceat(products[order], starts) if total else np.empty(0)
+                block_rows, columns = keys[starts] // n, keys[starts] % n
+            yield _top_k(block_rows, columns, scores, k)
+            start = end
+
+    @classmethod
+    def rebuild(cls, batch_size=5000):
+        """Reconstruye vocabulario, índice invertido y vecinos de todo el catálogo en una transacción"""
+        if np is None:
+            raise GraphUnavailable('La reconstrucción de publicaciones relacionadas requiere numpy')
+        started = time.perf_counter()
+        k = cls._k()
+
+        ids, vocabulary, lengths, raw_terms, raw_counts = cls._vectorize(batch_size)
+        n = len(ids)
+        rows = np.repeat(np.arange(n), np.frombuffer(lengths, dtype=np.int64)) if n else np.empty(0, dtype=np.int64)
+        terms = np.frombuffer(raw_terms, dtype=np.int64).copy()
+        counts = np.frombuffer(raw_counts, dtype=np.int64).astype(np.float64)
+
+        # Se descartan los términos de una sola publicación (no relacionan nada) y los demasiado comunes
+        document_counts = np.bincount(terms, minlength=len(vocabulary))
+        keep = (document_counts >= 2) & (document_counts <= max(2, MAX_DOCUMENT_FREQUENCY * n))
+        idf = np.log((1 + n) / (1 + document_counts)) + 1
+        mask = keep[terms]
+        rows, terms, counts = rows[mask], terms[mask], counts[mask]
+        weights = (1 + np.log(counts)) * idf[terms]
+
+        # MAX_TERMS_PER_PUBLICATION términos de más peso por fila y norma 1
+        order = np.lexsort((-weights, rows))
+        rows, terms, weights = rows[order], terms[order], weights[order]
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        keep_entries = rank < MAX_TERMS_PER_PUBLICATION
+        rows, terms, weights = rows[keep_entries], terms[keep_entries], weights[keep_entries]
+        weights /= np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))[rows]
+
+        # Términos renumerados 1..V en el orden del vocabulario
+        kept_terms = np.flatnonzero(keep)
+        term_ids = np.zeros(len(vocabulary), dtype=np.int64)
+        term_ids[kept_terms] = np.arange(1, len(kept_terms) + 1)
+        terms = term_ids[terms]
+        indptr = np.r_[0, np.cumsum(np.bincount(rows, minlength=n))]
+
+        options = {'cache_tags': ('related_publications',)}
+        db.session.execute(db.delete(RelatedPublication), execution_options=options)
+        db.session.execute(db.delete(PublicationTerm), execution_options=options)
+        db.session.execute(db.delete(RelatedTerm), execution_options=options)
+
+        names = list(vocabulary)
+        for chunk in chunks(kept_terms.tolist(), INSERT_BATCH):
+            insert_rows(RelatedTerm, [
+                {'id': int(term_ids[index]), 'term': names[index],
+                 'document_count': int(document_counts[index]), 'idf': float(idf[index])}
+                for index in chunk
+            ])
+        for start in range(0, len(rows), INSERT_BATCH):
+            insert_rows(PublicationTerm, [
+                {'term_id': term_id, 'publication_id': ids[row], 'weight': weight}
+                for row, term_id, weight in zip(
+                    rows[start:start + INSERT_BATCH].tolist(),
+                    terms[start:start + INSERT_BATCH].tolist(),
+                    weights[start:start + INSERT_BATCH].tolist()
+                )
+            ])
+
+        pairs = 0
+        for block_rows, columns, scores in cls._neighbours(indptr, terms, weights, n, k):
+            for start in range(0, len(block_rows), INSERT_BATCH):
+                insert_rows(RelatedPublication, [
+                    {'publication_id': ids[row], 'related_id': ids[column], 'score': score}
+                    for row, column, score in zip(
+                        block_rows[start:start + INSERT_BATCH].tolist(),
+                        columns[start:start + INSERT_BATCH].tolist(),
+                        scores[start:start + INSERT_BATCH].tolist()
+                    )
+                ])
+            pairs += len(block_rows)
+
+        elapsed = time.perf_counter() - started
+        return {
+            'publications': n,
+            'terms': len(kept_terms),
+            'postings': len(rows),
+            'pairs': pairs,
+            'backend': 'scipy' if sparse is not None else 'numpy',
+            'elapsed': elapsed,
+            'rate': n / elapsed if elapsed else 0.0
+        }
+
+    @staticmethod
+    def _candidates(vectors, k):
+        """Vecinos aproximados {id: [(otro id, puntuación)]} con las entradas de más peso de cada término"""
+        query_terms = {
+            publication_id: heapq.nlargest(QUERY_TERMS, vector.items(), key=itemgetter(1))
+            for publication_id, vector in vectors.items()
+        }
+        postings = {}
+        all_terms = {term_id for terms in query_terms.values() for term_id, _ in terms}
+        for chunk in chunks(all_terms, TERMS_PER_QUERY):
+            # Una subconsulta por término recorre su índice (term_id, weight) de mayor a menor peso
+            selects = [
+                db.select(
+                    db.select(PublicationTerm.term_id, PublicationTerm.publication_id, PublicationTerm.weight)
+                    .where(PublicationTerm.term_id == term_id)
+                    .order_by(PublicationTerm.weight.desc())
+                    .limit(POSTINGS_PER_TERM)
+                    .subquery()
+                )
+                for term_id in chunk
+            ]
+            for term_id, other_id, weight in db.session.execute(db.union_all(*selects)):
+                postings.setdefault(term_id, []).append((other_id, weight))
+
+        neighbours = {}
+        for publication_id, terms in query_terms.items():
+            scores = {}
+            for term_id, weight in terms:
+                for other_id, other_weight in postings.get(term_id, ()):
+                    if other_id != publication_id:
+                        scores[other_id] = scores.get(other_id, 0.0) + weight * other_weight
+            neighbours[publication_id] = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+        return neighbours
+
+    @classmethod
+    def update(cls, publication_ids):
+        """Recalcula vectores y vecinos de las publicaciones indicadas con el vocabulario actual.
+
+        También las añade a las listas de sus vecinos cuando superan al último de ellas.
+        Los términos que no están en el vocabulario se incorporan en la siguiente reconstrucción.
+        """
+        publication_ids = list(publication_ids)
+        if not publication_ids or db.session.scalar(db.select(RelatedTerm.id).limit(1)) is None:
+            return
+
+        counts = {
+            publication_id: term_counts(*document)
+            for publication_id, document in cls._documents(publication_ids).items()
+        }
+        vocabulary = {}
+        for chunk in chunks(set().union(*counts.values()), LOOKUP_CHUNK):
+            rows = db.session.execute(db.select(RelatedTerm.term, RelatedTerm.id, RelatedTerm.idf).where(RelatedTerm.term.in_(chunk)))
+            vocabulary.update((term, (term_id, idf)) for term, term_id, idf in rows)
+        idf = {term: value[1] for term, value in vocabulary.items()}
+        vectors = {}
+        for publication_id, document_counts in counts.items():
+            vector = {vocabulary[term][0]: weight for term, weight in weigh(document_counts, idf).items()}
+            if vector:
+                vectors[publication_id] = vector
+
+        # Las listas que contenían estas publicaciones se recalculan sin ellas
+        stale = set(publication_ids)
+        for chunk in chunks(publication_ids, LOOKUP_CHUNK):
+            stale.update(db.session.scalars(
+                db.select(RelatedPublication.publication_id).where(RelatedPublication.related_id.in_(chunk))
+            ))
+            db.session.execute(
+                db.delete(PublicationTerm).where(PublicationTerm.publication_id.in_(chunk)),
+                execution_options={'cache_tags': ()}
+            )
+            db.session.execute(
+                db.delete(RelatedPublication).where(db.or_(
+                    RelatedPublication.publication_id.in_(chunk), RelatedPublication.related_id.in_(chunk)
+                )),
+                execution_options={'cache_tags': [f'related_publications:{publication_id}' for publication_id in stale]}
+            )
+        insert_rows(PublicationTerm, [
+            {'term_id': term_id, 'publication_id': publication_id, 'weight': weight}
+            for publication_id, vector in vectors.items() for term_id, weight in vector.items()
+        ])
+
+        k = cls._k()
+        neighbours = cls._candidates(vectors, k)
+        insert_rows(RelatedPublication, [
+            {'publication_id': publication_id, 'related_id': other_id, 'score': score}
+            for publication_id, matches in neighbours.items() for other_id, score in matches
+        ])
+        cls._offer(neighbours, k)
+
+    @staticmethod
+    def _offer(neighbours, k):
+        """Añade cada publicación a las listas de sus vecinos si entra entre sus k mejores"""
+        offers = {}
+        for publication_id, matches in neighbours.items():
+            for other_id, score in matches:
+                if other_id not in neighbours:
+                    offers.setdefault(other_id, {})[publication_id] = score
+        if not offers:
+            return
+
+        current = {}
+        for chunk in chunks(offers, LOOKUP_CHUNK):
+            rows = db.session.execute(
+                db.select(RelatedPublication.publication_id, RelatedPublication.related_id, RelatedPublication.score)
+                .where(RelatedPublication.publication_id.in_(chunk))
+            )
+            for publication_id, related_id, score in rows:
+                current.setdefault(publication_id, {})[related_id] = score
+
+        inserts, removed = [], []
+        for other_id, offered in offers.items():
+            existing = current.get(other_id, {})
+            best = dict(heapq.nlargest(k, itertools.chain(existing.items(), offered.items()), key=itemgetter(1)))
+            removed.extend((other_id, related_id) for related_id in existing if related_id not in best)
+            inserts.extend(
+                {'publication_id': other_id, 'related_id': related_id, 'score': score}
+                for related_id, score in offered.items() if related_id in best
+            )
+
+        changed = {row['publication_id'] for row in inserts} | {other_id for other_id, _ in removed}
+        options = {'cache_tags': [f'related_publications:{publication_id}' for publication_id in changed]}
+        for chunk in chunks(removed, LOOKUP_CHUNK):
+            db.session.execute(
+                db.delete(RelatedPublication).where(
+                    db.tuple_(RelatedPublication.publication_id, RelatedPublication.related_id).in_(chunk)
+                ),
+                execution_options=options
+            )
+        if inserts:
+            db.session.execute(RelatedPublication.__table__.insert(), inserts, execution_options=options)
+
+    @staticmethod
+    def related(publication_id, limit):
+        """Vecinos precalculados activos de una publicación, de mayor a menor similitud"""
+        return db.session.execute(
+            db.select(Publication.id, Publication.title, Publication.year, Publication.doi, RelatedPublication.score)
+            .join(Publication, Publication.id == RelatedPublication.related_id)
+            .where(RelatedPublication.publication_id == publication_id, Publication.is_active == True)
+            .order_by(RelatedPublication.score.desc(), Publication.id)
+            .limit(limit)
+        ).all()
+
+
+def _affected_tags(session):
+    tags = set()
+    for instance in session.new:
+        if isinstance(instance, Publication):
+            tags.add(f'publications:{instance.id}')
+        elif isinstance(instance, PublicationKeyword):
+            tags.add(f'publications:{instance.publication_id}')
+    for instance in session.deleted:
+        if isinstance(instance, PublicationKeyword):
+            tags.add(f'publications:{instance.publication_id}')
+    for instance in session.dirty:
+        # Solo los campos que forman el vector de la publicación
+        if isinstance(instance, Publication) and changed(instance, 'title', 'abstract', 'is_active'):
+            tags.add(f'publications:{instance.id}')
+        elif isinstance(instance, PublicationKeyword) and changed(instance, 'is_active', 'keyword_id', 'publication_id'):
+            tags.update(tag for tag in instance.cache_tags() if tag.startswith('publications:'))
+    return tags
+
+
+def _statement_tags(state):
+    """Publicaciones insertadas por lotes y cambios por lotes de sus keywords (fuera del flush)"""
+    table = state.statement.table.name
+    if table == Publication.__tablename__ and state.is_insert:
+        return statement_tags(state, Publication)
+    if table == PublicationKeyword.__tablename__:
+        return statement_tags(state, PublicationKeyword)
+    return None
+
+
+def _update_affected(tags):
+    publications = affected(tags, ('publications',))['publications']
+    # Los cambios masivos se incorporan con la siguiente reconstrucción (flask build-related)
+    if publications is not ALL and publications:
+        RelatedPublicationsService.update(publications)
+
+
+def register_related_events():
+    """Actualiza el índice de publicaciones relacionadas en la misma transacción que los cambios"""
+    register_maintainer(
+        'related_publications', _update_affected,
+        on_flush=_affected_tags, on_statement=_statement_tags
+    )
@@ -0,0 +1,141 @@
+from app.extensions import db
+from app.models import (
+    AuthorStats, JournalStats, KeywordStats, ProjectStats,
+    Publication, PublicationAuthor, PublicationKeyword
+)
+from app.services.maintenance import ALL, MAX_INCREMENTAL_IDS, affected, register_maintainer
+
+
+def _citations():
+    return db.func.coalesce(Publication.citation_count, 0)
+
+
+def _year():
+    return db.func.coalesce(Publication.year, db.extract('year', Publication.publication_date))
+
+
+def _author_membership():
+    return db.select(
+        PublicationAuthor.author_id.label('entity_id'), _citations().label('citations'), _year().label('year')
+    ).join(Publication, Publication.id == PublicationAuthor.publication_id).where(
+        PublicationAuthor.is_active == True, Publication.is_active == True
+    )
+
+
+def _keyword_membership():
+    return db.select(
+        PublicationKeyword.keyword_id.label('entity_id'), _citations().label('citations'), _year().label('year')
+    ).join(Publication, Publication.id == PublicationKeyword.publication_id).where(
+        PublicationKeyword.is_active == True, Publication.is_active == True
+    )
+
+
+def _column_membership(column):
+    return db.select(
+        column.label('entity_id'), _citations().label('citations'), _year().label('year')
+    ).where(Publication.is_active == True, column.isnot(None))
+
+
+class StatsService:
+    """Mantiene las tablas resumen de autores, revistas, keywords y proyectos.
+
+    Antes de cada commit se recalculan, dentro de la misma transacción, solo las
+    entidades afectadas por las escrituras (las etiquetas que ya recogen los eventos
+    de sesión de la caché de respuestas).
+    """
+
+    # tipo -> (modelo resumen, columna de la entidad, consulta (entity_id, citations, year))
+    KINDS = {
+        'authors': (AuthorStats, 'author_id', _author_membership),
+        'journals': (JournalStats, 'journal_id', lambda: _column_membership(Publication.journal_id)),
+        'keywords': (KeywordStats, 'keyword_id', _keyword_membership),
+        'projects': (ProjectStats, 'project_id', lambda: _column_membership(Publication.project_id))
+    }
+
+    @staticmethod
+    def _aggregate(membership):
+        """Agrega por entidad: publicaciones, citas, índice h (row_number por entidad) y rango de años"""
+        ranked = db.select(
+            membership.c.entity_id,
+            membership.c.citations,
+            membership.c.year,
+            db.func.row_number().over(
+                partition_by=membership.c.entity_id, order_by=membership.c.citations.desc()
+            ).label('position')
+        ).subquery()
+
+        return db.select(
+            ranked.c.entity_id,
+            db.func.count(),
+            db.func.sum(ranked.c.citations),
+            db.func.count().filter(ranked.c.citations >= ranked.c.position),
+            db.func.min(ranked.c.year),
+            db.func.max(ranked.c.year),
+            db.func.current_timestamp()
+        ).group_by(ranked.c.entity_id)
+
+    @classmethod
+    def refresh(cls, kind, ids=ALL):
+        """Recalcula las estadísticas de las entidades indicadas (o de todas) con DELETE + INSERT ... SELECT"""
+        model, key, membership = cls.KINDS[kind]
+        entity_column = getattr(model, key)
+        query = membership()
+        delete = db.delete(model)
+
+        if ids is not ALL:
+            if not ids:
+                return
+            ids = list(ids)
+            query = query.where(query.selected_columns.entity_id.in_(ids))
+            delete = delete.where(entity_column.in_(ids))
+
+        # Las tablas resumen no llevan etiquetas de caché propias
+        options = {'cache_tags': ()}
+        db.session.execute(delete, execution_options=options)
+        db.session.execute(
+            db.insert(model).from_select(
+                [key, 'publication_count', 'total_citations', 'h_index', 'first_year', 'last_year', 'refreshed_at'],
+                cls._aggregate(query.subquery())
+            ),
+            execution_options=options
+        )
+
+    @classmethod
+    def refresh_all(cls):
+        """Recalcula por completo todas las tablas resumen"""
+        for kind in cls.KINDS:
+            cls.refresh(kind)
+
+    @classmethod
+    def refresh_affected(cls, tags):
+        """Recalcula las entidades afectadas por las etiquetas de escritura de la transacción"""
+        entities = affected(tags, ('publications', *cls.KINDS))
+        publications = entities.pop('publications')
+
+        if publications is ALL:
+            # Cambios masivos de publicaciones: se recalculan todas las tablas
+            entities = dict.fromkeys(entities, ALL)
+        elif publications:
+            # Una publicación afecta a sus autores, keywords, revista y proyecto actuales
+            ids = list(publications)
+            related = {
+                'authors': db.select(PublicationAuthor.author_id).where(PublicationAuthor.publication_id.in_(ids)),
+                'keywords': db.select(PublicationKeyword.keyword_id).where(PublicationKeyword.publication_id.in_(ids)),
+                'journals': db.select(Publication.journal_id).where(Publication.id.in_(ids), Publication.journal_id.isnot(None)),
+                'projects': db.select(Publication.project_id).where(Publication.id.in_(ids), Publication.project_id.isnot(None))
+            }
+            for kind, query in related.items():
+                if entities[kind] is not ALL:
+                    entities[kind].update(db.session.scalars(query))
+
+        for kind, ids in entities.items():
+            if ids is ALL or len(ids) > MAX_INCREMENTAL_IDS:
+                cls.refresh(kind)
+            else:
+                cls.refresh(kind, ids)
+
+
+def register_stats_events():
+    """Recalcula las tablas resumen en la misma transacción que las escrituras que las afectan"""
+    # Sin recolectores propios: las etiquetas de escritura de la caché de respuestas
+    register_maintainer('stats', StatsService.refresh_affected)
@@ -0,0 +1,84 @@
+"""Add author/journal/keyword/project stats summary tables
+
+Revision ID: 4c8d2f6a9e31
+Revises: 7b3e9c2a4f10
+Create Date: 2026-10-19 21:05:37.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8d2f6a9e31'
+down_revision = '7b3e9c2a4f10'
+branch_labels = None
+depends_on = None
+
+
+# (tabla resumen, columna de la entidad, tabla de la entidad, consulta (entity_id, citations, year))
+STATS_TABLES = [
+    ('author_stats', 'author_id', 'authors', """
+        SELECT pa.author_id AS entity_id, COALESCE(p.citation_count, 0) AS citations,
+               COALESCE(p.year, EXTRACT(year FROM p.publication_date)) AS year
+        FROM publication_authors pa JOIN publications p ON p.id = pa.publication_id
+        WHERE pa.is_active AND p.is_active
+    """),
+    ('journal_stats', 'journal_id', 'journals', """
+        SELECT p.journal_id AS entity_id, COALESCE(p.citation_count, 0) AS citations,
+               COALESCE(p.year, EXTRACT(year FROM p.publication_date)) AS year
+        FROM publications p WHERE p.is_active AND p.journal_id IS NOT NULL
+    """),
+    ('keyword_stats', 'keyword_id', 'keywords', """
+        SELECT pk.keyword_id AS entity_id, COALESCE(p.citation_count, 0) AS citations,
+               COALESCE(p.year, EXTRACT(year FROM p.publication_date)) AS year
+        FROM publication_keywords pk JOIN publications p ON p.id = pk.publication_id
+        WHERE pk.is_active AND p.is_active
+    """),
+    ('project_stats', 'project_id', 'projects', """
+        SELECT p.project_id AS entity_id, COALESCE(p.citation_count, 0) AS citations,
+               COALESCE(p.year, EXTRACT(year FROM p.publication_date)) AS year
+        FROM publications p WHERE p.is_active AND p.project_id IS NOT NULL
+    """),
+]
+
+SORT_KEYS = ('publication_count', 'total_citations', 'h_index')
+
+
+def upgrade():
+    for table, key, entity_table, membership in STATS_TABLES:
+        op.create_table(
+            table,
+            sa.Column(key, postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('publication_count', sa.Integer(), nullable=False),
+            sa.Column('total_citations', sa.Integer(), nullable=False),
+            sa.Column('h_index', sa.Integer(), nullable=False),
+            sa.Column('first_year', sa.Integer(), nullable=True),
+            sa.Column('last_year', sa.Integer(), nullable=True),
+            sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint([key], [f'{entity_table}.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint(key)
+        )
+
+        # Carga inicial; a partir de aquí la aplicación mantiene las filas en cada commit
+        op.execute(f"""
+            INSERT INTO {table}
+                ({key}, publication_count, total_citations, h_index, first_year, last_year, refreshed_at)
+            SELECT entity_id, count(*), sum(citations),
+                   count(*) FILTER (WHERE citations >= position), min(year), max(year), now()
+            FROM (
+                SELECT entity_id, citations, year,
+                       row_number() OVER (PARTITION BY entity_id ORDER BY citations DESC) AS position
+                FROM ({membership}) membership
+            ) ranked
+            GROUP BY entity_id
+        """)
+
+        for sort_key in SORT_KEYS:
+            op.create_index(f'ix_{table}_{sort_key}', table, [sort_key])
+
+
+def downgrade():
+    for table, _, _, _ in reversed(STATS_TABLES):
+        op.drop_table(table)
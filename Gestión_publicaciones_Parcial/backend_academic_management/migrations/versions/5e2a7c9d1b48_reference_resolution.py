@@ -0,0 +1,93 @@
+"""Allow unresolved references and add normalized publication titles
+
+Revision ID: 5e2a7c9d1b48
+Revises: 9a1f3b7c5d24
+Create Date: 2026-10-20 09:12:40.551837
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a7c9d1b48'
+down_revision = '9a1f3b7c5d24'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_title(title):
+    """Copia de app.services.normalization.normalize_title en esta revisión.
+
+    La migración no importa la aplicación: un cambio posterior de la función no
+    debe alterar lo que escribe este backfill.
+    """
+    if not title:
+        return None
+    decomposed = unicodedata.normalize('NFKD', title)
+    ascii_text = ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    normalized = _NON_ALNUM.sub(' ', ascii_text).strip()
+    return normalized[:255] or None
+
+# (nombre, tabla, columnas o expresión, condición parcial)
+INDEXES = [
+    ('ix_publications_normalized_title', 'publications', ['normalized_title'], None),
+    ('ix_publications_lower_doi', 'publications', [sa.text('lower(doi)')], None),
+    ('ix_publication_references_unresolved_id', 'publication_references', ['id'],
+     'referenced_publication_id IS NULL AND is_active'),
+]
+
+
+def upgrade():
+    # Referencias que solo tienen reference_text hasta que se resuelven
+    op.alter_column('publication_references', 'referenced_publication_id', nullable=True)
+    op.add_column('publications', sa.Column('normalized_title', sa.String(length=255), nullable=True))
+
+    # La normalización se hace en Python para que coincida exactamente con la de la aplicación
+    # (ver normalize_title arriba)
+    bind = op.get_bind()
+    publications = sa.table('publications', sa.column('id'), sa.column('title'), sa.column('normalized_title'))
+    last_id = None
+    while True:
+        query = sa.select(publications.c.id, publications.c.title).order_by(publications.c.id).limit(BACKFILL_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(publications.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        bind.execute(
+            publications.update().where(publications.c.id == sa.bindparam('row_id')),
+            [{'row_id': row.id, 'normalized_title': normalize_title(row.title)} for row in rows]
+        )
+
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.drop_column('publications', 'normalized_title')
+    # Las referencias sin resolver no caben en la columna obligatoria
+    op.execute('DELETE FROM publication_references WHERE referenced_publication_id IS NULL')
+    op.alter_column('publication_references', 'referenced_publication_id', nullable=False)
@@ -0,0 +1,65 @@
+"""Unique constraint on publication_keywords (publication_id, keyword_id)
+
+Revision ID: 7b3e9c2a4f10
+Revises: e55057b07a39
+Create Date: 2026-10-19 19:20:11.402317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e9c2a4f10'
+down_revision = 'e55057b07a39'
+branch_labels = None
+depends_on = None
+
+
+CONSTRAINT = 'uq_publication_keywords_publication_id_keyword_id'
+# El índice único de la restricción sustituye al índice simple sobre las mismas columnas
+PLAIN_INDEX = 'ix_publication_keywords_publication_id_keyword_id'
+
+
+def upgrade():
+    # Se conserva un único vínculo por par: el activo y, entre ellos, el más reciente
+    op.execute("""
+        DELETE FROM publication_keywords pk
+        USING (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY publication_id, keyword_id
+                       ORDER BY is_active DESC, updated_at DESC NULLS LAST, id
+                   ) AS position
+            FROM publication_keywords
+        ) duplicated
+        WHERE pk.id = duplicated.id AND duplicated.position > 1
+    """)
+
+    # El índice se construye sin bloquear escrituras y después se promueve a restricción
+    with op.get_context().autocommit_block():
+        op.create_index(
+            CONSTRAINT,
+            'publication_keywords',
+            ['publication_id', 'keyword_id'],
+            unique=True,
+            postgresql_concurrently=True
+        )
+    op.execute(
+        f'ALTER TABLE publication_keywords ADD CONSTRAINT {CONSTRAINT} UNIQUE USING INDEX {CONSTRAINT}'
+    )
+
+    with op.get_context().autocommit_block():
+        op.drop_index(PLAIN_INDEX, table_name='publication_keywords', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            PLAIN_INDEX,
+            'publication_keywords',
+            ['publication_id', 'keyword_id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+    op.drop_constraint(CONSTRAINT, 'publication_keywords', type_='unique')
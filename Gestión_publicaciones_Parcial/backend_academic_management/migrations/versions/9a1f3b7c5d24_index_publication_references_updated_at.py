@@ -0,0 +1,29 @@
+"""Index publication_references.updated_at for incremental citation graph sync
+
+Revision ID: 9a1f3b7c5d24
+Revises: 4c8d2f6a9e31
+Create Date: 2026-10-19 22:14:52.604119
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a1f3b7c5d24'
+down_revision = '4c8d2f6a9e31'
+branch_labels = None
+depends_on = None
+
+
+INDEX = 'ix_publication_references_updated_at'
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(INDEX, 'publication_references', ['updated_at'], postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX, table_name='publication_references', postgresql_concurrently=True)
@@ -0,0 +1,60 @@
+"""Backfill citation_count from active publication references
+
+Revision ID: a7d3e9c1b584
+Revises: f1c8a3e7d925
+Create Date: 2026-10-21 17:05:36.218694
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9c1b584'
+down_revision = 'f1c8a3e7d925'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade():
+    # Los incrementos solo cuentan las referencias creadas tras el despliegue: se recalcula
+    # una vez con la misma consulta que flask recompute-citation-counts, por lotes de ids
+    bind = op.get_bind()
+    publications = sa.table('publications', sa.column('id'), sa.column('citation_count'))
+    references = sa.table(
+        'publication_references', sa.column('id'), sa.column('referenced_publication_id'), sa.column('is_active')
+    )
+    last_id = None
+    while True:
+        batch = sa.select(publications.c.id).order_by(publications.c.id).limit(BACKFILL_BATCH_SIZE)
+        if last_id is not None:
+            batch = batch.where(publications.c.id > last_id)
+        batch_ids = bind.execute(batch).scalars().all()
+        if not batch_ids:
+            break
+        last_id = batch_ids[-1]
+
+        counts = sa.select(
+            publications.c.id.label('publication_id'),
+            sa.func.count(references.c.id).label('citations')
+        ).select_from(publications).outerjoin(references, sa.and_(
+            references.c.referenced_publication_id == publications.c.id,
+            references.c.is_active == sa.true()
+        )).where(publications.c.id.in_(batch_ids)).group_by(publications.c.id).subquery()
+
+        bind.execute(
+            publications.update()
+            .where(
+                publications.c.id == counts.c.publication_id,
+                sa.func.coalesce(publications.c.citation_count, -1) != counts.c.citations
+            )
+            .values(citation_count=counts.c.citations)
+        )
+
+
+def downgrade():
+    # Los valores anteriores (los importados) no se conservan
+    pass
@@ -0,0 +1,59 @@
+"""Add coauthorship adjacency and author community tables
+
+Revision ID: b6d4e8f2a173
+Revises: 5e2a7c9d1b48
+Create Date: 2026-10-20 11:40:18.902364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d4e8f2a173'
+down_revision = '5e2a7c9d1b48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'coauthorships',
+        sa.Column('author_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('coauthor_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('weight', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['authors.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['coauthor_id'], ['authors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('author_id', 'coauthor_id')
+    )
+
+    # Carga inicial (ambos sentidos de cada par); a partir de aquí la aplicación mantiene las filas en cada commit
+    op.execute("""
+        INSERT INTO coauthorships (author_id, coauthor_id, weight, refreshed_at)
+        SELECT link.author_id, other.author_id, count(DISTINCT link.publication_id), now()
+        FROM publication_authors link
+        JOIN publication_authors other
+          ON other.publication_id = link.publication_id AND other.author_id <> link.author_id AND other.is_active
+        JOIN publications p ON p.id = link.publication_id AND p.is_active
+        WHERE link.is_active
+        GROUP BY link.author_id, other.author_id
+    """)
+    op.create_index('ix_coauthorships_author_id_weight', 'coauthorships', ['author_id', 'weight'])
+
+    # Se llena con flask detect-communities
+    op.create_table(
+        'author_communities',
+        sa.Column('author_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('community_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['authors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('author_id')
+    )
+    op.create_index('ix_author_communities_community_id', 'author_communities', ['community_id'])
+
+
+def downgrade():
+    op.drop_table('author_communities')
+    op.drop_table('coauthorships')
@@ -0,0 +1,65 @@
+"""Add MinHash signatures, LSH buckets and duplicate candidates
+
+Revision ID: c3f7a1d9e258
+Revises: b6d4e8f2a173
+Create Date: 2026-10-20 16:05:42.117390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a1d9e258'
+down_revision = 'b6d4e8f2a173'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('publications', sa.Column('merged_into_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        'publications_merged_into_id_fkey', 'publications', 'publications', ['merged_into_id'], ['id']
+    )
+
+    # Las firmas y cubetas de las publicaciones existentes se calculan con flask detect-duplicates
+    op.create_table(
+        'publication_signatures',
+        sa.Column('publication_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['publication_id'], ['publications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('publication_id')
+    )
+
+    op.create_table(
+        'publication_lsh_buckets',
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('publication_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(['publication_id'], ['publications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bucket', 'publication_id')
+    )
+    op.create_index('ix_publication_lsh_buckets_publication_id', 'publication_lsh_buckets', ['publication_id'])
+
+    op.create_table(
+        'duplicate_candidates',
+        sa.Column('publication_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('duplicate_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('similarity', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('detected_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['publication_id'], ['publications.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['duplicate_id'], ['publications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('publication_id', 'duplicate_id')
+    )
+    op.create_index('ix_duplicate_candidates_status_similarity', 'duplicate_candidates', ['status', 'similarity'])
+    op.create_index('ix_duplicate_candidates_duplicate_id', 'duplicate_candidates', ['duplicate_id'])
+
+
+def downgrade():
+    op.drop_table('duplicate_candidates')
+    op.drop_table('publication_lsh_buckets')
+    op.drop_table('publication_signatures')
+    op.drop_constraint('publications_merged_into_id_fkey', 'publications', type_='foreignkey')
+    op.drop_column('publications', 'merged_into_id')
@@ -0,0 +1,98 @@
+"""Add author block keys, merge pointer and match candidates
+
+Revision ID: d8b2e5f4a639
+Revises: c3f7a1d9e258
+Create Date: 2026-10-20 18:27:03.640215
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b2e5f4a639'
+down_revision = 'c3f7a1d9e258'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def _normalize_name(name):
+    if not name:
+        return None
+    decomposed = unicodedata.normalize('NFKD', name)
+    ascii_text = ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    return _NON_ALNUM.sub(' ', ascii_text).strip()[:255] or None
+
+
+def author_block_key(first_name, last_name):
+    """Copia de app.services.normalization.author_block_key en esta revisión.
+
+    La migración no importa la aplicación: un cambio posterior de la función no
+    debe alterar lo que escribe este backfill.
+    """
+    surname, given = _normalize_name(last_name), _normalize_name(first_name)
+    if not surname or not given:
+        return None
+    return f'{surname[:57]}|{given[0]}'
+
+
+def upgrade():
+    op.add_column('authors', sa.Column('block_key', sa.String(length=60), nullable=True))
+    op.add_column('authors', sa.Column('merged_into_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key('authors_merged_into_id_fkey', 'authors', 'authors', ['merged_into_id'], ['id'])
+
+    # La clave se calcula en Python para que coincida exactamente con la de la aplicación
+    bind = op.get_bind()
+    authors = sa.table('authors', sa.column('id'), sa.column('first_name'), sa.column('last_name'), sa.column('block_key'))
+    last_id = None
+    while True:
+        query = sa.select(authors.c.id, authors.c.first_name, authors.c.last_name).order_by(authors.c.id).limit(BACKFILL_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(authors.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        bind.execute(
+            authors.update().where(authors.c.id == sa.bindparam('row_id')),
+            [{'row_id': row.id, 'block_key': author_block_key(row.first_name, row.last_name)} for row in rows]
+        )
+
+    # Los pares se calculan con flask disambiguate-authors
+    op.create_table(
+        'author_match_candidates',
+        sa.Column('author_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('duplicate_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('evidence', sa.String(length=100), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('detected_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['authors.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['duplicate_id'], ['authors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('author_id', 'duplicate_id')
+    )
+    op.create_index('ix_author_match_candidates_status_score', 'author_match_candidates', ['status', 'score'])
+    op.create_index('ix_author_match_candidates_duplicate_id', 'author_match_candidates', ['duplicate_id'])
+
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        op.create_index('ix_authors_block_key_id', 'authors', ['block_key', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_authors_block_key_id', table_name='authors', postgresql_concurrently=True)
+
+    op.drop_table('author_match_candidates')
+    op.drop_constraint('authors_merged_into_id_fkey', 'authors', type_='foreignkey')
+    op.drop_column('authors', 'merged_into_id')
+    op.drop_column('authors', 'block_key')
@@ -0,0 +1,59 @@
+"""Add sort key indexes
+
+Revision ID: dcd5f4dacedc
+Revises: 3f94e6ba6593
+Create Date: 2026-10-19 09:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dcd5f4dacedc'
+down_revision = '3f94e6ba6593'
+branch_labels = None
+depends_on = None
+
+
+# (tabla, claves de ordenamiento, columnas de alcance) según SORT_KEYS de cada modelo
+SORT_INDEXES = [
+    ('countries', ('name', 'code'), ()),
+    ('authors', ('last_name', 'first_name', 'created_at'), ()),
+    ('publication_types', ('name',), ()),
+    ('journals', ('name', 'h_index', 'created_at'), ()),
+    ('conferences', ('year', 'name', 'start_date'), ()),
+    ('keywords', ('name', 'created_at'), ()),
+    ('publications', ('created_at', 'publication_date', 'title', 'citation_count'), ()),
+    ('projects', ('created_at', 'name', 'start_date'), ()),
+    ('milestones', ('due_date', 'created_at'), ('project_id',)),
+    ('deliverables', ('created_at', 'due_date'), ('milestone_id',)),
+    ('acquisitions', ('purchase_date', 'amount'), ('project_id',)),
+]
+
+
+def _index_name(table, scope, key):
+    prefix = ''.join(f'{column}_' for column in scope)
+    return f'ix_{table}_{prefix}active_{key}_id'
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY no bloquea las escrituras en publications o authors,
+    # pero no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for table, keys, scope in SORT_INDEXES:
+            for key in keys:
+                op.create_index(
+                    _index_name(table, scope, key),
+                    table,
+                    [*scope, 'is_active', key, 'id'],
+                    unique=False,
+                    postgresql_concurrently=True
+                )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table, keys, scope in reversed(SORT_INDEXES):
+            for key in reversed(keys):
+                op.drop_index(_index_name(table, scope, key), table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,60 @@
+"""Add TF-IDF vocabulary, inverted index and related publications
+
+Revision ID: e4a9c6b1f702
+Revises: d8b2e5f4a639
+Create Date: 2026-10-21 10:14:55.308127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c6b1f702'
+down_revision = 'd8b2e5f4a639'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Las tres tablas se llenan con flask build-related
+    op.create_table(
+        'related_terms',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('term', sa.String(length=50), nullable=False),
+        sa.Column('document_count', sa.Integer(), nullable=False),
+        sa.Column('idf', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('term')
+    )
+
+    op.create_table(
+        'publication_terms',
+        sa.Column('term_id', sa.Integer(), nullable=False),
+        sa.Column('publication_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['term_id'], ['related_terms.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['publication_id'], ['publications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('term_id', 'publication_id')
+    )
+    op.create_index('ix_publication_terms_term_id_weight', 'publication_terms', ['term_id', 'weight'])
+    op.create_index('ix_publication_terms_publication_id', 'publication_terms', ['publication_id'])
+
+    op.create_table(
+        'related_publications',
+        sa.Column('publication_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('related_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['publication_id'], ['publications.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['related_id'], ['publications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('publication_id', 'related_id')
+    )
+    op.create_index('ix_related_publications_publication_id_score', 'related_publications', ['publication_id', 'score'])
+    op.create_index('ix_related_publications_related_id', 'related_publications', ['related_id'])
+
+
+def downgrade():
+    op.drop_table('related_publications')
+    op.drop_table('publication_terms')
+    op.drop_table('related_terms')
@@ -0,0 +1,64 @@
+"""Add foreign key and partial indexes on join tables
+
+Revision ID: e55057b07a39
+Revises: dcd5f4dacedc
+Create Date: 2026-10-19 10:03:54.718220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e55057b07a39'
+down_revision = 'dcd5f4dacedc'
+branch_labels = None
+depends_on = None
+
+
+# (nombre, tabla, columnas, condición parcial)
+# milestones(project_id) ya queda cubierto por ix_milestones_project_id_active_*_id
+INDEXES = [
+    ('ix_publication_authors_publication_id', 'publication_authors', ['publication_id'], None),
+    ('ix_publication_authors_author_id', 'publication_authors', ['author_id'], None),
+    ('ix_publication_authors_active_publication_id', 'publication_authors', ['publication_id', 'author_order'], 'is_active'),
+    ('ix_publication_authors_active_author_id', 'publication_authors', ['author_id', 'publication_id'], 'is_active'),
+
+    ('ix_publication_keywords_publication_id_keyword_id', 'publication_keywords', ['publication_id', 'keyword_id'], None),
+    ('ix_publication_keywords_keyword_id', 'publication_keywords', ['keyword_id'], None),
+    ('ix_publication_keywords_active_publication_id', 'publication_keywords', ['publication_id', 'keyword_id'], 'is_active'),
+    ('ix_publication_keywords_active_keyword_id', 'publication_keywords', ['keyword_id', 'publication_id'], 'is_active'),
+
+    ('ix_publication_references_citing_publication_id', 'publication_references', ['citing_publication_id'], None),
+    ('ix_publication_references_referenced_publication_id', 'publication_references', ['referenced_publication_id'], None),
+    ('ix_publication_references_active_citing_publication_id', 'publication_references', ['citing_publication_id'], 'is_active'),
+    ('ix_publication_references_active_referenced_publication_id', 'publication_references', ['referenced_publication_id'], 'is_active'),
+
+    ('ix_project_members_project_id_user_id', 'project_members', ['project_id', 'user_id'], None),
+    ('ix_project_members_user_id', 'project_members', ['user_id'], None),
+    ('ix_project_members_active_project_id_user_id', 'project_members', ['project_id', 'user_id'], 'is_active'),
+    ('ix_project_members_active_user_id', 'project_members', ['user_id', 'project_id'], 'is_active'),
+
+    ('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'], None),
+    ('ix_refresh_tokens_active_user_id', 'refresh_tokens', ['user_id'], 'is_active'),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,29 @@
+"""Add case-insensitive index on keyword names
+
+Revision ID: f1c8a3e7d925
+Revises: e4a9c6b1f702
+Create Date: 2026-10-21 16:42:18.904517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c8a3e7d925'
+down_revision = 'e4a9c6b1f702'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_keywords_lower_name', 'keywords', [sa.text('lower(name)')], unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_keywords_lower_name', table_name='keywords', postgresql_concurrently=True)
@@ -0,0 +1,140 @@
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+# Añadimos el directorio raíz del proyecto al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from app.json_provider import OrjsonProvider, orjson
+
+REPEAT = 20
+
+
+def _publication(i, with_relations=True):
+    now = datetime.utcnow().isoformat()
+    data = {
+        'id': str(uuid.uuid4()),
+        'title': f'Análisis de redes de colaboración científica en Latinoamérica ({i})',
+        'abstract': 'Este trabajo estudia la evolución de la producción científica y sus citas. ' * 12,
+        'doi': f'10.1234/revista.{i}',
+        'external_id': f'doi:10.1234/revista.{i}',
+        'publication_date': date(2021, 1 + i % 12, 1).isoformat(),
+        'pdf_url': None,
+        'url': f'https://doi.org/10.1234/revista.{i}',
+        'year': 2021,
+        'month': 1 + i % 12,
+        'day': 1,
+        'publication_type_id': str(uuid.uuid4()),
+        'journal_id': str(uuid.uuid4()),
+        'conference_id': None,
+        'citation_count': i % 40,
+        'project_id': None,
+        'created_at': now,
+        'updated_at': now,
+        'is_active': True
+    }
+    if with_relations:
+        data['authors'] = [
+            {
+                'id': str(uuid.uuid4()),
+                'first_name': 'María José',
+                'last_name': f'Núñez {n}',
+                'is_corresponding': n == 0,
+                'author_order': n + 1
+            }
+            for n in range(6)
+        ]
+        data['keywords'] = [
+            {'id': str(uuid.uuid4()), 'name': name}
+            for name in ('bibliometría', 'redes', 'citas', 'colaboración')
+        ]
+    return data
+
+
+def _payloads():
+    """Respuestas representativas de los endpoints más pesados"""
+    publications_page = {
+        'data': [_publication(i) for i in range(100)],
+        'total': 100000,
+        'pages': 1000,
+        'current_page': 1
+    }
+
+    author_detail = {
+        'id': str(uuid.uuid4()),
+        'first_name': 'María José',
+        'last_name': 'Núñez',
+        'publications': [
+            {
+                'id': str(uuid.uuid4()),
+                'title': f'Publicación {i}',
+                'publication_date': date(2015 + i % 8, 1, 1),
+                'doi': f'10.1234/autor.{i}',
+                'is_corresponding': False,
+                'author_order': 1 + i % 5
+            }
+            for i in range(2000)
+        ]
+    }
+
+    projects_page = {
+        'data': [
+            {
+                'id': uuid.uuid4(),
+                'name': f'Proyecto {i}',
+                'budget': Decimal('150000.00'),
+                'start_date': date(2022, 1, 1),
+                'created_at': datetime.utcnow(),
+                'members': [{'id': uuid.uuid4(), 'role': 'member'} for _ in range(8)]
+            }
+            for i in range(100)
+        ]
+    }
+
+    return [
+        ('GET /api/publications?per_page=100', publications_page),
+        ('GET /api/authors/<id> (2000 publicaciones)', author_detail),
+        ('GET /api/projects?per_page=100 (tipos nativos)', projects_page),
+    ]
+
+
+def _measure(provider, payload):
+    best = float('inf')
+    size = 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        response = provider.response(payload)
+        best = min(best, time.perf_counter() - start)
+        size = len(response.get_data())
+    return best, size
+
+
+def benchmark_json():
+    """Compara el proveedor JSON estándar de Flask con el proveedor basado en orjson"""
+    if orjson is None:
+        print('orjson no está instalado: pip install orjson')
+        return
+
+    app = create_app()
+    standard = DefaultJSONProvider(app)
+    fast = OrjsonProvider(app)
+
+    with app.test_request_context():
+        for label, payload in _payloads():
+            std_time, std_size = _measure(standard, payload)
+            fast_time, fast_size = _measure(fast, payload)
+
+            print(label)
+            print(f"  json estándar: {std_time * 1000:8.2f} ms  {std_size / 1024:9.1f} KiB")
+            print(f"  orjson:        {fast_time * 1000:8.2f} ms  {fast_size / 1024:9.1f} KiB"
+                  f"  (x{std_time / fast_time:.1f} más rápido)")
+
+
+if __name__ == '__main__':
+    benchmark_json()
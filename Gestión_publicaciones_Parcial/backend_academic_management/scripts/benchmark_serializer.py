@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+# Añadimos el directorio raíz del proyecto al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.models import Publication, Project, get_serializer
+
+ROWS = 10000
+REPEAT = 5
+
+# Subconjunto de campos medido con serialize_many(fields=...): el de Publication son los
+# campos por defecto de las publicaciones en el perfil de autor (PUBLICATION_FIELDS)
+SUBSET_FIELDS = {
+    'Publication': ('id', 'title', 'publication_date', 'doi'),
+    'Project': ('id', 'name'),
+}
+
+
+def legacy_to_dict(instance):
+    """Implementación anterior de BaseMixin.to_dict, usada como referencia"""
+    data = {}
+    for column in instance.__table__.columns:
+        value = getattr(instance, column.name)
+        # Manejar tipos especiales
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[column.name] = value
+    return data
+
+
+# Se asignan todas las columnas para reproducir el estado de una fila cargada desde la BD
+def _make_publications(n):
+    now = datetime.utcnow()
+    return [
+        Publication(
+            id=uuid.uuid4(),
+            title=f'Publicación de prueba {i}',
+            abstract='Resumen ' * 40,
+            doi=f'10.1234/test.{i}',
+            external_id=f'doi:10.1234/test.{i}',
+            publication_date=date(2020, 1 + i % 12, 1),
+            pdf_url=None,
+            url=f'https://doi.org/10.1234/test.{i}',
+            year=2020,
+            month=1 + i % 12,
+            day=1,
+            publication_type_id=uuid.uuid4(),
+            journal_id=uuid.uuid4(),
+            conference_id=None,
+            citation_count=i % 50,
+            project_id=None,
+            created_at=now,
+            updated_at=now,
+            is_active=True
+        )
+        for i in range(n)
+    ]
+
+
+def _make_projects(n):
+    now = datetime.utcnow()
+    return [
+        Project(
+            id=uuid.uuid4(),
+            name=f'Proyecto {i}',
+            description='Descripción del proyecto',
+            start_date=date(2021, 1, 1),
+            end_date=None,
+            budget=Decimal("12345.67"),
+            status='en_progreso',
+            created_at=now,
+            updated_at=now,
+            is_active=True
+        )
+        for i in range(n)
+    ]
+
+
+def _best_time(fn, rows):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_serializer():
+    """Compara la serialización anterior con el serializador precompilado"""
+    app = create_app()
+
+    with app.app_context():
+        for label, rows in (('Publication', _make_publications(ROWS)), ('Project', _make_projects(ROWS))):
+            serializer = get_serializer(type(rows[0]))
+
+            legacy = _best_time(lambda items: [legacy_to_dict(item) for item in items], rows)
+            compiled = _best_time(lambda items: [item.to_dict() for item in items], rows)
+            many = _best_time(serializer.serialize_many, rows)
+            fields = SUBSET_FIELDS[label]
+            subset = _best_time(lambda items: serializer.serialize_many(items, fields=fields), rows)
+
+            print(f"{label} ({ROWS} filas, mejor de {REPEAT})")
+            print(f"  to_dict anterior:        {legacy * 1000:8.1f} ms")
+            print(f"  to_dict precompilado:    {compiled * 1000:8.1f} ms  (x{legacy / compiled:.2f})")
+            print(f"  serialize_many:          {many * 1000:8.1f} ms  (x{legacy / many:.2f})")
+            print(f"  serialize_many ({len(fields)} campos): {subset * 1000:6.1f} ms  (x{legacy / subset:.2f})  "
+                  f"[{', '.join(fields)}]")
+
+
+if __name__ == '__main__':
+    benchmark_serializer()
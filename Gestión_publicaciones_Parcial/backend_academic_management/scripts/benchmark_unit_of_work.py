@@ -0,0 +1,88 @@
+import os
+import sys
+from contextlib import nullcontext
+
+# Añadimos el directorio raíz del proyecto al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import create_app
+from app.extensions import db
+from app.models import (
+    Author, Keyword, Publication, PublicationAuthor, PublicationKeyword, PublicationType, unit_of_work
+)
+
+AUTHORS = 6
+KEYWORDS = 5
+
+
+class StatementCounter:
+    """Cuenta las sentencias enviadas a la base de datos y las confirmaciones"""
+
+    def __init__(self, connection):
+        self.statements = 0
+        self.commits = 0
+        self.enabled = False
+        event.listen(connection, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled:
+            self.statements += 1
+            # Con join_transaction_mode='create_savepoint' cada commit se traduce en RELEASE SAVEPOINT
+            if statement.startswith(('COMMIT', 'RELEASE')):
+                self.commits += 1
+
+    def measure(self, func):
+        self.statements = self.commits = 0
+        self.enabled = True
+        try:
+            func()
+        finally:
+            self.enabled = False
+        return self.statements, self.commits
+
+
+def _create_publication(publication_type_id, author_ids, keyword_ids, batched):
+    """Reproduce las operaciones de POST /api/publications"""
+    with unit_of_work() if batched else nullcontext():
+        publication = Publication.create(title='Publicación de prueba', publication_type_id=publication_type_id)
+        for order, author_id in enumerate(author_ids, start=1):
+            PublicationAuthor.create(publication_id=publication.id, author_id=author_id, author_order=order)
+        for keyword_id in keyword_ids:
+            PublicationKeyword.create(publication_id=publication.id, keyword_id=keyword_id)
+    publication.to_dict()
+
+
+def benchmark_unit_of_work():
+    """Compara las idas y vueltas a la base de datos con y sin unidad de trabajo"""
+    app = create_app()
+
+    with app.app_context():
+        # Todo se ejecuta dentro de una transacción externa que se revierte al final
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        db.session.registry.set(Session(bind=connection, join_transaction_mode='create_savepoint'))
+        counter = StatementCounter(connection)
+
+        try:
+            publication_type = PublicationType.create(name='Tipo benchmark uow')
+            author_ids = [
+                Author.create(first_name='Autor', last_name=f'Benchmark {i}').id for i in range(AUTHORS)
+            ]
+            keyword_ids = [Keyword.create(name=f'benchmark-uow-{i}').id for i in range(KEYWORDS)]
+
+            for label, batched in (('commit por entidad', False), ('unidad de trabajo', True)):
+                statements, commits = counter.measure(
+                    lambda: _create_publication(publication_type.id, author_ids, keyword_ids, batched)
+                )
+                print(f"{label:20} {statements:4d} sentencias  {commits:3d} commits")
+        finally:
+            db.session.remove()
+            transaction.rollback()
+            connection.close()
+
+
+if __name__ == '__main__':
+    benchmark_unit_of_work()
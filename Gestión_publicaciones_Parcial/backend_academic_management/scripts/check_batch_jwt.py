@@ -0,0 +1,49 @@
+import os
+import sys
+import uuid
+
+# Añadimos el directorio raíz del proyecto al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import flask_jwt_extended.view_decorators as view_decorators
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+
+SUB_REQUESTS = 10
+
+
+def check_batch_jwt():
+    """Comprueba que un lote de N lecturas decodifica el token una sola vez y ejecuta los hooks de cada una"""
+    app = create_app()
+    decodes = []
+    dispatched = []
+    app.before_request(lambda: dispatched.append(1) and None)
+    decode_token = view_decorators.decode_token
+
+    def counting_decode_token(*args, **kwargs):
+        decodes.append(1)
+        return decode_token(*args, **kwargs)
+
+    view_decorators.decode_token = counting_decode_token
+    try:
+        with app.app_context():
+            token = create_access_token(identity=str(uuid.uuid4()))
+
+        response = app.test_client().post(
+            '/api/batch/',
+            json={'requests': [{'method': 'GET', 'path': '/api/countries/'}] * SUB_REQUESTS},
+            headers={'Authorization': f'Bearer {token}'}
+        )
+    finally:
+        view_decorators.decode_token = decode_token
+
+    statuses = [item['status'] for item in response.get_json()['responses']]
+    print(f'{SUB_REQUESTS} sub-peticiones, estados {sorted(set(statuses))}, token decodificado {len(decodes)} veces, '
+          f'before_request ejecutado {len(dispatched)} veces')
+    return (response.status_code == 200 and statuses == [200] * SUB_REQUESTS and len(decodes) == 1
+            and len(dispatched) == SUB_REQUESTS + 1)
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_batch_jwt() else 1)
@@ -0,0 +1,60 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+
+# Añadimos el directorio raíz del proyecto al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+from app.services.cache_service import ResponseCache
+
+TAGS = ('journals', 'journals:1')
+
+
+def _worker_cache(backend, path):
+    """Caché de respuestas tal como la inicializa cada worker (proceso) de la aplicación"""
+    app = Flask(__name__)
+    app.config.update(RESPONSE_CACHE_BACKEND=backend, RESPONSE_CACHE_PATH=path, RESPONSE_CACHE_MAX_ENTRIES=100)
+    cache = ResponseCache()
+    cache.init_app(app)
+    return app, cache
+
+
+def _invalidate(backend, path):
+    # Otro worker confirma una escritura sobre la revista
+    _, cache = _worker_cache(backend, path)
+    cache.invalidate(TAGS)
+
+
+def _stale_after_write(backend, path):
+    """Guarda una respuesta en un proceso, invalida sus etiquetas en otro y comprueba si sigue vigente"""
+    app, cache = _worker_cache(backend, path)
+    with app.test_request_context('/api/journals/1'):
+        key = cache.response_key('journal', {'id': 1}, TAGS)
+        cache.store(key, app.response_class('{}', mimetype='application/json'), 60)
+
+        worker = multiprocessing.get_context('fork').Process(target=_invalidate, args=(backend, path))
+        worker.start()
+        worker.join()
+
+        return cache.get(cache.response_key('journal', {'id': 1}, TAGS)) is not None
+
+
+def check_cache_invalidation():
+    """Comprueba que una escritura en un worker invalida la caché compartida de los demás"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'response_cache.sqlite3')
+        sqlite_stale = _stale_after_write('sqlite', path)
+        lru_stale = _stale_after_write('lru', path)
+
+    print(f"sqlite: {'respuesta obsoleta' if sqlite_stale else 'invalidada'} tras la escritura en otro proceso")
+    # lru vive en la memoria de cada proceso: se documenta que no sirve con varios workers
+    print(f"lru:    {'respuesta obsoleta' if lru_stale else 'invalidada'} tras la escritura en otro proceso "
+          f"(esperado: obsoleta, solo para un proceso)")
+    return not sqlite_stale and lru_stale
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_cache_invalidation() else 1)
@@ -0,0 +1,208 @@
+import json
+import os
+import re
+import sys
+import uuid
+
+# Añadimos el directorio raíz del proyecto al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Sin caché de respuestas: cada petición debe llegar a la base de datos
+os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.models import PublicationAuthor, PublicationKeyword, PublicationReference, ProjectMember, RefreshToken
+
+
+def _sample(*columns, **filters):
+    """Toma valores reales de las columnas para que el plan sea representativo"""
+    query = db.session.query(*columns).filter(*(column.isnot(None) for column in columns))
+    if filters:
+        query = query.filter_by(**filters)
+    row = query.limit(1).first()
+    return tuple(row) if row else tuple(uuid.uuid4() for _ in columns)
+
+
+def _checks():
+    """Peticiones a los endpoints, tabla consultada e índices que deben utilizar sus consultas"""
+    publication_id, author_id = _sample(PublicationAuthor.publication_id, PublicationAuthor.author_id)
+    linked_publication_id, keyword_id = _sample(
+        PublicationKeyword.publication_id, PublicationKeyword.keyword_id, is_active=True
+    )
+    citing_id, referenced_id = _sample(
+        PublicationReference.citing_publication_id, PublicationReference.referenced_publication_id
+    )
+    project_id, member_id = _sample(ProjectMember.project_id, ProjectMember.user_id, is_active=True)
+    token_user_id, = _sample(RefreshToken.user_id)
+
+    return [
+        (
+            'GET /api/publications/<id> (autores)',
+            ('GET', f'/api/publications/{publication_id}', member_id, None),
+            'publication_authors',
+            {'ix_publication_authors_publication_id', 'ix_publication_authors_active_publication_id'}
+        ),
+        (
+            'GET /api/publication-authors/<id>/authors',
+            ('GET', f'/api/publication-authors/{publication_id}/authors', member_id, None),
+            'publication_authors',
+            {'ix_publication_authors_active_publication_id'}
+        ),
+        (
+            'GET /api/authors/<id> (publicaciones)',
+            ('GET', f'/api/authors/{author_id}', member_id, None),
+            'publication_authors',
+            {'ix_publication_authors_author_id', 'ix_publication_authors_active_author_id'}
+        ),
+        (
+            'GET /api/publications/<id> (keywords)',
+            ('GET', f'/api/publications/{linked_publication_id}', member_id, None),
+            'publication_keywords',
+            {'uq_publication_keywords_publication_id_keyword_id', 'ix_publication_keywords_active_publication_id'}
+        ),
+        (
+            'GET /api/publication-keywords/<id>/keywords',
+            ('GET', f'/api/publication-keywords/{linked_publication_id}/keywords', member_id, None),
+            'publication_keywords',
+            {'ix_publication_keywords_active_publication_id'}
+        ),
+        (
+            # Enlace ya existente y activo: el INSERT ... ON CONFLICT no modifica ninguna fila
+            'POST /api/publication-keywords/<id>/keywords (duplicados)',
+            ('POST', f'/api/publication-keywords/{linked_publication_id}/keywords', member_id,
+             {'keyword_id': str(keyword_id)}),
+            'publication_keywords',
+            {'uq_publication_keywords_publication_id_keyword_id'}
+        ),
+        (
+            'GET /api/keywords/<id> (publicaciones)',
+            ('GET', f'/api/keywords/{keyword_id}', member_id, None),
+            'publication_keywords',
+            {'ix_publication_keywords_keyword_id', 'ix_publication_keywords_active_keyword_id'}
+        ),
+        (
+            'GET /api/publication-references/<id>/references',
+            ('GET', f'/api/publication-references/{citing_id}/references', member_id, None),
+            'publication_references',
+            {'ix_publication_references_active_citing_publication_id'}
+        ),
+        (
+            'GET /api/publications/<id>/citations?direction=in (citas recibidas)',
+            ('GET', f'/api/publications/{referenced_id}/citations?direction=in&depth=1', member_id, None),
+            'publication_references',
+            {'ix_publication_references_active_referenced_publication_id'}
+        ),
+        (
+            'GET /api/projects/<id>/members',
+            ('GET', f'/api/projects/{project_id}/members', member_id, None),
+            'project_members',
+            {'ix_project_members_active_project_id_user_id'}
+        ),
+        (
+            'Verificación de membresía (GET /api/milestones?project_id=<id>)',
+            ('GET', f'/api/milestones/?project_id={project_id}', member_id, None),
+            'project_members',
+            {'ix_project_members_active_project_id_user_id'}
+        ),
+        (
+            'GET /api/projects?show_mine=true',
+            ('GET', '/api/projects/?show_mine=true', member_id, None),
+            'project_members',
+            {'ix_project_members_active_user_id'}
+        ),
+        (
+            'GET /api/milestones?project_id=<id>',
+            ('GET', f'/api/milestones/?project_id={project_id}', member_id, None),
+            'milestones',
+            {'ix_milestones_project_id_active_due_date_id'}
+        ),
+        (
+            'GET /api/refresh-tokens/active',
+            ('GET', '/api/refresh-tokens/active', token_user_id, None),
+            'refresh_tokens',
+            {'ix_refresh_tokens_active_user_id'}
+        ),
+    ]
+
+
+def _index_names(plan):
+    """Recorre el plan JSON y devuelve los índices utilizados (incluidos los árbitros de ON CONFLICT)"""
+    names = set(plan.get('Conflict Arbiter Indexes', ()))
+    if 'Index Name' in plan:
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        names |= _index_names(child)
+    return names
+
+
+def _run(app, client, request, table):
+    """Ejecuta la petición y devuelve su estado y las sentencias (sql, parámetros) sobre la tabla"""
+    method, path, identity, body = request
+    with app.app_context():
+        token = create_access_token(identity=str(identity))
+
+    uses_table = re.compile(rf'\b(?:FROM|JOIN|INTO|UPDATE)\s+{table}\b', re.IGNORECASE)
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        # EXPLAIN sin ANALYZE no ejecuta las escrituras: se pueden planificar igual que las lecturas
+        if not executemany and uses_table.search(statement) and statement.lstrip().upper().startswith(
+            ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+        ):
+            captured.append((statement, parameters))
+
+    with app.app_context():
+        db.event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            response = client.open(
+                path, method=method, json=body, headers={'Authorization': f'Bearer {token}'}
+            )
+            response.get_data()
+        finally:
+            db.event.remove(db.engine, 'before_cursor_execute', capture)
+    return response.status_code, captured
+
+
+def explain_indexes():
+    """Ejecuta EXPLAIN sobre las consultas que lanzan los endpoints y verifica el uso de índices"""
+    app = create_app()
+    client = app.test_client()
+    failures = 0
+
+    with app.app_context():
+        checks = _checks()
+        db.session.remove()
+
+    for description, request, table, expected in checks:
+        status, statements = _run(app, client, request, table)
+
+        used = set()
+        with app.app_context(), db.engine.connect() as connection:
+            # Con pocas filas el planificador prefiere un seq scan; lo desactivamos
+            # para comprobar que el índice es utilizable por la consulta
+            connection.exec_driver_sql('SET enable_seqscan = off')
+            for statement, parameters in statements:
+                result = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+                plan = result if isinstance(result, list) else json.loads(result)
+                used |= _index_names(plan[0]['Plan'])
+            connection.rollback()
+
+        if status >= 500 or not statements:
+            failures += 1
+            print(f"FALLO {description}: HTTP {status}, {len(statements)} consultas sobre {table}")
+        elif used & expected:
+            print(f"OK    {description}: {', '.join(sorted(used & expected))}")
+        else:
+            failures += 1
+            print(f"FALLO {description}: se esperaba {', '.join(sorted(expected))}, "
+                  f"se usó {', '.join(sorted(used)) or 'ningún índice'}")
+
+    print(f"\n{failures} consultas sin el índice esperado")
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if explain_indexes() else 0)